@@ -0,0 +1,82 @@
+"""Cohort analytics API endpoints"""
+from flask import request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.core.read_cache import read_cache, ReadCache
+from backend.services.cohort_analytics_service import CohortAnalyticsService
+from backend.utils.helpers import parse_date_param
+from flask import Blueprint
+
+analytics_bp = Blueprint('analytics', __name__, url_prefix='/api/v1/analytics')
+
+def _cohort_tags(teacher_id):
+    # matrix:<teacher> is bumped by every evidence write on the teacher's LEs
+    return [ReadCache.tag('matrix', teacher_id), ReadCache.tag('les', teacher_id)]
+
+def _load_scope():
+    """
+    Load evidence for the scope in the query string
+    
+    Query params: unit_number, learning_experience_id, year_level, from, to
+    
+    Raises:
+        ValueError: If a parameter is malformed
+    """
+    try:
+        date_from = parse_date_param(request.args.get('from'))
+        date_to = parse_date_param(request.args.get('to'), end=True)
+    except ValueError:
+        raise ValueError('from and to must be ISO dates (YYYY-MM-DD)')
+    
+    return CohortAnalyticsService.load(
+        get_jwt_identity(),
+        unit_number=request.args.get('unit_number', type=int),
+        learning_experience_id=request.args.get('learning_experience_id'),
+        year_level=request.args.get('year_level', type=int),
+        date_from=date_from,
+        date_to=date_to
+    )
+
+@analytics_bp.route('/cohort/mastery', methods=['GET'])
+@jwt_required()
+@read_cache.cached(tags=lambda teacher_id: _cohort_tags(teacher_id))
+def get_sc_mastery_distribution():
+    """Get the distribution of students by mastery level for each success criterion"""
+    try:
+        columns = _load_scope()
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    return {
+        'evidence_count': len(columns),
+        'success_criteria': CohortAnalyticsService.sc_mastery_distribution(columns)
+    }, 200
+
+@analytics_bp.route('/cohort/growth', methods=['GET'])
+@jwt_required()
+@read_cache.cached(tags=lambda teacher_id: _cohort_tags(teacher_id))
+def get_weekly_growth():
+    """Get evidence volume, mean mastery and growth per week"""
+    try:
+        columns = _load_scope()
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    return {
+        'evidence_count': len(columns),
+        'weeks': CohortAnalyticsService.weekly_growth(columns)
+    }, 200
+
+@analytics_bp.route('/cohort/trends', methods=['GET'])
+@jwt_required()
+@read_cache.cached(tags=lambda teacher_id: _cohort_tags(teacher_id))
+def get_trends():
+    """Get how many student/LE pairs are improving, stable or declining"""
+    try:
+        columns = _load_scope()
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    return {
+        'evidence_count': len(columns),
+        **CohortAnalyticsService.trends(columns)
+    }, 200
@@ -0,0 +1,33 @@
+"""Live event stream API endpoints (Server-Sent Events)"""
+from flask import Blueprint, current_app, request, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.core.events import event_broker
+
+events_bp = Blueprint('events', __name__, url_prefix='/api/v1/events')
+
+@events_bp.route('/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream():
+    """
+    Stream the teacher's progress and job events
+    
+    EventSource can't send headers, so the token may also be passed as
+    ?jwt=. Reconnecting clients resume after their Last-Event-ID header (or
+    ?last_event_id=); a reset event means the gap is too old to replay and
+    the client should refetch.
+    """
+    teacher_id = get_jwt_identity()
+    
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_id = int(last_id) if last_id else None
+    except ValueError:
+        return {'error': 'Last-Event-ID must be an integer'}, 400
+    
+    response = current_app.response_class(
+        stream_with_context(event_broker.stream(teacher_id, last_id)),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -4,11 +4,40 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.services.evidence_service import EvidenceService
 from backend.services.student_progress_service import StudentProgressService
 from backend.services.lesson_service import LessonService
+from backend.services.learning_experience_service import LearningExperienceService
+from backend.core.read_cache import read_cache, ReadCache
+from backend.core.conditional import conditional, for_objects
+from backend.core.serialization import serialize_many
+from backend.models.evidence import Evidence
+from backend.models.student_progress import StudentProgress
+from backend.utils.helpers import get_cursor_and_limit
 from datetime import datetime
 from flask import Blueprint
 
 evidence_routes_bp = Blueprint('evidence_routes', __name__, url_prefix='/api/v1/evidence')
 
+def _teacher_evidence_tags(teacher_id, **kwargs):
+    return [ReadCache.tag('evidence', teacher_id)]
+
+def _student_tags(teacher_id, student_id, **kwargs):
+    """A student's evidence and progress change together"""
+    return [ReadCache.tag('student', student_id)]
+
+def _progress_tags(teacher_id, le_id, **kwargs):
+    return [ReadCache.tag('progress', le_id)]
+
+def _sc_coverage_tags(teacher_id, le_id, **kwargs):
+    """The criterion text comes from the LE"""
+    return [ReadCache.tag('progress', le_id), ReadCache.tag('les', teacher_id)]
+
+def _own_le(le_id):
+    """The caller's LE, or None if it doesn't exist or is another teacher's"""
+    le = LearningExperienceService.get_le(le_id)
+    return le if le and le.teacher_id == get_jwt_identity() else None
+
+def _matrix_tags(teacher_id, **kwargs):
+    return [ReadCache.tag('matrix', teacher_id), ReadCache.tag('les', teacher_id)]
+
 @evidence_routes_bp.route('', methods=['POST'])
 @jwt_required()
 def log_evidence():
@@ -16,16 +45,11 @@ def log_evidence():
     teacher_id = get_jwt_identity()
     data = request.get_json()
     
-    # Validate required fields
-    required_fields = ['student_id', 'learning_experience_id', 'observation_text', 'mastery_level']
-    for field in required_fields:
-        if field not in data:
-            return {'error': f'Missing required field: {field}'}, 400
+    error = EvidenceService.validate_observation(data)
+    if error:
+        return {'error': error}, 400
     
-    # Validate mastery level
     mastery_level = data['mastery_level']
-    if mastery_level not in [1, 2, 3, 4]:
-        return {'error': 'Mastery level must be 1-4'}, 400
     
     try:
         evidence = EvidenceService.log_evidence(
@@ -45,21 +69,101 @@ def log_evidence():
     except Exception as e:
         return {'error': str(e)}, 500
 
+@evidence_routes_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def log_evidence_batch():
+    """Log a round of observations (e.g. a whole-class walk-through) at once"""
+    teacher_id = get_jwt_identity()
+    data = request.get_json()
+    
+    observations = data.get('observations') if isinstance(data, dict) else None
+    if not isinstance(observations, list) or not observations:
+        return {'error': 'observations must be a non-empty list'}, 400
+    
+    if len(observations) > EvidenceService.MAX_BATCH_SIZE:
+        return {'error': f'At most {EvidenceService.MAX_BATCH_SIZE} observations per batch'}, 400
+    
+    try:
+        results, ok = EvidenceService.log_evidence_batch(teacher_id, observations)
+        
+        if not ok:
+            return {'error': 'Invalid observations', 'results': results}, 400
+        
+        return {'results': results, 'count': len(results)}, 201
+    
+    except Exception as e:
+        return {'error': str(e)}, 500
+
 @evidence_routes_bp.route('/student/<student_id>', methods=['GET'])
 @jwt_required()
+@conditional(tags=_student_tags)
 def get_student_evidence(student_id):
     """Get all evidence for a student"""
     teacher_id = get_jwt_identity()
     
-    # Get evidence
-    evidence_list = EvidenceService.get_student_evidence(student_id)
+    cursor, limit = get_cursor_and_limit(request)
+    try:
+        rows, next_cursor = EvidenceService.get_student_evidence_page(student_id, cursor, limit)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    return {
+        'evidence': serialize_many(rows, Evidence),
+        'next_cursor': next_cursor
+    }, 200
+
+@evidence_routes_bp.route('/teacher', methods=['GET'])
+@jwt_required()
+@conditional(tags=_teacher_evidence_tags)
+def get_teacher_evidence():
+    """Get evidence logged by the logged-in teacher, newest first"""
+    teacher_id = get_jwt_identity()
+    
+    cursor, limit = get_cursor_and_limit(request)
+    try:
+        rows, next_cursor = EvidenceService.get_teacher_evidence_page(teacher_id, cursor, limit)
+    except ValueError as e:
+        return {'error': str(e)}, 400
     
     return {
-        'evidence': [e.to_dict() for e in evidence_list]
+        'evidence': serialize_many(rows, Evidence),
+        'next_cursor': next_cursor
+    }, 200
+
+@evidence_routes_bp.route('/search', methods=['GET'])
+@jwt_required()
+@conditional(tags=_teacher_evidence_tags)
+def search_evidence():
+    """
+    Search the logged-in teacher's observations and notes, best matches first
+    
+    Query params: q (required), student_id, learning_experience_id, cursor, limit
+    """
+    teacher_id = get_jwt_identity()
+    
+    text = request.args.get('q', '').strip()
+    if not text:
+        return {'error': 'q is required'}, 400
+    
+    cursor, limit = get_cursor_and_limit(request)
+    try:
+        rows, next_cursor = EvidenceService.search_evidence(
+            teacher_id, text,
+            student_id=request.args.get('student_id'),
+            learning_experience_id=request.args.get('learning_experience_id'),
+            cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    return {
+        'evidence': serialize_many(rows, Evidence),
+        'next_cursor': next_cursor
     }, 200
 
 @evidence_routes_bp.route('/student/<student_id>/le/<le_id>', methods=['GET'])
 @jwt_required()
+@conditional(tags=_student_tags)
 def get_student_le_evidence(student_id, le_id):
     """Get evidence for student on specific LE"""
     teacher_id = get_jwt_identity()
@@ -85,7 +189,7 @@ def get_evidence(evidence_id):
     if evidence.teacher_id != teacher_id:
         return {'error': 'Unauthorized'}, 403
     
-    return {'evidence': evidence.to_dict()}, 200
+    return for_objects(evidence).respond(lambda: ({'evidence': evidence.to_dict()}, 200))
 
 @evidence_routes_bp.route('/<evidence_id>', methods=['PUT'])
 @jwt_required()
@@ -127,6 +231,7 @@ def delete_evidence(evidence_id):
 
 @evidence_routes_bp.route('/progress/student/<student_id>', methods=['GET'])
 @jwt_required()
+@conditional(tags=_student_tags)
 def get_student_progress(student_id):
     """Get all progress for a student"""
     teacher_id = get_jwt_identity()
@@ -139,15 +244,71 @@ def get_student_progress(student_id):
 
 @evidence_routes_bp.route('/progress/le/<le_id>', methods=['GET'])
 @jwt_required()
+@conditional(tags=_progress_tags)
+@read_cache.cached(tags=_progress_tags)
 def get_le_progress(le_id):
     """Get class progress on a LE"""
     teacher_id = get_jwt_identity()
     
-    progress_list = StudentProgressService.get_class_progress(le_id)
+    cursor, limit = get_cursor_and_limit(request)
+    try:
+        rows, next_cursor = StudentProgressService.get_class_progress_page(le_id, cursor, limit)
+    except ValueError as e:
+        return {'error': str(e)}, 400
     
     # Filter to only show progress for students in teacher's classes
     # (In real app, would verify teacher has access to these students)
     
     return {
-        'progress': [p.to_dict() for p in progress_list]
+        'progress': serialize_many(rows, StudentProgress),
+        'next_cursor': next_cursor
+    }, 200
+
+@evidence_routes_bp.route('/progress/le/<le_id>/success-criteria', methods=['GET'])
+@jwt_required()
+@conditional(tags=_sc_coverage_tags)
+@read_cache.cached(tags=_sc_coverage_tags)
+def get_le_sc_coverage(le_id):
+    """Get how many students have met, and shown evidence for, each success criterion on a LE"""
+    if not _own_le(le_id):
+        return {'error': 'Learning Experience not found'}, 404
+    
+    coverage = StudentProgressService.get_sc_coverage(le_id)
+    if coverage is None:
+        return {'error': 'Learning Experience not found'}, 404
+    
+    evidence_counts = EvidenceService.get_sc_evidence_counts(le_id)
+    for entry in coverage:
+        counts = evidence_counts.get(entry['sc_id'], {})
+        entry['evidence_count'] = counts.get('evidence_count', 0)
+        entry['students_with_evidence'] = counts.get('student_count', 0)
+    
+    return {
+        'learning_experience_id': le_id,
+        'success_criteria': coverage
+    }, 200
+
+@evidence_routes_bp.route('/progress/le/<le_id>/success-criteria/<sc_id>/students', methods=['GET'])
+@jwt_required()
+@conditional(tags=_progress_tags)
+@read_cache.cached(tags=_progress_tags)
+def get_students_meeting_sc(le_id, sc_id):
+    """Get the students who have met a success criterion on a LE"""
+    if not _own_le(le_id):
+        return {'error': 'Learning Experience not found'}, 404
+    
+    return {
+        'learning_experience_id': le_id,
+        'sc_id': sc_id,
+        'student_ids': StudentProgressService.get_students_meeting_sc(le_id, sc_id)
     }, 200
+
+@evidence_routes_bp.route('/progress/unit/<int:unit_number>/matrix', methods=['GET'])
+@jwt_required()
+@conditional(tags=_matrix_tags)
+@read_cache.cached(tags=_matrix_tags)
+def get_unit_matrix(unit_number):
+    """Get the class x LE mastery and SC coverage matrix for a unit (columnar layout)"""
+    teacher_id = get_jwt_identity()
+    return StudentProgressService.get_unit_matrix(teacher_id, unit_number), 200
+
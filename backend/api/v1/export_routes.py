@@ -0,0 +1,49 @@
+"""Bulk export API endpoints"""
+from flask import request, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.services.data_export_service import DataExportService
+from backend.utils.helpers import parse_date_param
+from flask import Blueprint
+
+exports_bp = Blueprint('exports', __name__, url_prefix='/api/v1/exports')
+
+@exports_bp.route('/<dataset>', methods=['GET'])
+@jwt_required()
+def export_dataset(dataset):
+    """
+    Stream the logged-in teacher's evidence, progress or lessons
+    
+    Query params: format (csv, ndjson, parquet or arrow), learning_experience_id, from, to
+    """
+    teacher_id = get_jwt_identity()
+    
+    if dataset not in DataExportService.DATASETS:
+        return {'error': f"Unknown dataset (expected one of: {', '.join(DataExportService.DATASETS)})"}, 404
+    
+    fmt = request.args.get('format', 'csv')
+    if fmt not in DataExportService.FORMATS:
+        return {'error': f"format must be one of: {', '.join(DataExportService.FORMATS)}"}, 400
+    if fmt in DataExportService.COLUMNAR_FORMATS and not DataExportService.columnar_available():
+        return {'error': f'{fmt} export requires pyarrow, which is not installed'}, 501
+    
+    try:
+        date_from = parse_date_param(request.args.get('from'))
+        date_to = parse_date_param(request.args.get('to'), end=True)
+    except ValueError:
+        return {'error': 'from and to must be ISO dates (YYYY-MM-DD)'}, 400
+    
+    query, model_class = DataExportService.build_query(
+        dataset, teacher_id,
+        learning_experience_id=request.args.get('learning_experience_id'),
+        date_from=date_from,
+        date_to=date_to
+    )
+    
+    response = Response(
+        stream_with_context(DataExportService.stream(query, model_class, fmt)),
+        mimetype=DataExportService.FORMATS[fmt]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename={dataset}.{fmt}'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Let proxies pass chunks through
+    return response
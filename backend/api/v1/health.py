@@ -1,7 +1,13 @@
 """Health check endpoint"""
 from . import health_bp
+from backend.core.read_cache import read_cache
 
 @health_bp.route('', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return {'status': 'healthy', 'service': 'NSW Lesson Planner'}, 200
+
+@health_bp.route('/cache', methods=['GET'])
+def cache_metrics():
+    """Read cache hit ratio and counters"""
+    return {'read_cache': read_cache.metrics()}, 200
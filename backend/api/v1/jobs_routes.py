@@ -0,0 +1,37 @@
+"""Background job API endpoints"""
+from flask import request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.core.jobs import job_queue
+from flask import Blueprint
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/v1/jobs')
+
+def job_accepted(job):
+    """Response for a newly queued (or de-duplicated) job"""
+    return {
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': f"/api/v1/jobs/{job['id']}"
+    }, 202
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """Get status and result of a background job"""
+    teacher_id = get_jwt_identity()
+    
+    job = job_queue.get(job_id)
+    if not job:
+        return {'error': 'Job not found'}, 404
+    
+    if job['teacher_id'] != teacher_id:
+        return {'error': 'Unauthorized'}, 403
+    
+    job.pop('fingerprint', None)
+    return {'job': job}, 200
+
+@jobs_bp.route('/metrics', methods=['GET'])
+@jwt_required()
+def get_job_metrics():
+    """Get queue depth per priority lane and job counters"""
+    return {'metrics': job_queue.metrics()}, 200
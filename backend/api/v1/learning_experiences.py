@@ -3,6 +3,8 @@ from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.services.learning_experience_service import LearningExperienceService
 from backend.core.errors import ValidationError, NotFoundError
+from backend.core.read_cache import read_cache, ReadCache
+from backend.core.conditional import conditional, for_objects
 from . import worksheets_bp
 
 # Use worksheets_bp and add a new blueprint
@@ -44,6 +46,8 @@ def create_learning_experience():
 
 @le_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional(tags=lambda teacher_id: [ReadCache.tag('les', teacher_id)])
+@read_cache.cached(tags=lambda teacher_id: [ReadCache.tag('les', teacher_id)])
 def get_learning_experiences():
     """Get all Learning Experiences for logged-in teacher"""
     teacher_id = get_jwt_identity()
@@ -70,7 +74,7 @@ def get_learning_experience(le_id):
     if le.teacher_id != teacher_id:
         return {'error': 'Unauthorized'}, 403
     
-    return {'learning_experience': le.to_dict()}, 200
+    return for_objects(le).respond(lambda: ({'learning_experience': le.to_dict()}, 200))
 
 @le_bp.route('/<le_id>', methods=['PUT'])
 @jwt_required()
@@ -2,6 +2,11 @@
 from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.services.lesson_service import LessonService
+from backend.core.read_cache import read_cache, ReadCache
+from backend.core.conditional import conditional, for_objects
+from backend.core.serialization import serialize_many
+from backend.models.lesson import Lesson
+from backend.utils.helpers import get_cursor_and_limit
 from flask import Blueprint
 from datetime import datetime
 
@@ -47,17 +52,20 @@ def create_lesson():
 
 @lessons_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional(tags=lambda teacher_id: [ReadCache.tag('lessons', teacher_id)])
+@read_cache.cached(tags=lambda teacher_id: [ReadCache.tag('lessons', teacher_id)])
 def get_lessons():
     """Get lessons for logged-in teacher"""
     teacher_id = get_jwt_identity()
     week_number = request.args.get('week_number', type=int)
+    cursor, limit = get_cursor_and_limit(request)
     
-    if week_number:
-        lessons = LessonService.get_week_lessons(teacher_id, week_number)
-    else:
-        lessons = LessonService.get_all_lessons(teacher_id)
+    try:
+        rows, next_cursor = LessonService.get_lessons_page(teacher_id, week_number, cursor, limit)
+    except ValueError as e:
+        return {'error': str(e)}, 400
     
-    return {'lessons': [l.to_dict() for l in lessons]}, 200
+    return {'lessons': serialize_many(rows, Lesson), 'next_cursor': next_cursor}, 200
 
 @lessons_bp.route('/<lesson_id>', methods=['GET'])
 @jwt_required()
@@ -72,7 +80,7 @@ def get_lesson(lesson_id):
     if lesson.teacher_id != teacher_id:
         return {'error': 'Unauthorized'}, 403
     
-    return {'lesson': lesson.to_dict()}, 200
+    return for_objects(lesson).respond(lambda: ({'lesson': lesson.to_dict()}, 200))
 
 @lessons_bp.route('/<lesson_id>', methods=['PUT'])
 @jwt_required()
@@ -0,0 +1,24 @@
+"""Weekly planner API endpoints"""
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.services.planner_service import PlannerService
+from backend.core.conditional import conditional
+from backend.core.read_cache import read_cache, ReadCache
+from flask import Blueprint
+
+planner_bp = Blueprint('planner', __name__, url_prefix='/api/v1/planner')
+
+def _week_tags(teacher_id, week_number):
+    """Every write that can change a week: lessons, LEs, worksheets and evidence"""
+    return [
+        ReadCache.tag('lessons', teacher_id), ReadCache.tag('les', teacher_id),
+        ReadCache.tag('worksheets', teacher_id), ReadCache.tag('evidence', teacher_id)
+    ]
+
+@planner_bp.route('/week/<int:week_number>', methods=['GET'])
+@jwt_required()
+@conditional(tags=_week_tags, weak=True)
+@read_cache.cached(tags=_week_tags)
+def get_week(week_number):
+    """Get the logged-in teacher's published lessons for a week with LEs, worksheets and evidence counts"""
+    teacher_id = get_jwt_identity()
+    return PlannerService.get_week(teacher_id, week_number), 200
@@ -2,13 +2,23 @@
 from flask import request
 from backend.models.student import Student
 from backend.core.database import db
+from backend.core.serialization import serializer_for, serialize_many
+from backend.utils.helpers import get_cursor_and_limit, keyset_paginate, page_results
 from . import students_bp
 
 @students_bp.route('', methods=['GET'])
 def get_students():
-    """Get all students"""
-    students = Student.query.all()
-    return {'students': [s.to_dict() for s in students]}, 200
+    """Get students in name order, one page at a time"""
+    cursor, limit = get_cursor_and_limit(request)
+    order = (Student.last_name, Student.first_name, Student.id)
+    
+    try:
+        query = keyset_paginate(serializer_for(Student).select(), order, cursor, limit)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    rows, next_cursor = page_results(db.session.execute(query).all(), order, limit)
+    return {'students': serialize_many(rows, Student), 'next_cursor': next_cursor}, 200
 
 @students_bp.route('', methods=['POST'])
 def create_student():
@@ -1,13 +1,46 @@
 """Support Files API endpoints - generate teacher resources"""
-from flask import request, jsonify, send_file
+from flask import request, jsonify, send_file, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.services.support_files_service import SupportFilesService
 from backend.services.lesson_service import LessonService
+from backend.services.unit_export_service import UnitExportService
+from backend.core.document_cache import document_cache
+from backend.core.jobs import job_queue
+from backend.api.v1.jobs_routes import job_accepted
+from backend.utils.helpers import is_truthy
 from flask import Blueprint
-import os
+
+# URL slug -> document name for downloads
+DOWNLOADABLE_DOCUMENTS = {
+    'teacher-guide': 'teacher_guide',
+    'answer-sheet': 'answer_sheet',
+    'exemplar': 'exemplar'
+}
+
+DOCX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
 
 support_files_bp = Blueprint('support_files', __name__, url_prefix='/api/v1/support-files')
 
+def _enqueue_generation(lesson_id, teacher_id, document=None):
+    """Queue support file generation unless the client asked to wait (?wait=true)"""
+    if is_truthy(request.args.get('wait')):
+        return None
+    
+    payload = {
+        'lesson_id': lesson_id,
+        'output_dir': SupportFilesService.output_dir_for(teacher_id, lesson_id)
+    }
+    if document:
+        payload['document'] = document
+    
+    try:
+        job = job_queue.enqueue('generate_support_files', payload,
+                                teacher_id=teacher_id,
+                                lane=request.args.get('priority', 'normal'))
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    return job_accepted(job)
+
 @support_files_bp.route('/generate/<lesson_id>', methods=['POST'])
 @jwt_required()
 def generate_support_files(lesson_id):
@@ -21,9 +54,13 @@ def generate_support_files(lesson_id):
     if lesson.teacher_id != teacher_id:
         return {'error': 'Unauthorized'}, 403
     
+    queued = _enqueue_generation(lesson_id, teacher_id)
+    if queued:
+        return queued
+    
     try:
         # Generate files
-        results = SupportFilesService.generate_all(lesson_id, output_dir='/tmp')
+        results = SupportFilesService.generate_all(lesson_id, output_dir=SupportFilesService.output_dir_for(teacher_id, lesson_id))
         
         return {
             'message': 'Support files generated successfully',
@@ -46,8 +83,12 @@ def generate_teacher_guide(lesson_id):
     if lesson.teacher_id != teacher_id:
         return {'error': 'Unauthorized'}, 403
     
+    queued = _enqueue_generation(lesson_id, teacher_id, 'teacher_guide')
+    if queued:
+        return queued
+    
     try:
-        result = SupportFilesService.generate_teacher_guide(lesson_id, output_dir='/tmp')
+        result = SupportFilesService.generate_teacher_guide(lesson_id, output_dir=SupportFilesService.output_dir_for(teacher_id, lesson_id))
         if result:
             return {'file': result}, 201
         return {'error': 'Failed to generate teacher guide'}, 500
@@ -67,8 +108,12 @@ def generate_answer_sheet(lesson_id):
     if lesson.teacher_id != teacher_id:
         return {'error': 'Unauthorized'}, 403
     
+    queued = _enqueue_generation(lesson_id, teacher_id, 'answer_sheet')
+    if queued:
+        return queued
+    
     try:
-        result = SupportFilesService.generate_answer_sheet(lesson_id, output_dir='/tmp')
+        result = SupportFilesService.generate_answer_sheet(lesson_id, output_dir=SupportFilesService.output_dir_for(teacher_id, lesson_id))
         if result:
             return {'file': result}, 201
         return {'error': 'Failed to generate answer sheet'}, 500
@@ -88,10 +133,85 @@ def generate_exemplar(lesson_id):
     if lesson.teacher_id != teacher_id:
         return {'error': 'Unauthorized'}, 403
     
+    queued = _enqueue_generation(lesson_id, teacher_id, 'exemplar')
+    if queued:
+        return queued
+    
     try:
-        result = SupportFilesService.generate_exemplar(lesson_id, output_dir='/tmp')
+        result = SupportFilesService.generate_exemplar(lesson_id, output_dir=SupportFilesService.output_dir_for(teacher_id, lesson_id))
         if result:
             return {'file': result}, 201
         return {'error': 'Failed to generate exemplar'}, 500
     except Exception as e:
         return {'error': str(e)}, 500
+
+@support_files_bp.route('/<document>/<lesson_id>/download', methods=['GET'])
+@jwt_required()
+def download_document(document, lesson_id):
+    """Stream a generated document (supports ETag revalidation and Range requests)"""
+    teacher_id = get_jwt_identity()
+    
+    name = DOWNLOADABLE_DOCUMENTS.get(document)
+    if not name:
+        return {'error': 'Unknown document type'}, 404
+    
+    lesson = LessonService.get_lesson(lesson_id)
+    if not lesson:
+        return {'error': 'Lesson not found'}, 404
+    
+    if lesson.teacher_id != teacher_id:
+        return {'error': 'Unauthorized'}, 403
+    
+    try:
+        opened = SupportFilesService.open_document(lesson_id, name)
+        if not opened:
+            return {'error': f'No {name.replace("_", " ")} available for this lesson'}, 404
+        
+        try:
+            response = _send_document(opened)
+        except FileNotFoundError:
+            # Evicted between lookup and open - the retry rebuilds it
+            opened = SupportFilesService.open_document(lesson_id, name)
+            response = _send_document(opened)
+        
+        response.headers['X-Cache'] = 'HIT' if opened['cached'] else 'MISS'
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.headers['Accept-Ranges'] = 'bytes'
+        return response
+    except Exception as e:
+        return {'error': str(e)}, 500
+
+def _send_document(opened):
+    """Build a conditional, range-aware response for an opened document"""
+    return send_file(
+        opened['source'],
+        mimetype=DOCX_MIMETYPE,
+        as_attachment=True,
+        download_name=opened['filename'],
+        conditional=True,
+        etag=opened['etag']
+    )
+
+@support_files_bp.route('/unit/<int:unit_number>/export', methods=['GET'])
+@jwt_required()
+def export_unit(unit_number):
+    """Stream a ZIP of every lesson's worksheets and support files in a unit"""
+    teacher_id = get_jwt_identity()
+    
+    plan = UnitExportService.plan_unit(teacher_id, unit_number)
+    if not plan:
+        return {'error': 'No lessons found for this unit'}, 404
+    
+    response = Response(
+        stream_with_context(UnitExportService.stream_unit(plan)),
+        mimetype='application/zip'
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename=Unit{unit_number}.zip'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@support_files_bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """Get document cache hit/miss counters"""
+    return {'cache': document_cache.stats()}, 200
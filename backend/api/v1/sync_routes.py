@@ -0,0 +1,24 @@
+"""Delta sync API endpoints"""
+from flask import request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.services.sync_service import SyncService
+from flask import Blueprint
+
+sync_bp = Blueprint('sync', __name__, url_prefix='/api/v1/sync')
+
+@sync_bp.route('', methods=['GET'])
+@jwt_required()
+def sync():
+    """
+    Get everything that changed since the client's last sync
+    
+    Query params: since (next_token from the previous sync; omit for a full sync)
+    """
+    teacher_id = get_jwt_identity()
+    
+    try:
+        result = SyncService.get_changes(teacher_id, request.args.get('since') or None)
+    except ValueError:
+        return {'error': 'Invalid sync token; sync again without since'}, 400
+    
+    return result, 200
@@ -2,13 +2,23 @@
 from flask import request, jsonify
 from backend.models.worksheet import Worksheet
 from backend.core.database import db
+from backend.core.serialization import serializer_for, serialize_many
+from backend.utils.helpers import get_cursor_and_limit, keyset_paginate, page_results
 from . import worksheets_bp
 
 @worksheets_bp.route('', methods=['GET'])
 def get_worksheets():
-    """Get all worksheets"""
-    worksheets = Worksheet.query.all()
-    return {'worksheets': [w.to_dict() for w in worksheets]}, 200
+    """Get worksheets, oldest first, one page at a time"""
+    cursor, limit = get_cursor_and_limit(request)
+    order = (Worksheet.created_at, Worksheet.id)
+    
+    try:
+        query = keyset_paginate(serializer_for(Worksheet).select(), order, cursor, limit)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    rows, next_cursor = page_results(db.session.execute(query).all(), order, limit)
+    return {'worksheets': serialize_many(rows, Worksheet), 'next_cursor': next_cursor}, 200
 
 @worksheets_bp.route('/<worksheet_id>', methods=['GET'])
 def get_worksheet(worksheet_id):
@@ -3,6 +3,11 @@ from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.services.worksheet_service import WorksheetService
 from backend.services.lesson_service import LessonService
+from backend.core.jobs import job_queue
+from backend.api.v1.jobs_routes import job_accepted
+from backend.utils.helpers import is_truthy
+from backend.core.conditional import conditional, for_objects
+from backend.core.read_cache import ReadCache
 from flask import Blueprint
 
 worksheets_routes_bp = Blueprint('worksheets_routes', __name__, url_prefix='/api/v1/worksheets')
@@ -20,6 +25,16 @@ def generate_worksheets(lesson_id):
     if lesson.teacher_id != teacher_id:
         return {'error': 'Unauthorized'}, 403
     
+    # Queue by default; ?wait=true generates inline as before
+    if not is_truthy(request.args.get('wait')):
+        try:
+            job = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id},
+                                    teacher_id=teacher_id,
+                                    lane=request.args.get('priority', 'normal'))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return job_accepted(job)
+    
     try:
         worksheets = WorksheetService.generate_worksheets(lesson_id)
         
@@ -37,6 +52,7 @@ def generate_worksheets(lesson_id):
 
 @worksheets_routes_bp.route('/lesson/<lesson_id>', methods=['GET'])
 @jwt_required()
+@conditional(tags=lambda teacher_id, lesson_id: [ReadCache.tag('worksheets', teacher_id)])
 def get_lesson_worksheets(lesson_id):
     """Get all worksheets for a lesson"""
     teacher_id = get_jwt_identity()
@@ -69,13 +85,15 @@ def get_worksheet(worksheet_id):
     if lesson.teacher_id != teacher_id:
         return {'error': 'Unauthorized'}, 403
     
-    # Get questions
-    questions = WorksheetService.get_questions(worksheet_id)
+    def build():
+        questions = WorksheetService.get_questions(worksheet_id)
+        return {
+            'worksheet': worksheet.to_dict(),
+            'questions': [q.to_dict() for q in questions]
+        }, 200
     
-    return {
-        'worksheet': worksheet.to_dict(),
-        'questions': [q.to_dict() for q in questions]
-    }, 200
+    # Question edits touch the worksheet, so its updated_at covers both
+    return for_objects(worksheet).respond(build)
 
 @worksheets_routes_bp.route('/<worksheet_id>/questions/<question_id>', methods=['PUT'])
 @jwt_required()
@@ -122,9 +140,12 @@ def get_tier_worksheet(worksheet_id, tier):
     if worksheet.tier != tier:
         return {'error': 'Tier mismatch'}, 400
     
-    questions = WorksheetService.get_questions(worksheet_id)
+    def build():
+        questions = WorksheetService.get_questions(worksheet_id)
+        return {
+            'worksheet': worksheet.to_dict(),
+            'questions': [q.to_dict() for q in questions]
+        }, 200
     
-    return {
-        'worksheet': worksheet.to_dict(),
-        'questions': [q.to_dict() for q in questions]
-    }, 200
+    # Question edits touch the worksheet, so its updated_at covers both
+    return for_objects(worksheet).respond(build)
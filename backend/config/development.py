@@ -11,3 +11,32 @@ class DevelopmentConfig:
     )
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-secret-key-change-in-production')
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
+    DOCUMENT_CACHE_DIR = os.getenv('DOCUMENT_CACHE_DIR', '/tmp/nsw_document_cache')
+    DOCUMENT_CACHE_MAX_BYTES = int(os.getenv('DOCUMENT_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+    SUPPORT_FILES_DIR = os.getenv('SUPPORT_FILES_DIR', '/tmp/nsw_support_files')
+    SUPPORT_FILES_WORKERS = int(os.getenv('SUPPORT_FILES_WORKERS', 3))
+    SUPPORT_FILES_EXECUTOR = os.getenv('SUPPORT_FILES_EXECUTOR', 'thread')  # thread or process
+    DB_AUTO_MIGRATE = os.getenv('DB_AUTO_MIGRATE', 'false').lower() == 'true'  # Else run `flask db upgrade` per deploy
+    REDIS_URL = os.getenv('REDIS_URL')
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', 3600))
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 60))  # Running jobs are requeued this long after their worker stops
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    PAGE_SIZE_DEFAULT = int(os.getenv('PAGE_SIZE_DEFAULT', 50))
+    PAGE_SIZE_MAX = int(os.getenv('PAGE_SIZE_MAX', 200))
+    READ_CACHE_ENABLED = os.getenv('READ_CACHE_ENABLED', 'true').lower() == 'true'
+    READ_CACHE_TTL = int(os.getenv('READ_CACHE_TTL', 60))
+    READ_CACHE_MAX_ENTRIES = int(os.getenv('READ_CACHE_MAX_ENTRIES', 1024))  # In-process fallback only
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))  # Rows per server-side cursor fetch
+    EXPORT_COLUMNAR_BATCH_SIZE = int(os.getenv('EXPORT_COLUMNAR_BATCH_SIZE', 10000))  # Rows per Parquet row group
+    SYNC_OVERLAP_SECONDS = int(os.getenv('SYNC_OVERLAP_SECONDS', 5))  # Re-send changes this close to the last sync
+    EVENTS_HISTORY_SIZE = int(os.getenv('EVENTS_HISTORY_SIZE', 500))  # Events kept per teacher for Last-Event-ID resume
+    EVENTS_HISTORY_TTL = int(os.getenv('EVENTS_HISTORY_TTL', 3600))
+    EVENTS_HEARTBEAT_SECONDS = int(os.getenv('EVENTS_HEARTBEAT_SECONDS', 15))
+    EVENTS_STREAM_MAX_SECONDS = int(os.getenv('EVENTS_STREAM_MAX_SECONDS', 300))  # Clients reconnect and resume after this
+    QUERY_STATS_HEADERS = True  # X-Query-Count / X-Query-Time-Ms / X-Query-Repeated
+    QUERY_STATS_LOG = False  # Log per-request query stats as structured fields
+    QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', 5))
+    QUERY_BUDGET = int(os.getenv('QUERY_BUDGET')) if os.getenv('QUERY_BUDGET') else None
+    QUERY_BUDGETS = {}  # Per-endpoint overrides, e.g. {'lessons.get_lessons': 5}
+    QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'false').lower() == 'true'
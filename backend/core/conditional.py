@@ -0,0 +1,126 @@
+"""
+Conditional GET support
+Derives ETag and Last-Modified validators for JSON GET responses - from
+updated_at for single resources, from per-tag change versions for
+collections - and answers requests whose copy is current with 304 Not
+Modified before the payload is built
+"""
+
+from datetime import datetime
+from flask import current_app, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from werkzeug.http import is_resource_modified
+from backend.core.database import db
+from backend.core.read_cache import ReadCache
+from backend.models.change_version import ChangeVersion
+import functools
+import hashlib
+import json
+
+class Validators:
+    """An ETag and Last-Modified pair for one representation"""
+    __slots__ = ('etag', 'last_modified', 'weak')
+    
+    def __init__(self, etag, last_modified=None, weak=False):
+        self.etag = etag
+        # HTTP dates have one-second resolution
+        self.last_modified = last_modified.replace(microsecond=0) if last_modified else None
+        self.weak = weak
+    
+    def not_modified(self):
+        """A 304 response if the request's validators match, else None"""
+        if is_resource_modified(request.environ, etag=self.etag, last_modified=self.last_modified):
+            return None
+        return self.apply(current_app.response_class(status=304))
+    
+    def respond(self, build):
+        """304 if the request's copy is current, else build()'s result with the validators"""
+        not_modified = self.not_modified()
+        if not_modified is not None:
+            return not_modified
+        return self.apply(build())
+    
+    def apply(self, result):
+        """Make a response from a view result and attach the validators"""
+        response = make_response(result)
+        if response.status_code in (200, 304):
+            response.set_etag(self.etag, weak=self.weak)
+            if self.last_modified:
+                response.last_modified = self.last_modified
+            response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+def _digest(*parts):
+    return hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()[:32]
+
+def for_objects(*objects):
+    """
+    Validators for a response built from these model instances
+    
+    Any write through the ORM moves updated_at, which changes the ETag.
+    """
+    return Validators(
+        _digest([[type(obj).__name__, obj.id, obj.updated_at] for obj in objects]),
+        max(obj.updated_at for obj in objects)
+    )
+
+def for_tags(teacher_id, tags, weak=False):
+    """
+    Validators for a collection from the change versions of its tags
+    
+    The ETag covers the teacher, path, query string and every tag version;
+    Last-Modified is the latest write under any of the tags.
+    """
+    tags = sorted(tags)
+    versions = ChangeVersion.lookup(tags)
+    etag = _digest(
+        teacher_id, request.path, sorted(request.args.items(multi=True)),
+        [(tag, versions[tag].version if tag in versions else 0) for tag in tags]
+    )
+    last_modified = max((row.updated_at for row in versions.values()), default=None)
+    return Validators(etag, last_modified, weak=weak)
+
+def conditional(tags, weak=False):
+    """
+    Conditional GET for a collection view
+    
+    Apply below @jwt_required() and above @read_cache.cached. Requests whose
+    If-None-Match / If-Modified-Since still match get a 304 without the view
+    running; other 200 responses are tagged with ETag and Last-Modified.
+    
+    Args:
+        tags: Callable taking (teacher_id, **view_kwargs) and returning the
+            tags whose writes change the response (as for read_cache.cached)
+        weak: Send a weak ETag (the representation is semantically, not
+            byte-for-byte, stable)
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            teacher_id = get_jwt_identity()
+            validators = for_tags(teacher_id, tags(teacher_id, **kwargs), weak=weak)
+            return validators.respond(lambda: view(*args, **kwargs))
+        return wrapper
+    return decorator
+
+@event.listens_for(Session, 'before_commit')
+def _bump_change_versions(session):
+    """Count this transaction's writes under every tag it invalidates"""
+    tags = ReadCache.pending_tags(session)
+    if not tags:
+        return
+    
+    table = ChangeVersion.__table__
+    dialect = session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+    now = datetime.utcnow()
+    # Sorted so concurrent transactions lock tag rows in the same order
+    statement = insert(table).values([{'tag': tag, 'version': 1, 'updated_at': now} for tag in sorted(tags)])
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.tag],
+        set_={'version': table.c.version + 1, 'updated_at': statement.excluded.updated_at}
+    )
+    session.execute(statement)
@@ -3,13 +3,71 @@ Database Configuration and Models
 SQLAlchemy setup with BaseModel for all database operations
 """
 
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from backend.core.serialization import serializer_for
 from datetime import datetime
+import functools
 import uuid
 
 # Create SQLAlchemy instance (will be initialized in app factory)
 db = SQLAlchemy()
 
+def _lookup_cache():
+    """Per-request cache of find_by_* results, or None outside an app context"""
+    if not has_app_context():
+        return None
+    if 'lookup_cache' not in g:
+        g.lookup_cache = {}
+    return g.lookup_cache
+
+def invalidate_lookups():
+    """Drop cached lookups for the current request (called on every write)"""
+    if has_app_context():
+        g.pop('lookup_cache', None)
+
+def cached_lookup(method):
+    """
+    Cache a find_by_* classmethod's result for the rest of the request
+    
+    Results are dropped whenever the session flushes, commits, rolls back or
+    runs a bulk statement, and lookups bypass the cache while the session has
+    unflushed changes, so callers always see what a fresh query would return.
+    """
+    @functools.wraps(method)
+    def wrapper(cls, *args, **kwargs):
+        cache = _lookup_cache()
+        session = db.session
+        if cache is None or session.new or session.deleted or session.dirty:
+            return method(cls, *args, **kwargs)
+        
+        key = (cls.__name__, method.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            if key in cache:
+                result = cache[key]
+                return list(result) if isinstance(result, list) else result
+        except TypeError:
+            # Unhashable arguments - not cacheable
+            return method(cls, *args, **kwargs)
+        
+        result = method(cls, *args, **kwargs)
+        cache[key] = result
+        return list(result) if isinstance(result, list) else result
+    return wrapper
+
+@event.listens_for(Session, 'after_flush')
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _invalidate_on_write(session, *args):
+    invalidate_lookups()
+
+@event.listens_for(Session, 'do_orm_execute')
+def _invalidate_on_bulk(orm_execute_state):
+    if not orm_execute_state.is_select:
+        invalidate_lookups()
+
 class BaseModel(db.Model):
     """Base model with common fields for all models"""
     __abstract__ = True
@@ -20,14 +78,7 @@ class BaseModel(db.Model):
     
     def to_dict(self):
         """Convert model to dictionary"""
-        result = {}
-        for column in self.__table__.columns:
-            value = getattr(self, column.name)
-            if isinstance(value, datetime):
-                result[column.name] = value.isoformat()
-            else:
-                result[column.name] = value
-        return result
+        return serializer_for(type(self)).serialize(self)
     
     def to_json(self):
         """Convert model to JSON-serializable dict"""
@@ -37,17 +88,21 @@ class BaseModel(db.Model):
         """Save model to database"""
         db.session.add(self)
         db.session.commit()
+        invalidate_lookups()
         return self
     
     def delete(self):
         """Delete model from database"""
         db.session.delete(self)
         db.session.commit()
+        invalidate_lookups()
     
     @classmethod
     def query_by_id(cls, id):
-        """Query model by ID"""
-        return cls.query.filter_by(id=id).first()
+        """Query model by ID (served from the session identity map when already loaded)"""
+        if id is None:
+            return None
+        return db.session.get(cls, id)
     
     @classmethod
     def query_all(cls):
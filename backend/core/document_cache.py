@@ -0,0 +1,251 @@
+"""
+Content-addressed cache for generated documents
+Stores rendered .docx files keyed by a hash of every input that shapes them
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+# Model columns that never change document content: timestamps, and row
+# identities that regenerating worksheets replaces without changing content
+IGNORED_FIELDS = ('created_at', 'updated_at', 'id', 'worksheet_id', 'lesson_id')
+
+class DocumentCache:
+    """Size-bounded LRU cache of generated documents on local disk"""
+    
+    DEFAULT_DIR = '/tmp/nsw_document_cache'
+    DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+    
+    def __init__(self, app=None):
+        self.cache_dir = self.DEFAULT_DIR
+        self.max_bytes = self.DEFAULT_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Configure cache location and size from app config"""
+        self.configure(
+            app.config.get('DOCUMENT_CACHE_DIR', self.DEFAULT_DIR),
+            app.config.get('DOCUMENT_CACHE_MAX_BYTES', self.DEFAULT_MAX_BYTES)
+        )
+        app.extensions['document_cache'] = self
+    
+    def configure(self, cache_dir, max_bytes):
+        """Set cache location and size (also used by worker processes without an app)"""
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def fingerprint(model):
+        """Content fields of a model row (no timestamps or row IDs), for use in a cache key"""
+        if model is None:
+            return None
+        return {
+            key: value for key, value in model.to_dict().items()
+            if key not in IGNORED_FIELDS
+        }
+    
+    @staticmethod
+    def make_key(generator, version, inputs):
+        """
+        Hash generator identity and inputs into a cache key
+        
+        Args:
+            generator: Generator name
+            version: Generator version (bump when output layout changes)
+            inputs: JSON-serializable structure of everything the document uses
+        
+        Returns:
+            Hex digest string
+        """
+        payload = json.dumps(
+            {'generator': generator, 'version': version, 'inputs': inputs},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def path_for(self, key):
+        """Path of the cached artifact for a key"""
+        return os.path.join(self.cache_dir, f'{key}.docx')
+    
+    def get(self, key):
+        """
+        Look up a cached artifact
+        
+        Returns:
+            Path to the cached file, or None on a miss
+        """
+        path = self.path_for(key)
+        try:
+            # Touch on access so eviction is least-recently-used
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return path
+    
+    def put(self, key, doc):
+        """
+        Store a python-docx Document under a key
+        
+        Returns:
+            Path to the cached file
+        """
+        return self._store(key, doc.save)
+    
+    def put_bytes(self, key, data):
+        """
+        Store an already-serialized document under a key
+        
+        Returns:
+            Path to the cached file
+        """
+        return self._store(key, lambda f: f.write(data))
+    
+    def _store(self, key, write):
+        """Atomically publish an artifact written by write(file)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path_for(key)
+        
+        # Write to a temp file first so readers never see a partial document
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            
+            # Make room before publishing so the new entry is never evicted itself
+            self.evict(reserve=os.path.getsize(tmp_path))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        return path
+    
+    def fetch(self, key, build):
+        """
+        Get an artifact for streaming, building it in memory on a miss
+        
+        Args:
+            key: Cache key from make_key
+            build: Callable returning a python-docx Document
+        
+        Returns:
+            Tuple of (source, cached) where source is the cached file path on a
+            hit, or a BytesIO of the freshly built document on a miss
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        
+        buffer = io.BytesIO()
+        build().save(buffer)
+        self.put_bytes(key, buffer.getvalue())
+        buffer.seek(0)
+        return buffer, False
+    
+    def render(self, key, output_path, build):
+        """
+        Copy a cached artifact to output_path, building it on a miss
+        
+        Args:
+            key: Cache key from make_key
+            output_path: Where the caller expects the file
+            build: Callable returning a python-docx Document
+        
+        Returns:
+            True if served from cache, False if built
+        """
+        cached = self.get(key)
+        if cached is not None:
+            try:
+                self._copy(cached, output_path)
+                return True
+            except FileNotFoundError:
+                # Evicted between lookup and copy - rebuild below
+                pass
+        
+        cached = self.put(key, build())
+        self._copy(cached, output_path)
+        return False
+    
+    @staticmethod
+    def _copy(cached, output_path):
+        """Copy a cached artifact unless the caller asked for the cache path itself"""
+        if os.path.abspath(cached) != os.path.abspath(output_path):
+            shutil.copyfile(cached, output_path)
+    
+    def evict(self, reserve=0):
+        """
+        Remove least-recently-used artifacts until under max_bytes
+        
+        Args:
+            reserve: Bytes to leave free for an entry about to be added
+        """
+        limit = self.max_bytes - reserve
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.docx'):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        
+        entries.sort()
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+    
+    def record(self, hits=0, misses=0):
+        """Add lookups counted in a worker process to this process's counters"""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+    
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        
+        size = 0
+        count = 0
+        if os.path.isdir(self.cache_dir):
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.docx'):
+                        size += entry.stat().st_size
+                        count += 1
+        
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / lookups if lookups else 0.0,
+            'entries': count,
+            'size_bytes': size,
+            'max_bytes': self.max_bytes
+        }
+
+# Shared instance (initialized in app factory)
+document_cache = DocumentCache()
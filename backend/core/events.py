@@ -0,0 +1,262 @@
+"""
+Live event fan-out for Server-Sent Events
+Publishes per-teacher events (progress changes, finished generation jobs)
+through Redis pub/sub, or an in-process broker when Redis is unavailable,
+and keeps a short numbered history per teacher so reconnecting clients can
+resume from their Last-Event-ID
+"""
+
+from collections import deque
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from backend.core.database import db
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Sent when a client's Last-Event-ID is older than the kept history (or
+# from before a restart): the client must refetch instead of replaying
+RESET = 'reset'
+
+def _resume(history, latest, last_id):
+    """
+    Events a client that last saw last_id has missed
+    
+    Args:
+        history: Kept events for the channel, oldest first
+        latest: ID of the newest event published on the channel
+        last_id: Last event ID the client saw
+    
+    Returns:
+        List of events (a single reset event if the gap can't be replayed)
+    """
+    if last_id > latest or (history and history[0]['id'] > last_id + 1) or (not history and last_id < latest):
+        return [{'id': latest, 'event': RESET, 'data': {}}]
+    return [e for e in history if e['id'] > last_id]
+
+class LocalBroker:
+    """Channels and history held in this process's memory"""
+    
+    def __init__(self, history_size):
+        self.history_size = history_size
+        self._history = {}
+        self._latest = {}
+        self._condition = threading.Condition()
+    
+    def publish(self, channel, name, data):
+        with self._condition:
+            event_id = self._latest.get(channel, 0) + 1
+            self._latest[channel] = event_id
+            history = self._history.setdefault(channel, deque(maxlen=self.history_size))
+            history.append({'id': event_id, 'event': name, 'data': data})
+            self._condition.notify_all()
+        return event_id
+    
+    def listen(self, channel, last_id, timeout):
+        with self._condition:
+            if last_id is None:
+                last_id = self._latest.get(channel, 0)
+            pending = self._missed(channel, last_id)
+        
+        while True:
+            for item in pending:
+                last_id = item['id']
+                yield item
+            with self._condition:
+                pending = self._missed(channel, last_id)
+                if not pending:
+                    self._condition.wait(timeout)
+                    pending = self._missed(channel, last_id)
+            if not pending:
+                yield None
+    
+    def _missed(self, channel, last_id):
+        """Events after last_id (caller holds the condition)"""
+        return _resume(list(self._history.get(channel, ())), self._latest.get(channel, 0), last_id)
+
+class RedisBroker:
+    """Channels shared between processes through Redis pub/sub"""
+    
+    PREFIX = 'nsw:events'
+    
+    # Number the event, keep it in the capped history and publish it
+    # atomically, so subscribers always receive IDs in order
+    PUBLISH_SCRIPT = """
+local id = redis.call('INCR', KEYS[1])
+local message = id .. ' ' .. ARGV[1]
+redis.call('LPUSH', KEYS[2], message)
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[2]) - 1)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('PUBLISH', KEYS[3], message)
+return id
+"""
+
+    def __init__(self, client, history_size, history_ttl):
+        self.client = client
+        self.history_size = history_size
+        self.history_ttl = history_ttl
+        self._publish = client.register_script(self.PUBLISH_SCRIPT)
+    
+    def _key(self, *parts):
+        return ':'.join((self.PREFIX,) + parts)
+    
+    @staticmethod
+    def _decode(message):
+        if isinstance(message, bytes):
+            message = message.decode('utf-8')
+        event_id, body = message.split(' ', 1)
+        return {'id': int(event_id), **json.loads(body)}
+    
+    def publish(self, channel, name, data):
+        body = json.dumps({'event': name, 'data': data}, default=str)
+        return self._publish(
+            keys=[self._key('seq', channel), self._key('history', channel), self._key('channel', channel)],
+            args=[body, self.history_size, self.history_ttl]
+        )
+    
+    def listen(self, channel, last_id, timeout):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        # Subscribe before reading the history so nothing falls in between
+        pubsub.subscribe(self._key('channel', channel))
+        try:
+            pipe = self.client.pipeline()
+            pipe.get(self._key('seq', channel))
+            pipe.lrange(self._key('history', channel), 0, -1)
+            latest, history = pipe.execute()
+            latest = int(latest or 0)
+            
+            if last_id is None:
+                last_id = latest
+            for item in _resume([self._decode(m) for m in reversed(history)], latest, last_id):
+                last_id = item['id']
+                yield item
+            
+            while True:
+                message = pubsub.get_message(timeout=timeout)
+                if message is None:
+                    yield None
+                    continue
+                item = self._decode(message['data'])
+                # Already replayed from the history
+                if item['id'] <= last_id:
+                    continue
+                last_id = item['id']
+                yield item
+        finally:
+            pubsub.close()
+
+class EventBroker:
+    """Publish events to a teacher's open streams"""
+    
+    DEFAULT_HISTORY_SIZE = 500
+    DEFAULT_HISTORY_TTL = 3600
+    DEFAULT_HEARTBEAT = 15
+    DEFAULT_STREAM_MAX_SECONDS = 300
+    # How long EventSource waits before reconnecting after a stream ends
+    RECONNECT_MS = 1000
+    
+    def __init__(self, app=None):
+        self.backend = LocalBroker(self.DEFAULT_HISTORY_SIZE)
+        self.heartbeat = self.DEFAULT_HEARTBEAT
+        self.stream_max_seconds = self.DEFAULT_STREAM_MAX_SECONDS
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Pick a backend from app config"""
+        history_size = app.config.get('EVENTS_HISTORY_SIZE', self.DEFAULT_HISTORY_SIZE)
+        history_ttl = app.config.get('EVENTS_HISTORY_TTL', self.DEFAULT_HISTORY_TTL)
+        self.heartbeat = app.config.get('EVENTS_HEARTBEAT_SECONDS', self.DEFAULT_HEARTBEAT)
+        self.stream_max_seconds = app.config.get('EVENTS_STREAM_MAX_SECONDS', self.DEFAULT_STREAM_MAX_SECONDS)
+        
+        redis_url = app.config.get('REDIS_URL')
+        self.backend = None
+        if redis_url:
+            try:
+                import redis
+                client = redis.Redis.from_url(redis_url)
+                client.ping()
+                self.backend = RedisBroker(client, history_size, history_ttl)
+            except Exception as e:
+                logger.warning('Redis unavailable for events (%s), using in-process broker', e)
+        
+        if self.backend is None:
+            self.backend = LocalBroker(history_size)
+        
+        app.extensions['event_broker'] = self
+    
+    def publish(self, teacher_id, name, data):
+        """
+        Publish an event to a teacher's streams now
+        
+        Args:
+            teacher_id: ID of teacher whose streams receive the event
+            name: Event type (the SSE event field)
+            data: JSON-serializable payload
+        
+        Returns:
+            Event ID, or None if publishing failed
+        """
+        try:
+            return self.backend.publish(str(teacher_id), name, data)
+        except Exception as e:
+            logger.warning('Event publish failed: %s', e)
+            return None
+    
+    def publish_on_commit(self, teacher_id, name, data, key=None):
+        """
+        Publish an event once the current database transaction commits
+        
+        Events with the same teacher, name and key are coalesced: only the
+        last payload queued in a transaction is published.
+        """
+        pending = db.session.info.setdefault('pending_events', {})
+        pending[(str(teacher_id), name, key if key is not None else len(pending))] = data
+    
+    def listen(self, teacher_id, last_id=None, timeout=None):
+        """
+        Events for a teacher, resuming after last_id
+        
+        Yields each event dict (id, event, data), or None after timeout
+        seconds without one. With no last_id only new events are yielded.
+        """
+        return self.backend.listen(str(teacher_id), last_id, timeout or self.heartbeat)
+    
+    def stream(self, teacher_id, last_id=None):
+        """
+        Server-Sent Events text for a teacher's events
+        
+        Comments keep idle connections alive; the stream ends after
+        stream_max_seconds and EventSource reconnects with Last-Event-ID,
+        so long-lived connections are spread over workers.
+        """
+        deadline = time.monotonic() + self.stream_max_seconds
+        listener = self.listen(teacher_id, last_id)
+        try:
+            yield f'retry: {self.RECONNECT_MS}\n\n'
+            for item in listener:
+                if item is None:
+                    yield ': keepalive\n\n'
+                else:
+                    yield f"id: {item['id']}\nevent: {item['event']}\ndata: {json.dumps(item['data'], default=str)}\n\n"
+                if time.monotonic() >= deadline:
+                    return
+        finally:
+            listener.close()
+
+# Shared instance (initialized in app factory)
+event_broker = EventBroker()
+
+@event.listens_for(Session, 'after_commit')
+def _publish_committed(session):
+    pending = session.info.pop('pending_events', None)
+    for (teacher_id, name, _), data in (pending or {}).items():
+        event_broker.publish(teacher_id, name, data)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back(session):
+    session.info.pop('pending_events', None)
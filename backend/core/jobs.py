@@ -0,0 +1,469 @@
+"""
+Background Job Queue
+Runs document generation off the request thread on a bounded local worker pool,
+using Redis as the queue when REDIS_URL is set and an in-process queue otherwise.
+Running jobs hold a lease their process renews, so jobs abandoned by a stopped
+worker are requeued
+"""
+
+from datetime import datetime
+import hashlib
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes, highest first
+LANES = ('high', 'normal', 'low')
+
+# Job statuses
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+class InProcessBackend:
+    """Queue and job store held in this process's memory"""
+    
+    def __init__(self, result_ttl):
+        self.result_ttl = result_ttl
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._jobs = {}
+        self._pending = {}
+        self._leases = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def push(self, job_id, lane):
+        self._queue.put((LANES.index(lane), next(self._sequence), job_id, lane))
+    
+    def pop(self, timeout):
+        try:
+            _, _, job_id, _ = self._queue.get(timeout=timeout)
+            return job_id
+        except queue.Empty:
+            return None
+    
+    def save(self, job):
+        with self._lock:
+            self._jobs[job['id']] = (time.time(), dict(job))
+            self._purge()
+    
+    def load(self, job_id):
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            return dict(entry[1]) if entry else None
+    
+    def delete(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+    
+    def claim_pending(self, fingerprint, job_id):
+        """Register a pending job, returning the existing job ID if one is already queued"""
+        with self._lock:
+            existing = self._pending.get(fingerprint)
+            if existing:
+                return existing
+            self._pending[fingerprint] = job_id
+            return None
+    
+    def release_pending(self, fingerprint, job_id):
+        with self._lock:
+            if self._pending.get(fingerprint) == job_id:
+                del self._pending[fingerprint]
+    
+    def lease(self, job_id, expires_at, renew=False):
+        """Hold a running job until expires_at (renew only extends a live lease)"""
+        with self._lock:
+            if not renew or job_id in self._leases:
+                self._leases[job_id] = expires_at
+    
+    def end_lease(self, job_id):
+        """Drop a lease, returning whether this call removed it"""
+        with self._lock:
+            return self._leases.pop(job_id, None) is not None
+    
+    def expired_leases(self, now):
+        with self._lock:
+            return [job_id for job_id, expires_at in self._leases.items() if expires_at <= now]
+    
+    def depths(self):
+        counts = {lane: 0 for lane in LANES}
+        with self._queue.mutex:
+            for _, _, _, lane in self._queue.queue:
+                counts[lane] += 1
+        return counts
+    
+    def incr(self, metric, amount=1):
+        with self._lock:
+            self._metrics[metric] = self._metrics.get(metric, 0) + amount
+    
+    def metrics(self):
+        with self._lock:
+            return dict(self._metrics)
+    
+    def _purge(self):
+        """Drop finished jobs older than the result TTL (caller holds the lock)"""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, (saved_at, job) in self._jobs.items()
+            if saved_at < cutoff and job['status'] in (SUCCEEDED, FAILED)
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+class RedisBackend:
+    """Queue and job store shared between processes through Redis"""
+    
+    PREFIX = 'nsw:jobs'
+    
+    def __init__(self, client, result_ttl):
+        self.client = client
+        self.result_ttl = result_ttl
+    
+    def _key(self, *parts):
+        return ':'.join((self.PREFIX,) + parts)
+    
+    def push(self, job_id, lane):
+        self.client.lpush(self._key('lane', lane), job_id)
+    
+    def pop(self, timeout):
+        # BRPOP checks keys in order, so higher lanes are always drained first
+        item = self.client.brpop([self._key('lane', lane) for lane in LANES], timeout=max(1, int(timeout)))
+        if not item:
+            return None
+        job_id = item[1]
+        return job_id.decode() if isinstance(job_id, bytes) else job_id
+    
+    def save(self, job):
+        self.client.set(self._key('job', job['id']), json.dumps(job), ex=self.result_ttl)
+    
+    def load(self, job_id):
+        raw = self.client.get(self._key('job', job_id))
+        return json.loads(raw) if raw else None
+    
+    def delete(self, job_id):
+        self.client.delete(self._key('job', job_id))
+    
+    def claim_pending(self, fingerprint, job_id):
+        key = self._key('pending', fingerprint)
+        if self.client.set(key, job_id, nx=True, ex=self.result_ttl):
+            return None
+        existing = self.client.get(key)
+        return existing.decode() if isinstance(existing, bytes) else existing
+    
+    def release_pending(self, fingerprint, job_id):
+        key = self._key('pending', fingerprint)
+        existing = self.client.get(key)
+        if existing is not None and (existing.decode() if isinstance(existing, bytes) else existing) == job_id:
+            self.client.delete(key)
+    
+    def lease(self, job_id, expires_at, renew=False):
+        self.client.zadd(self._key('leases'), {job_id: expires_at}, xx=renew)
+    
+    def end_lease(self, job_id):
+        return bool(self.client.zrem(self._key('leases'), job_id))
+    
+    def expired_leases(self, now):
+        return [
+            job_id.decode() if isinstance(job_id, bytes) else job_id
+            for job_id in self.client.zrangebyscore(self._key('leases'), '-inf', now)
+        ]
+    
+    def depths(self):
+        return {lane: self.client.llen(self._key('lane', lane)) for lane in LANES}
+    
+    def incr(self, metric, amount=1):
+        self.client.hincrby(self._key('metrics'), metric, amount)
+    
+    def metrics(self):
+        raw = self.client.hgetall(self._key('metrics'))
+        return {
+            (k.decode() if isinstance(k, bytes) else k): int(v)
+            for k, v in raw.items()
+        }
+
+class JobQueue:
+    """Enqueue named jobs and run them on local worker threads"""
+    
+    DEFAULT_WORKERS = 2
+    DEFAULT_RESULT_TTL = 3600
+    DEFAULT_LEASE_SECONDS = 60
+    DEFAULT_MAX_ATTEMPTS = 3
+    
+    def __init__(self, app=None):
+        self.app = None
+        self.backend = None
+        self.handlers = {}
+        self.finish_listeners = []
+        self.workers = []
+        self.worker_count = self.DEFAULT_WORKERS
+        self.lease_seconds = self.DEFAULT_LEASE_SECONDS
+        self.max_attempts = self.DEFAULT_MAX_ATTEMPTS
+        self._running = 0
+        # IDs of jobs running in this process, whose leases the monitor renews
+        self._leased = set()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Pick a backend from app config"""
+        self.app = app
+        self.worker_count = app.config.get('JOB_WORKERS', self.DEFAULT_WORKERS)
+        result_ttl = app.config.get('JOB_RESULT_TTL', self.DEFAULT_RESULT_TTL)
+        self.lease_seconds = app.config.get('JOB_LEASE_SECONDS', self.DEFAULT_LEASE_SECONDS)
+        self.max_attempts = app.config.get('JOB_MAX_ATTEMPTS', self.DEFAULT_MAX_ATTEMPTS)
+        
+        redis_url = app.config.get('REDIS_URL')
+        self.backend = None
+        if redis_url:
+            try:
+                import redis
+                client = redis.Redis.from_url(redis_url)
+                client.ping()
+                self.backend = RedisBackend(client, result_ttl)
+            except Exception as e:
+                logger.warning('Redis unavailable for job queue (%s), using in-process queue', e)
+        
+        if self.backend is None:
+            self.backend = InProcessBackend(result_ttl)
+        
+        app.extensions['job_queue'] = self
+    
+    def register(self, job_type, handler):
+        """Register the function that runs a job type (called with the payload as kwargs)"""
+        self.handlers[job_type] = handler
+    
+    def on_finished(self, listener):
+        """Register a function called with each job this process finishes (succeeded or failed)"""
+        if listener not in self.finish_listeners:
+            self.finish_listeners.append(listener)
+    
+    @staticmethod
+    def fingerprint(job_type, payload):
+        """Identity of a job for de-duplication"""
+        raw = json.dumps({'type': job_type, 'payload': payload}, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def enqueue(self, job_type, payload, teacher_id=None, lane='normal'):
+        """
+        Queue a job, or return the identical job that is already queued
+        
+        Args:
+            job_type: Registered job type
+            payload: JSON-serializable keyword arguments for the handler
+            teacher_id: Owner of the job
+            lane: Priority lane (high, normal, low)
+        
+        Returns:
+            Job dictionary
+        """
+        if job_type not in self.handlers:
+            raise ValueError(f'Unknown job type: {job_type}')
+        if lane not in LANES:
+            raise ValueError(f'Priority must be one of: {", ".join(LANES)}')
+        
+        # Started first so a deduplicated request still gets abandoned jobs requeued
+        self._ensure_workers()
+        
+        fingerprint = self.fingerprint(job_type, {'teacher_id': teacher_id, **payload})
+        job_id = str(uuid.uuid4())
+        job = {
+            'id': job_id,
+            'type': job_type,
+            'payload': payload,
+            'teacher_id': teacher_id,
+            'lane': lane,
+            'fingerprint': fingerprint,
+            'status': QUEUED,
+            'attempts': 0,
+            'result': None,
+            'error': None,
+            'created_at': datetime.utcnow().isoformat(),
+            'started_at': None,
+            'finished_at': None
+        }
+        # Saved before it is claimed, so a concurrent enqueue that finds the
+        # claim can always load the job it points at
+        self.backend.save(job)
+        
+        existing_id = self.backend.claim_pending(fingerprint, job_id)
+        if existing_id:
+            existing = self.backend.load(existing_id)
+            if existing and existing['status'] == QUEUED:
+                return self._deduplicated(job_id, existing)
+            # Stale claim (its job expired) - take it over, unless another
+            # enqueue gets there first
+            self.backend.release_pending(fingerprint, existing_id)
+            winner_id = self.backend.claim_pending(fingerprint, job_id)
+            winner = self.backend.load(winner_id) if winner_id else None
+            if winner:
+                return self._deduplicated(job_id, winner)
+        
+        self.backend.push(job_id, lane)
+        self.backend.incr('enqueued')
+        return job
+    
+    def _deduplicated(self, job_id, existing):
+        """Drop an unqueued job in favour of the identical pending one"""
+        self.backend.delete(job_id)
+        self.backend.incr('deduplicated')
+        return existing
+    
+    def get(self, job_id):
+        """Get a job by ID"""
+        return self.backend.load(job_id)
+    
+    def metrics(self):
+        """Queue depth per lane plus lifetime counters"""
+        with self._lock:
+            running = self._running
+        return {
+            'backend': 'redis' if isinstance(self.backend, RedisBackend) else 'in_process',
+            'workers': len(self.workers),
+            'running_local': running,
+            'queue_depth': self.backend.depths(),
+            'counters': self.backend.metrics()
+        }
+    
+    def run_next(self, timeout=1):
+        """
+        Run the next queued job on the calling thread
+        
+        The job is leased while it runs: if this process stops before it
+        finishes, requeue_stale in another process picks it up again.
+        
+        Returns:
+            The finished job, or None if the queue was empty
+        """
+        job_id = self.backend.pop(timeout)
+        if not job_id:
+            return None
+        self.backend.lease(job_id, time.time() + self.lease_seconds)
+        
+        job = self.backend.load(job_id)
+        if not job:
+            self.backend.end_lease(job_id)
+            return None
+        
+        self.backend.release_pending(job['fingerprint'], job_id)
+        job['status'] = RUNNING
+        job['attempts'] = job.get('attempts', 0) + 1
+        job['started_at'] = datetime.utcnow().isoformat()
+        self.backend.save(job)
+        
+        with self._lock:
+            self._running += 1
+            self._leased.add(job_id)
+        try:
+            with self.app.app_context():
+                job['result'] = self.handlers[job['type']](**job['payload'])
+            job['status'] = SUCCEEDED
+            self.backend.incr('succeeded')
+        except Exception as e:
+            logger.exception('Job %s (%s) failed', job_id, job['type'])
+            job['status'] = FAILED
+            job['error'] = str(e)
+            self.backend.incr('failed')
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._leased.discard(job_id)
+        
+        job['finished_at'] = datetime.utcnow().isoformat()
+        self.backend.save(job)
+        self.backend.end_lease(job_id)
+        
+        self._notify_finished(job)
+        return job
+    
+    def requeue_stale(self):
+        """
+        Requeue jobs whose worker stopped without finishing them
+        
+        Running jobs' leases are renewed while their process is alive. Once a
+        lease expires the job is queued again, or failed after max_attempts
+        runs (so a job that kills its worker can't loop forever).
+        
+        Returns:
+            Number of jobs requeued or failed
+        """
+        count = 0
+        for job_id in self.backend.expired_leases(time.time()):
+            # Only the process that removes the lease handles the job
+            if not self.backend.end_lease(job_id):
+                continue
+            job = self.backend.load(job_id)
+            if not job or job['status'] not in (QUEUED, RUNNING):
+                continue
+            
+            if job.get('attempts', 0) >= self.max_attempts:
+                logger.warning('Job %s (%s) abandoned %d times, failing it', job_id, job['type'], job['attempts'])
+                job['status'] = FAILED
+                job['error'] = 'Worker stopped while running the job'
+                job['finished_at'] = datetime.utcnow().isoformat()
+                self.backend.save(job)
+                self.backend.incr('failed')
+                self._notify_finished(job)
+            else:
+                logger.warning('Requeuing job %s (%s) abandoned by its worker', job_id, job['type'])
+                job['status'] = QUEUED
+                job['started_at'] = None
+                self.backend.save(job)
+                self.backend.claim_pending(job['fingerprint'], job_id)
+                self.backend.push(job_id, job['lane'])
+                self.backend.incr('requeued')
+            count += 1
+        return count
+    
+    def _notify_finished(self, job):
+        """Call the finish listeners, isolating their failures"""
+        for listener in self.finish_listeners:
+            try:
+                listener(job)
+            except Exception:
+                logger.exception('Job finish listener failed for %s', job['id'])
+    
+    def _ensure_workers(self):
+        """Start the local worker pool and lease monitor on first use"""
+        with self._lock:
+            if self.workers or not self.worker_count:
+                return
+            for i in range(self.worker_count):
+                worker = threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+                worker.start()
+                self.workers.append(worker)
+            threading.Thread(target=self._monitor, name='job-lease-monitor', daemon=True).start()
+    
+    def _work(self):
+        """Worker loop"""
+        while True:
+            try:
+                self.run_next(timeout=1)
+            except Exception:
+                logger.exception('Job worker error')
+                time.sleep(1)
+    
+    def _monitor(self):
+        """Renew this process's leases and requeue jobs abandoned elsewhere (starting now)"""
+        while True:
+            try:
+                with self._lock:
+                    leased = list(self._leased)
+                expires_at = time.time() + self.lease_seconds
+                for job_id in leased:
+                    self.backend.lease(job_id, expires_at, renew=True)
+                self.requeue_stale()
+            except Exception:
+                logger.exception('Job lease monitor error')
+            time.sleep(self.lease_seconds / 3)
+
+# Shared instance (initialized in app factory)
+job_queue = JobQueue()
@@ -0,0 +1,334 @@
+"""
+Versioned schema migrations
+Migrations live in backend/migrations as NNNN_name.py modules with an
+upgrade(ctx) function. Applied versions are recorded in schema_migrations so
+each one runs once per database, and workers never reflect the schema at
+startup - run `flask db upgrade` once per deploy instead.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+from backend.core.database import db
+import click
+import importlib
+import logging
+import pkgutil
+import re
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = 'backend.migrations'
+
+# Kept out of db.metadata so create_all/drop_all never touch it
+_version_metadata = MetaData()
+schema_versions = Table(
+    'schema_migrations', _version_metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+# Serializes concurrent `db upgrade` runs on Postgres (arbitrary constant)
+_ADVISORY_LOCK_ID = 720150
+
+_MODULE_NAME = re.compile(r'^(\d{4})_(\w+)$')
+
+class MigrationError(Exception):
+    """Raised when migrations cannot be discovered or applied"""
+
+class Migration:
+    """One migration module"""
+    __slots__ = ('version', 'name', 'description', 'upgrade', 'transactional')
+    
+    def __init__(self, version, name, description, upgrade, transactional=True):
+        self.version = version
+        self.name = name
+        self.description = description
+        self.upgrade = upgrade
+        # False for migrations that build indexes on populated Postgres tables,
+        # which must run outside a transaction to use CREATE INDEX CONCURRENTLY
+        self.transactional = transactional
+
+class MigrationContext:
+    """
+    Schema operations available to a migration's upgrade(ctx)
+    
+    Every operation is idempotent, so a migration can adopt a database
+    whose schema was created before migrations existed.
+    """
+    
+    def __init__(self, connection, concurrent=False):
+        self.connection = connection
+        self.dialect = connection.dialect.name
+        # Build and drop indexes without blocking writes (Postgres, autocommit only)
+        self.concurrent = concurrent and self.dialect == 'postgresql'
+    
+    def execute(self, statement, parameters=None):
+        """Run raw SQL"""
+        return self.connection.execute(text(statement), parameters or {})
+    
+    def has_table(self, table):
+        return inspect(self.connection).has_table(table)
+    
+    def has_column(self, table, column):
+        return column in {c['name'] for c in inspect(self.connection).get_columns(table)}
+    
+    def create_table(self, table, *columns):
+        """Create a table if it does not exist yet"""
+        Table(table, MetaData(), *columns).create(self.connection, checkfirst=True)
+    
+    def add_column(self, table, column):
+        """Add a column to an existing table if it is missing"""
+        if self.has_column(table, column.name):
+            return
+        Table(table, MetaData(), column)
+        ddl = CreateColumn(column).compile(dialect=self.connection.dialect)
+        self.execute(f'ALTER TABLE {table} ADD COLUMN {ddl}')
+    
+    def convert_to_json(self, table, column):
+        """
+        Store a JSON-text column as JSONB on Postgres (no-op elsewhere)
+        
+        Values that are not JSON documents (legacy plain text) are kept as
+        JSON strings rather than failing the cast.
+        """
+        if self.dialect != 'postgresql':
+            return
+        current = {c['name']: c['type'] for c in inspect(self.connection).get_columns(table)}[column]
+        if type(current).__name__ == 'JSONB':
+            return
+        self.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING "
+            f"CASE WHEN {column} IS NULL THEN NULL "
+            f"WHEN left(ltrim({column}), 1) IN ('[', '{{', '\"') THEN {column}::jsonb "
+            f"ELSE to_jsonb({column}) END"
+        )
+    
+    def create_index(self, name, table, columns, where=None, unique=False, using=None, dialects=None):
+        """
+        Create an index if it does not exist yet
+        
+        Args:
+            name: Index name (match the model's db.Index name)
+            table: Table name
+            columns: Column names (optionally with an operator class), in index order
+            where: Partial index predicate, or {dialect: predicate}
+            unique: Create a unique index
+            using: Index method, e.g. 'gin'
+            dialects: Only create the index on these dialects
+        """
+        if dialects and self.dialect not in dialects:
+            return
+        if isinstance(where, dict):
+            where = where.get(self.dialect)
+        # A failed CREATE INDEX CONCURRENTLY leaves an invalid index behind,
+        # which IF NOT EXISTS would keep: rebuild it instead
+        if self.index_is_valid(name) is False:
+            self.drop_index(name)
+        ddl = 'CREATE {}INDEX {}IF NOT EXISTS {} ON {} {}({})'.format(
+            'UNIQUE ' if unique else '', 'CONCURRENTLY ' if self.concurrent else '',
+            name, table, f'USING {using} ' if using else '', ', '.join(columns)
+        )
+        if where:
+            ddl += f' WHERE {where}'
+        self.execute(ddl)
+    
+    def index_is_valid(self, name):
+        """
+        Whether an index is usable (Postgres only)
+        
+        Returns:
+            True or False if the index exists on Postgres, otherwise None
+        """
+        if self.dialect != 'postgresql':
+            return None
+        return self.execute(
+            'SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+            'WHERE c.relname = :name AND pg_table_is_visible(c.oid)',
+            {'name': name}
+        ).scalar()
+    
+    def drop_index(self, name):
+        """Drop an index if it exists"""
+        self.execute(f"DROP INDEX {'CONCURRENTLY ' if self.concurrent else ''}IF EXISTS {name}")
+
+class SchemaMigrations:
+    """Discover, apply and report schema migrations"""
+    
+    def __init__(self, app=None):
+        self.auto_upgrade = False
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Register the `flask db` commands"""
+        self.auto_upgrade = app.config.get('DB_AUTO_MIGRATE', False)
+        app.cli.add_command(db_cli)
+        app.extensions['schema_migrations'] = self
+    
+    @staticmethod
+    def discover():
+        """All migrations in version order"""
+        package = importlib.import_module(MIGRATIONS_PACKAGE)
+        migrations = []
+        for module_info in pkgutil.iter_modules(package.__path__):
+            match = _MODULE_NAME.match(module_info.name)
+            if not match:
+                continue
+            module = importlib.import_module(f'{MIGRATIONS_PACKAGE}.{module_info.name}')
+            description = (module.__doc__ or match.group(2)).strip().splitlines()[0]
+            migrations.append(Migration(
+                int(match.group(1)), match.group(2), description, module.upgrade,
+                getattr(module, 'transactional', True)
+            ))
+        
+        migrations.sort(key=lambda migration: migration.version)
+        versions = [migration.version for migration in migrations]
+        if len(versions) != len(set(versions)):
+            raise MigrationError('Duplicate migration version numbers')
+        return migrations
+    
+    @staticmethod
+    def applied(connection=None):
+        """{version: applied_at} for migrations already run"""
+        if connection is None:
+            with db.engine.connect() as connection:
+                return SchemaMigrations.applied(connection)
+        if not inspect(connection).has_table(schema_versions.name):
+            return {}
+        rows = connection.execute(select(schema_versions.c.version, schema_versions.c.applied_at))
+        return {row.version: row.applied_at for row in rows}
+    
+    def pending(self):
+        """Migrations not yet applied to the database"""
+        applied = self.applied()
+        return [migration for migration in self.discover() if migration.version not in applied]
+    
+    def status(self):
+        """
+        Every known migration and whether it has been applied
+        
+        Returns:
+            List of dicts with version, name, description and applied_at
+        """
+        applied = self.applied()
+        return [
+            {
+                'version': migration.version,
+                'name': migration.name,
+                'description': migration.description,
+                'applied_at': applied.get(migration.version)
+            }
+            for migration in self.discover()
+        ]
+    
+    def upgrade(self, target=None):
+        """
+        Apply pending migrations, each in its own transaction
+        
+        Args:
+            target: Highest version to apply (default: all)
+        
+        Returns:
+            List of versions applied by this call
+        """
+        applied_now = []
+        for migration in self.discover():
+            if target is not None and migration.version > target:
+                break
+            if self._apply(migration, run=True):
+                applied_now.append(migration.version)
+        return applied_now
+    
+    def stamp(self, target):
+        """Record migrations up to target as applied without running them"""
+        stamped = []
+        for migration in self.discover():
+            if migration.version > target:
+                break
+            if self._apply(migration, run=False):
+                stamped.append(migration.version)
+        return stamped
+    
+    @staticmethod
+    def _apply(migration, run):
+        """Run (or just record) one migration unless another process already has"""
+        if not migration.transactional and db.engine.dialect.name == 'postgresql':
+            return SchemaMigrations._apply_autocommit(migration, run)
+        
+        with db.engine.begin() as connection:
+            if connection.dialect.name == 'postgresql':
+                connection.execute(text('SELECT pg_advisory_xact_lock(:id)'), {'id': _ADVISORY_LOCK_ID})
+            return SchemaMigrations._run(connection, migration, run, concurrent=False)
+    
+    @staticmethod
+    def _apply_autocommit(migration, run):
+        """
+        Run a non-transactional migration under a session-level advisory lock
+        
+        It is only recorded as applied once every operation succeeds, so if
+        it fails part way the next upgrade runs it again: existing indexes
+        are kept, and any left invalid by a failed concurrent build are
+        dropped and rebuilt.
+        """
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.execute(text('SELECT pg_advisory_lock(:id)'), {'id': _ADVISORY_LOCK_ID})
+            try:
+                return SchemaMigrations._run(connection, migration, run, concurrent=True)
+            finally:
+                connection.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': _ADVISORY_LOCK_ID})
+    
+    @staticmethod
+    def _run(connection, migration, run, concurrent):
+        schema_versions.create(connection, checkfirst=True)
+        if migration.version in SchemaMigrations.applied(connection):
+            return False
+        
+        if run:
+            logger.info('Applying migration %04d_%s', migration.version, migration.name)
+            migration.upgrade(MigrationContext(connection, concurrent=concurrent))
+        connection.execute(schema_versions.insert().values(
+            version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+        ))
+        return True
+
+# Shared instance (initialized in app factory)
+schema_migrations = SchemaMigrations()
+
+@click.group('db')
+def db_cli():
+    """Database schema migrations"""
+
+@db_cli.command('upgrade')
+@click.option('--to', 'target', type=int, help='Stop after this version')
+def upgrade_command(target):
+    """Apply pending migrations"""
+    applied = schema_migrations.upgrade(target)
+    if applied:
+        click.echo(f"Applied {', '.join(f'{version:04d}' for version in applied)}")
+    else:
+        click.echo('Database is up to date')
+
+@db_cli.command('status')
+def status_command():
+    """List migrations and when they were applied"""
+    for entry in schema_migrations.status():
+        applied_at = entry['applied_at'].isoformat() if entry['applied_at'] else 'pending'
+        click.echo(f"{entry['version']:04d}  {applied_at:<26}  {entry['description']}")
+
+@db_cli.command('check')
+def check_command():
+    """Exit non-zero if migrations are pending (for deploy/readiness checks)"""
+    pending = schema_migrations.pending()
+    if pending:
+        click.echo(f"{len(pending)} pending: {', '.join(f'{m.version:04d}_{m.name}' for m in pending)}")
+        raise SystemExit(1)
+    click.echo('Database is up to date')
+
+@db_cli.command('stamp')
+@click.argument('target', type=int)
+def stamp_command(target):
+    """Mark migrations up to TARGET as applied without running them"""
+    stamped = schema_migrations.stamp(target)
+    click.echo(f"Stamped {', '.join(f'{version:04d}' for version in stamped) or 'nothing'}")
@@ -0,0 +1,171 @@
+"""
+Per-request SQL instrumentation
+Counts statements, total DB time and repeated statement shapes (likely N+1
+patterns) for each request using SQLAlchemy engine events
+"""
+
+from collections import Counter
+from flask import g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import functools
+import hashlib
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Collapse whitespace and expanded IN lists so one statement shape has one fingerprint
+_WHITESPACE = re.compile(r'\s+')
+_PARAM_LIST = re.compile(r'\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))*\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a request issues more statements than its budget"""
+
+class QueryStats:
+    """Statement counters for one request"""
+    __slots__ = ('count', 'duration', 'fingerprints', 'statements')
+    
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.statements = {}
+    
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        fingerprint = QueryProfiler.fingerprint(statement)
+        self.fingerprints[fingerprint] += 1
+        self.statements.setdefault(fingerprint, statement)
+    
+    def repeated(self, threshold):
+        """Statement shapes run at least threshold times, most frequent first"""
+        return [
+            (fingerprint, count) for fingerprint, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+def current_stats():
+    """Query stats for the current request, or None outside an app context"""
+    if not has_app_context():
+        return None
+    if 'query_stats' not in g:
+        g.query_stats = QueryStats()
+    return g.query_stats
+
+def query_count():
+    """Number of SQL statements executed in the current request"""
+    stats = g.get('query_stats') if has_app_context() else None
+    return stats.count if stats else 0
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own context: a statement that raises never
+    # reaches after_cursor_execute, and leaves nothing behind on the connection
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_stats()
+    if stats is None:
+        return
+    
+    started = getattr(context, '_query_start', None)
+    stats.record(statement, time.perf_counter() - started if started is not None else 0.0)
+    
+    budget = g.get('query_budget')
+    if budget is not None and stats.count > budget:
+        g.query_budget = None  # Raise once per request
+        raise QueryBudgetExceeded(
+            f'{request.endpoint if has_request_context() else "request"} exceeded its query budget '
+            f'of {budget} statements'
+        )
+
+class QueryProfiler:
+    """Report per-request query stats as headers (development) or log fields (production)"""
+    
+    DEFAULT_REPEAT_THRESHOLD = 5
+    
+    def __init__(self, app=None):
+        self.headers = False
+        self.log = False
+        self.strict = False
+        self.budget = None
+        self.budgets = {}
+        self.repeat_threshold = self.DEFAULT_REPEAT_THRESHOLD
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Read settings from app config and hook request start and finish"""
+        self.headers = app.config.get('QUERY_STATS_HEADERS', app.debug)
+        self.log = app.config.get('QUERY_STATS_LOG', not app.debug)
+        self.strict = app.config.get('QUERY_BUDGET_STRICT', False)
+        self.budget = app.config.get('QUERY_BUDGET')
+        self.budgets = app.config.get('QUERY_BUDGETS', {})
+        self.repeat_threshold = app.config.get('QUERY_REPEAT_THRESHOLD', self.DEFAULT_REPEAT_THRESHOLD)
+        
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.extensions['query_profiler'] = self
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def fingerprint(statement):
+        """Short hash identifying a statement's shape, ignoring parameter values"""
+        normalized = _WHITESPACE.sub(' ', statement).strip()
+        normalized = _PARAM_LIST.sub('(?)', normalized)
+        normalized = _NUMBER.sub('N', normalized)
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:12]
+    
+    def budget_for(self, endpoint):
+        """Statement budget for an endpoint (QUERY_BUDGETS entry, else QUERY_BUDGET)"""
+        return self.budgets.get(endpoint, self.budget)
+    
+    def _start(self):
+        g.query_stats = QueryStats()
+        if self.strict:
+            g.query_budget = self.budget_for(request.endpoint)
+    
+    def _finish(self, response):
+        stats = g.get('query_stats')
+        if stats is None:
+            return response
+        
+        repeated = stats.repeated(self.repeat_threshold)
+        duration_ms = round(stats.duration * 1000, 2)
+        
+        if self.headers:
+            response.headers['X-Query-Count'] = str(stats.count)
+            response.headers['X-Query-Time-Ms'] = str(duration_ms)
+            if repeated:
+                response.headers['X-Query-Repeated'] = ', '.join(
+                    f'{fingerprint}x{count}' for fingerprint, count in repeated
+                )
+        
+        if self.log:
+            logger.info(
+                'query stats %s %s: %d statements in %.2fms',
+                request.method, request.path, stats.count, duration_ms,
+                extra={
+                    'endpoint': request.endpoint,
+                    'query_count': stats.count,
+                    'query_time_ms': duration_ms,
+                    'query_repeated': dict(repeated)
+                }
+            )
+        
+        for fingerprint, count in repeated:
+            logger.warning(
+                'Possible N+1 in %s: statement %s ran %d times: %s',
+                request.endpoint, fingerprint, count, stats.statements[fingerprint][:200]
+            )
+        
+        return response
+
+# Shared instance (initialized in app factory)
+query_profiler = QueryProfiler()
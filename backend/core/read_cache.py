@@ -0,0 +1,233 @@
+"""
+Read-through cache for hot GET endpoints
+Caches JSON response bodies per teacher and query string in Redis (or an
+in-process LRU when Redis is unavailable), keyed on the change versions of
+their tags, which the service layer's writes bump in the same transaction
+"""
+
+from collections import OrderedDict
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from backend.core.database import db
+from backend.models.change_version import ChangeVersion
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class LocalBackend:
+    """Size-bounded LRU with per-entry expiry, held in this process"""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def incr(self, metric, amount=1):
+        with self._lock:
+            self._metrics[metric] = self._metrics.get(metric, 0) + amount
+    
+    def metrics(self):
+        with self._lock:
+            return dict(self._metrics)
+    
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+class RedisBackend:
+    """Cache shared between processes through Redis"""
+    
+    PREFIX = 'nsw:cache'
+    
+    def __init__(self, client):
+        self.client = client
+    
+    def _key(self, *parts):
+        return ':'.join((self.PREFIX,) + parts)
+    
+    def get(self, key):
+        return self.client.get(self._key('entry', key))
+    
+    def set(self, key, value, ttl):
+        self.client.set(self._key('entry', key), value, ex=ttl)
+    
+    def incr(self, metric, amount=1):
+        self.client.hincrby(self._key('metrics'), metric, amount)
+    
+    def metrics(self):
+        raw = self.client.hgetall(self._key('metrics'))
+        return {
+            (k.decode() if isinstance(k, bytes) else k): int(v)
+            for k, v in raw.items()
+        }
+    
+    def size(self):
+        return None
+
+class ReadCache:
+    """Cache GET responses keyed by teacher and query parameters"""
+    
+    DEFAULT_TTL = 60
+    DEFAULT_MAX_ENTRIES = 1024
+    
+    def __init__(self, app=None):
+        self.backend = LocalBackend(self.DEFAULT_MAX_ENTRIES)
+        self.enabled = True
+        self.default_ttl = self.DEFAULT_TTL
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Pick a backend from app config"""
+        self.enabled = app.config.get('READ_CACHE_ENABLED', True)
+        self.default_ttl = app.config.get('READ_CACHE_TTL', self.DEFAULT_TTL)
+        max_entries = app.config.get('READ_CACHE_MAX_ENTRIES', self.DEFAULT_MAX_ENTRIES)
+        
+        redis_url = app.config.get('REDIS_URL')
+        self.backend = None
+        if redis_url:
+            try:
+                import redis
+                client = redis.Redis.from_url(redis_url)
+                client.ping()
+                self.backend = RedisBackend(client)
+            except Exception as e:
+                logger.warning('Redis unavailable for read cache (%s), using in-process LRU', e)
+        
+        if self.backend is None:
+            self.backend = LocalBackend(max_entries)
+        
+        app.extensions['read_cache'] = self
+    
+    @staticmethod
+    def tag(kind, value):
+        """Name of an invalidation tag, e.g. tag('lessons', teacher_id)"""
+        return f'{kind}:{value}'
+    
+    def cached(self, tags, ttl=None):
+        """
+        Cache a JWT-protected GET view's 200 responses
+        
+        Apply below @jwt_required(). The key covers the teacher, the path,
+        the query string and the committed change version of every tag (as
+        the collection ETag does), so a write makes all entries built under
+        the old versions unreachable at the moment it commits.
+        
+        Args:
+            tags: Callable taking (teacher_id, **view_kwargs) and returning tag names
+            ttl: Seconds to keep entries (default READ_CACHE_TTL)
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return view(*args, **kwargs)
+                
+                teacher_id = get_jwt_identity()
+                try:
+                    key = self._key(teacher_id, tags(teacher_id, **kwargs))
+                    raw = self.backend.get(key)
+                except Exception as e:
+                    logger.warning('Read cache lookup failed: %s', e)
+                    return view(*args, **kwargs)
+                
+                if raw is not None:
+                    self.backend.incr('hits')
+                    response = current_app.response_class(raw, mimetype='application/json')
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+                
+                self.backend.incr('misses')
+                result = view(*args, **kwargs)
+                if isinstance(result, tuple) and len(result) == 2 and result[1] == 200 and isinstance(result[0], dict):
+                    try:
+                        self.backend.set(key, current_app.json.dumps(result[0]), ttl or self.default_ttl)
+                    except Exception as e:
+                        logger.warning('Read cache store failed: %s', e)
+                return result
+            return wrapper
+        return decorator
+    
+    def _key(self, teacher_id, tags):
+        """Cache key for the current request"""
+        tags = sorted(tags)
+        versions = ChangeVersion.lookup(tags)
+        raw = json.dumps({
+            'teacher_id': teacher_id,
+            'path': request.path,
+            'args': sorted(request.args.items(multi=True)),
+            'tags': [(tag, versions[tag].version if tag in versions else 0) for tag in tags]
+        })
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def invalidate_on_commit(self, *tags):
+        """
+        Invalidate tags when the current database transaction commits
+        
+        The tags' change versions are bumped inside the transaction (see
+        core.conditional), so cached entries and ETags go stale together.
+        """
+        db.session.info.setdefault('read_cache_tags', set()).update(tags)
+    
+    @staticmethod
+    def pending_tags(session):
+        """Tags the session will invalidate when its transaction commits"""
+        return session.info.get('read_cache_tags', set())
+    
+    def metrics(self):
+        """Hit ratio and counters"""
+        counters = self.backend.metrics()
+        hits = counters.get('hits', 0)
+        misses = counters.get('misses', 0)
+        lookups = hits + misses
+        return {
+            'backend': 'redis' if isinstance(self.backend, RedisBackend) else 'local',
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / lookups if lookups else 0.0,
+            'invalidations': counters.get('invalidations', 0),
+            'entries': self.backend.size()
+        }
+
+# Shared instance (initialized in app factory)
+read_cache = ReadCache()
+
+@event.listens_for(Session, 'after_commit')
+def _count_invalidations(session):
+    tags = session.info.pop('read_cache_tags', None)
+    if tags:
+        try:
+            read_cache.backend.incr('invalidations', len(tags))
+        except Exception as e:
+            logger.warning('Read cache metrics update failed: %s', e)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back(session):
+    session.info.pop('read_cache_tags', None)
@@ -0,0 +1,99 @@
+"""
+Full-text search index over evidence observation text and notes
+Postgres keeps a weighted tsvector in a generated column with a GIN index;
+SQLite keeps an FTS5 external-content table synced by triggers. Both rank
+observation text above notes.
+"""
+
+from sqlalchemy import Float, cast, column, func, literal_column, table, type_coerce
+import re
+
+# Postgres text search configuration (stemming and stop words)
+SEARCH_CONFIG = 'english'
+
+FTS_TABLE = 'evidence_fts'
+
+# Quoted phrases or bare words in a search string
+_TERMS = re.compile(r'"([^"]+)"|(\S+)')
+
+def install(ctx):
+    """
+    Create the search index for ctx's dialect (idempotent)
+    
+    On SQLite the FTS index is rebuilt from the evidence table, which
+    backfills existing rows; run it again after VACUUM, which may renumber
+    the rowids the index refers to.
+    
+    Args:
+        ctx: MigrationContext
+    """
+    if ctx.dialect == 'postgresql':
+        ctx.execute(
+            "ALTER TABLE evidence ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(observation_text, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(notes, '')), 'B')) STORED"
+        )
+        ctx.create_index('ix_evidence_search_vector', 'evidence', ['search_vector'], using='gin')
+        return
+    
+    ctx.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "observation_text, notes, content='evidence', content_rowid='rowid', tokenize='porter unicode61')"
+    )
+    # External-content tables are kept in sync by the owning table's triggers
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, observation_text, notes) "
+        "VALUES ('delete', old.rowid, old.observation_text, old.notes);"
+    )
+    insert_new = (
+        f"INSERT INTO {FTS_TABLE}(rowid, observation_text, notes) "
+        "VALUES (new.rowid, new.observation_text, new.notes);"
+    )
+    ctx.execute(f"CREATE TRIGGER IF NOT EXISTS evidence_fts_insert AFTER INSERT ON evidence BEGIN {insert_new} END")
+    ctx.execute(f"CREATE TRIGGER IF NOT EXISTS evidence_fts_delete AFTER DELETE ON evidence BEGIN {delete_old} END")
+    ctx.execute(
+        "CREATE TRIGGER IF NOT EXISTS evidence_fts_update AFTER UPDATE OF observation_text, notes ON evidence "
+        f"BEGIN {delete_old} {insert_new} END"
+    )
+    ctx.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+def uninstall(ctx):
+    """Drop the SQLite FTS table (its triggers go with the evidence table)"""
+    if ctx.dialect != 'postgresql':
+        ctx.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+def fts5_query(search):
+    """
+    Quote every word and phrase of a search string for FTS5 MATCH
+    
+    Terms are ANDed, and operators or punctuation in user input are
+    searched for literally instead of being parsed as FTS5 syntax.
+    """
+    terms = [phrase or word for phrase, word in _TERMS.findall(search)]
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+def match(search, dialect):
+    """
+    Condition and relevance for a search string
+    
+    Args:
+        search: Search text (words and "quoted phrases", all required)
+        dialect: Dialect of the bind
+    
+    Returns:
+        Tuple of (condition, rank, join) - join is (table, onclause) to add
+        to the query, or None; higher ranks are better matches
+    """
+    if dialect.name == 'postgresql':
+        vector = literal_column('evidence.search_vector')
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, search)
+        # ts_rank_cd is float4: cast it so cursor values (Python floats,
+        # bound as float8) compare equal to the ranks they were read from
+        rank = cast(func.ts_rank_cd(vector, query), Float(53))
+        return vector.op('@@')(query), rank, None
+    
+    fts = table(FTS_TABLE, column('rowid'))
+    name = literal_column(FTS_TABLE)
+    join = (fts, fts.c.rowid == literal_column('evidence.rowid'))
+    # bm25 is lower-is-better; observation text counts double
+    return name.op('MATCH')(fts5_query(search)), type_coerce(-func.bm25(name, 2.0, 1.0), Float), join
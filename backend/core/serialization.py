@@ -0,0 +1,145 @@
+"""
+Compiled model serializers and a fast JSON provider
+Column accessors and converters are worked out once per model class instead
+of reflecting over the table on every to_dict call
+"""
+
+from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import DateTime, inspect, select
+import json
+import operator
+import threading
+
+try:
+    import orjson
+except ImportError:  # Optional - falls back to the standard library
+    orjson = None
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+class ModelSerializer:
+    """Precomputed column names, accessors and converters for one model class"""
+    __slots__ = ('model_class', 'names', 'converters', '_getter', '_state_getter')
+    
+    def __init__(self, model_class):
+        mapper = inspect(model_class)
+        columns = tuple(model_class.__table__.columns)
+        
+        self.model_class = model_class
+        self.names = tuple(column.name for column in columns)
+        # Only columns that need converting are visited per row
+        self.converters = tuple(
+            (column.name, _isoformat) for column in columns
+            if isinstance(column.type, DateTime)
+        )
+        keys = [mapper.get_property_by_column(column).key for column in columns]
+        self._getter = operator.attrgetter(*keys)
+        # Loaded column values live in the instance __dict__; reading them
+        # there skips the instrumented attribute descriptors
+        self._state_getter = operator.itemgetter(*keys)
+    
+    def select(self):
+        """Core SELECT of every column in serializer order (for serialize_many)"""
+        return select(*self.model_class.__table__.columns)
+    
+    def values(self, obj):
+        """Column values of an ORM instance, in serializer order"""
+        try:
+            return self._state_getter(obj.__dict__)
+        except KeyError:
+            # Expired or deferred - let the ORM load it
+            return self._getter(obj)
+    
+    def serialize(self, obj):
+        """Serialize one ORM instance (datetimes as ISO 8601 strings, like to_dict always has)"""
+        return self._convert(dict(zip(self.names, self.values(obj))))
+    
+    def serialize_mapping(self, mapping):
+        """Serialize column values held in a {column name: value} mapping"""
+        return self._convert({name: mapping[name] for name in self.names})
+    
+    def _convert(self, result):
+        for name, convert in self.converters:
+            value = result[name]
+            if value is not None:
+                result[name] = convert(value)
+        return result
+    
+    def serialize_many(self, rows):
+        """
+        Serialize ORM instances or Core rows for a JSON response
+        
+        Datetimes are left as datetime objects for FastJSONProvider to
+        encode, which produces the same ISO 8601 strings as to_dict without
+        a Python-level conversion per value.
+        
+        Args:
+            rows: Iterable of model instances, or of rows from select()
+        
+        Returns:
+            List of dictionaries
+        """
+        model_class = self.model_class
+        names = self.names
+        values = self.values
+        return [
+            dict(zip(names, values(row) if isinstance(row, model_class) else row))
+            for row in rows
+        ]
+
+_serializers = {}
+_serializers_lock = threading.Lock()
+
+def serializer_for(model_class):
+    """Get (compiling on first use) the serializer for a model class"""
+    serializer = _serializers.get(model_class)
+    if serializer is None:
+        with _serializers_lock:
+            serializer = _serializers.get(model_class)
+            if serializer is None:
+                serializer = ModelSerializer(model_class)
+                _serializers[model_class] = serializer
+    return serializer
+
+def serialize_many(rows, model_class):
+    """Serialize ORM instances or Core rows of a model class"""
+    return serializer_for(model_class).serialize_many(rows)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider using orjson when installed
+    
+    Keys are not sorted and output is always compact. Datetimes are written
+    as ISO 8601 (matching to_dict) rather than Flask's HTTP date format, and
+    other types go through Flask's default hook.
+    """
+    sort_keys = False
+    compact = True
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
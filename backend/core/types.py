@@ -0,0 +1,86 @@
+"""
+Column types and SQL helpers for JSON documents
+Success criteria lists and status maps are stored as JSONB on Postgres and
+as JSON text on SQLite, and always read back as Python lists and dicts
+"""
+
+from sqlalchemy import Text, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+import json
+
+def json_value(value, default):
+    """
+    Decode a JSON document attribute
+    
+    Attributes hold decoded values once loaded, but may still hold JSON
+    text assigned by older callers before the next flush.
+    """
+    if value is None:
+        return default
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+class JSONDocument(TypeDecorator):
+    """
+    JSONB on Postgres, JSON text elsewhere
+    
+    JSON text is accepted on write for compatibility with callers that
+    encode the value themselves; plain (non-JSON) legacy text is kept as a
+    string.
+    """
+    impl = Text
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(Text())
+    
+    def process_bind_param(self, value, dialect):
+        value = json_value(value, None)
+        if value is None or dialect.name == 'postgresql':
+            return value
+        return json.dumps(value)
+    
+    def process_result_value(self, value, dialect):
+        if dialect.name == 'postgresql':
+            return value
+        return json_value(value, None)
+
+def json_object_members(column, dialect):
+    """
+    Table-valued function yielding a (key, value) text row per member of a
+    JSON object column; join it laterally to aggregate over the members in SQL
+    """
+    if dialect.name == 'postgresql':
+        return func.jsonb_each_text(type_coerce(column, JSONB)).table_valued('key', 'value').lateral()
+    return func.json_each(column).table_valued('key', 'value')
+
+def json_array_elements(column, dialect):
+    """Table-valued function yielding the text value of each element of a JSON array column"""
+    if dialect.name == 'postgresql':
+        return func.jsonb_array_elements_text(type_coerce(column, JSONB)).table_valued('value').lateral()
+    return func.json_each(column).table_valued('value')
+
+def json_member_equals(column, key, value, dialect):
+    """
+    Condition that a JSON object column has key == value
+    
+    On Postgres this is a containment test, which the column's GIN index
+    (jsonb_path_ops) can answer.
+    """
+    if dialect.name == 'postgresql':
+        return type_coerce(column, JSONB).contains({key: value})
+    return func.json_extract(column, f'$."{key}"') == value
+
+def json_array_contains(column, element, dialect):
+    """Condition that a JSON array column contains element (GIN-indexed on Postgres)"""
+    if dialect.name == 'postgresql':
+        return type_coerce(column, JSONB).contains([element])
+    elements = func.json_each(column).table_valued('value')
+    return select(elements.c.value).where(elements.c.value == element).exists()
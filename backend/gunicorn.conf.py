@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for production
+`gunicorn -c backend/gunicorn.conf.py backend.wsgi:app` (from the repo root)
+
+Event streams (/api/v1/events/stream) stay open for up to
+EVENTS_STREAM_MAX_SECONDS, so workers are threaded: each open stream holds a
+thread waiting on the event broker, not a whole worker process. Ordinary
+requests each need a database connection, so the production config sizes
+the SQLAlchemy pool from GUNICORN_THREADS; keep threads modest here and, for
+many open dashboards, serve /api/v1/events/ from a second instance with
+more threads (streams hold no connection while they wait).
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+# Matches the default DB_POOL_SIZE in config/production.py
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# gthread workers heartbeat from their main thread, so this bounds a stuck
+# worker, not a long-lived stream
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+# Idle time allowed between requests on a kept-alive connection (open
+# streams are not idle, so this doesn't cut them off)
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 20))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+accesslog = '-'
+# The default format logs the request line, query string included; the
+# event stream takes its token as ?jwt=, so log the path only
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(m)s %(U)s %(H)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+errorlog = '-'
@@ -12,6 +12,13 @@ import os
 
 # Import database AFTER defining it
 from backend.core.database import db
+from backend.core.document_cache import document_cache
+from backend.core.events import event_broker
+from backend.core.jobs import job_queue
+from backend.core.migrations import schema_migrations
+from backend.core.query_profiler import query_profiler
+from backend.core.read_cache import read_cache
+from backend.core.serialization import FastJSONProvider
 
 # Initialize JWT
 jwt = JWTManager()
@@ -39,12 +46,20 @@ def create_app(config_name='development'):
         from backend.config.development import DevelopmentConfig
         app.config.from_object(DevelopmentConfig)
     
+    app.json = FastJSONProvider(app)
+    
     # Initialize extensions with app
     db.init_app(app)
     jwt.init_app(app)
+    document_cache.init_app(app)
+    event_broker.init_app(app)
+    job_queue.init_app(app)
+    query_profiler.init_app(app)
+    read_cache.init_app(app)
+    schema_migrations.init_app(app)
     CORS(app)
     
-    # Register blueprints and create tables
+    # Register blueprints
     with app.app_context():
         # Import models AFTER db is initialized
         from backend.models.teacher import Teacher
@@ -55,12 +70,21 @@ def create_app(config_name='development'):
         from backend.models.lesson import Lesson
         from backend.models.evidence import Evidence
         from backend.models.student_progress import StudentProgress
+        from backend.models.change_version import ChangeVersion
+        from backend.models.tombstone import Tombstone
         
         from backend.api.v1 import (auth_bp, worksheets_bp, students_bp, 
                                     evidence_bp, health_bp, le_bp, lessons_bp)
         from backend.api.v1.worksheets_routes import worksheets_routes_bp
         from backend.api.v1.evidence_routes import evidence_routes_bp
         from backend.api.v1.support_files_routes import support_files_bp
+        from backend.api.v1.jobs_routes import jobs_bp
+        from backend.api.v1.analytics_routes import analytics_bp
+        from backend.api.v1.export_routes import exports_bp
+        from backend.api.v1.planner_routes import planner_bp
+        from backend.api.v1.sync_routes import sync_bp
+        from backend.api.v1.events_routes import events_bp
+        from backend.services.generation_jobs import register_jobs
         
         app.register_blueprint(health_bp)
         app.register_blueprint(auth_bp)
@@ -72,9 +96,19 @@ def create_app(config_name='development'):
         app.register_blueprint(worksheets_routes_bp)
         app.register_blueprint(evidence_routes_bp)
         app.register_blueprint(support_files_bp)
+        app.register_blueprint(jobs_bp)
+        app.register_blueprint(analytics_bp)
+        app.register_blueprint(exports_bp)
+        app.register_blueprint(planner_bp)
+        app.register_blueprint(sync_bp)
+        app.register_blueprint(events_bp)
+        
+        register_jobs(job_queue)
         
-        # Create database tables
-        db.create_all()
+        # Schema changes ship as migrations (`flask db upgrade`), so workers
+        # don't reflect the schema on every boot unless DB_AUTO_MIGRATE is set
+        if schema_migrations.auto_upgrade:
+            schema_migrations.upgrade()
     
     # Configure logging
     if not app.debug:
@@ -115,4 +149,6 @@ def create_app(config_name='development'):
 
 if __name__ == '__main__':
     app = create_app('development')
+    with app.app_context():
+        schema_migrations.upgrade()
     app.run(debug=True, host='0.0.0.0', port=5000)
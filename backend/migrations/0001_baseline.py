@@ -0,0 +1,105 @@
+"""
+Baseline schema
+Tables as originally created by db.create_all(); checkfirst makes this a
+no-op on databases that predate migrations
+"""
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text
+
+def _base_columns():
+    return [
+        Column('id', String(36), primary_key=True),
+        Column('created_at', DateTime, nullable=False),
+        Column('updated_at', DateTime, nullable=False)
+    ]
+
+def upgrade(ctx):
+    metadata = MetaData()
+    
+    Table(
+        'teachers', metadata, *_base_columns(),
+        Column('email', String(120), unique=True, nullable=False, index=True),
+        Column('first_name', String(100), nullable=False),
+        Column('last_name', String(100), nullable=False),
+        Column('password_hash', String(255), nullable=False),
+        Column('is_active', Boolean)
+    )
+    Table(
+        'students', metadata, *_base_columns(),
+        Column('first_name', String(100), nullable=False),
+        Column('last_name', String(100), nullable=False),
+        Column('year_level', Integer, nullable=False),
+        Column('is_active', Boolean)
+    )
+    Table(
+        'learning_experiences', metadata, *_base_columns(),
+        Column('teacher_id', String(36), ForeignKey('teachers.id'), nullable=False, index=True),
+        Column('unit_number', Integer, nullable=False),
+        Column('experience_number', Integer, nullable=False),
+        Column('core_concept', String(200), nullable=False),
+        Column('learning_intention', Text, nullable=False),
+        Column('success_criteria', Text, nullable=False),
+        Column('subject', String(50), nullable=False),
+        Column('year_level', Integer, nullable=False),
+        Column('nesa_outcome_code', String(50)),
+        Column('duration_minutes', Integer),
+        Column('is_active', Boolean)
+    )
+    Table(
+        'lessons', metadata, *_base_columns(),
+        Column('teacher_id', String(36), ForeignKey('teachers.id'), nullable=False, index=True),
+        Column('learning_experience_id', String(36), ForeignKey('learning_experiences.id'), nullable=False, index=True),
+        Column('week_number', Integer, nullable=False),
+        Column('date_scheduled', DateTime, nullable=False),
+        Column('duration_minutes', Integer),
+        Column('location', String(100)),
+        Column('notes', Text),
+        Column('status', String(20))
+    )
+    Table(
+        'worksheets', metadata, *_base_columns(),
+        Column('lesson_id', String(36), ForeignKey('lessons.id'), nullable=False, index=True),
+        Column('tier', String(20), nullable=False),
+        Column('title', String(200), nullable=False),
+        Column('description', Text),
+        Column('subject', String(50), nullable=False),
+        Column('year_level', Integer, nullable=False),
+        Column('learning_intention', Text),
+        Column('success_criteria', Text),
+        Column('question_count', Integer),
+        Column('file_path', String(500))
+    )
+    Table(
+        'worksheet_questions', metadata, *_base_columns(),
+        Column('worksheet_id', String(36), ForeignKey('worksheets.id'), nullable=False, index=True),
+        Column('question_number', Integer, nullable=False),
+        Column('question_text', Text, nullable=False),
+        Column('tier', String(20), nullable=False),
+        Column('hints', Text),
+        Column('model_answer', Text),
+        Column('difficulty_level', String(50))
+    )
+    Table(
+        'evidence', metadata, *_base_columns(),
+        Column('teacher_id', String(36), ForeignKey('teachers.id'), nullable=False, index=True),
+        Column('student_id', String(36), ForeignKey('students.id'), nullable=False, index=True),
+        Column('learning_experience_id', String(36), ForeignKey('learning_experiences.id'), nullable=False, index=True),
+        Column('lesson_id', String(36), ForeignKey('lessons.id')),
+        Column('observation_date', DateTime, nullable=False),
+        Column('observation_text', Text, nullable=False),
+        Column('mastery_level', Integer, nullable=False),
+        Column('success_criteria_ids', Text),
+        Column('attachment_url', String(500)),
+        Column('notes', Text)
+    )
+    Table(
+        'student_progress', metadata, *_base_columns(),
+        Column('student_id', String(36), ForeignKey('students.id'), nullable=False, index=True),
+        Column('learning_experience_id', String(36), ForeignKey('learning_experiences.id'), nullable=False, index=True),
+        Column('mastery_level', Integer),
+        Column('success_criteria_status', Text),
+        Column('evidence_count', Integer),
+        Column('trend', String(50)),
+        Column('last_evidence_date', DateTime)
+    )
+    
+    metadata.create_all(ctx.connection, checkfirst=True)
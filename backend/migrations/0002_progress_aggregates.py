@@ -0,0 +1,12 @@
+"""
+Incremental progress aggregate columns
+Running mastery counts, success criteria hits and the trend window kept on
+student_progress so evidence writes apply deltas instead of rescanning
+"""
+from sqlalchemy import Column, Integer, Text
+
+def upgrade(ctx):
+    ctx.add_column('student_progress', Column('mastery_counts', Text))
+    ctx.add_column('student_progress', Column('mastery_total', Integer))
+    ctx.add_column('student_progress', Column('success_criteria_hits', Text))
+    ctx.add_column('student_progress', Column('trend_window', Text))
@@ -0,0 +1,45 @@
+"""
+Composite indexes for the lookup and keyset page query shapes
+Replaces single-column indexes that are now a prefix of a composite. Runs
+outside a transaction so Postgres can build the indexes concurrently on a
+populated database.
+"""
+
+transactional = False
+
+def upgrade(ctx):
+    ctx.create_index('ix_evidence_student_date', 'evidence', ['student_id', 'observation_date', 'id'])
+    ctx.create_index(
+        'ix_evidence_student_le_date', 'evidence',
+        ['student_id', 'learning_experience_id', 'observation_date', 'id']
+    )
+    ctx.create_index('ix_evidence_teacher_date', 'evidence', ['teacher_id', 'observation_date', 'id'])
+    ctx.create_index('ix_lessons_teacher_date', 'lessons', ['teacher_id', 'date_scheduled', 'id'])
+    ctx.create_index(
+        'ix_lessons_published_week', 'lessons', ['teacher_id', 'week_number', 'date_scheduled', 'id'],
+        where="status = 'published'"
+    )
+    ctx.create_index(
+        'ix_learning_experiences_active_unit', 'learning_experiences',
+        ['teacher_id', 'unit_number', 'experience_number'],
+        where={'postgresql': 'is_active', 'sqlite': 'is_active = 1'}
+    )
+    ctx.create_index('ix_student_progress_student_le', 'student_progress', ['student_id', 'learning_experience_id'])
+    ctx.create_index(
+        'ix_student_progress_le_student', 'student_progress', ['learning_experience_id', 'student_id', 'id']
+    )
+    ctx.create_index('ix_worksheets_lesson_tier', 'worksheets', ['lesson_id', 'tier'])
+    ctx.create_index('ix_worksheets_created', 'worksheets', ['created_at', 'id'])
+    ctx.create_index(
+        'ix_worksheet_questions_worksheet_number', 'worksheet_questions', ['worksheet_id', 'question_number']
+    )
+    ctx.create_index('ix_students_name', 'students', ['last_name', 'first_name', 'id'])
+    
+    # Only drop the old indexes once their replacements are built, so
+    # lookups never fall back to sequential scans
+    for name in (
+        'ix_evidence_student_id', 'ix_evidence_teacher_id', 'ix_lessons_teacher_id',
+        'ix_student_progress_student_id', 'ix_student_progress_learning_experience_id',
+        'ix_worksheets_lesson_id', 'ix_worksheet_questions_worksheet_id'
+    ):
+        ctx.drop_index(name)
@@ -0,0 +1,11 @@
+"""
+Native JSON success criteria fields
+Success criteria lists, evidence SC IDs and SC status maps become JSONB on
+Postgres; SQLite keeps storing them as JSON text
+"""
+
+def upgrade(ctx):
+    ctx.convert_to_json('learning_experiences', 'success_criteria')
+    ctx.convert_to_json('worksheets', 'success_criteria')
+    ctx.convert_to_json('evidence', 'success_criteria_ids')
+    ctx.convert_to_json('student_progress', 'success_criteria_status')
@@ -0,0 +1,16 @@
+"""
+GIN indexes for success criteria containment queries (Postgres only)
+Built concurrently so populated tables stay writable
+"""
+
+transactional = False
+
+def upgrade(ctx):
+    ctx.create_index(
+        'ix_evidence_success_criteria_ids', 'evidence', ['success_criteria_ids jsonb_path_ops'],
+        using='gin', dialects=['postgresql']
+    )
+    ctx.create_index(
+        'ix_student_progress_sc_status', 'student_progress', ['success_criteria_status jsonb_path_ops'],
+        using='gin', dialects=['postgresql']
+    )
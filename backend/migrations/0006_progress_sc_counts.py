@@ -0,0 +1,21 @@
+"""
+Success criteria met/total counts on student_progress
+Backfilled from the SC status documents so the unit mastery matrix can be
+read straight from student_progress
+"""
+from sqlalchemy import Column, Integer
+
+def upgrade(ctx):
+    ctx.add_column('student_progress', Column('success_criteria_met', Integer))
+    ctx.add_column('student_progress', Column('success_criteria_total', Integer))
+    
+    if ctx.dialect == 'postgresql':
+        members = 'jsonb_each_text(success_criteria_status)'
+    else:
+        members = 'json_each(success_criteria_status)'
+    ctx.execute(
+        f"UPDATE student_progress SET "
+        f"success_criteria_met = (SELECT COUNT(*) FROM {members} WHERE value = 'met'), "
+        f"success_criteria_total = (SELECT COUNT(*) FROM {members}) "
+        f"WHERE success_criteria_status IS NOT NULL"
+    )
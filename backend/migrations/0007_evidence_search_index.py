@@ -0,0 +1,11 @@
+"""
+Full-text search index over evidence observation text and notes
+A generated tsvector column with a GIN index on Postgres (built
+concurrently), an FTS5 table kept in sync by triggers on SQLite
+"""
+from backend.core import search
+
+transactional = False
+
+def upgrade(ctx):
+    search.install(ctx)
@@ -0,0 +1,9 @@
+"""
+Index evidence by lesson for the weekly planner's evidence counts
+Runs outside a transaction so Postgres can build it concurrently
+"""
+
+transactional = False
+
+def upgrade(ctx):
+    ctx.create_index('ix_evidence_lesson', 'evidence', ['lesson_id'])
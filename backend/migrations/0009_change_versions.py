@@ -0,0 +1,12 @@
+"""
+Per-tag change versions for collection ETags
+"""
+from sqlalchemy import Column, DateTime, Integer, String
+
+def upgrade(ctx):
+    ctx.create_table(
+        'change_versions',
+        Column('tag', String(120), primary_key=True),
+        Column('version', Integer, nullable=False),
+        Column('updated_at', DateTime, nullable=False)
+    )
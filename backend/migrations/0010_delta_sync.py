@@ -0,0 +1,30 @@
+"""
+Delta sync: tombstones for hard deletes and updated_at indexes
+Runs outside a transaction so Postgres can build the indexes concurrently
+"""
+from sqlalchemy import Column, DateTime, String
+
+transactional = False
+
+def upgrade(ctx):
+    ctx.create_table(
+        'tombstones',
+        Column('id', String(36), primary_key=True),
+        Column('created_at', DateTime, nullable=False),
+        Column('updated_at', DateTime, nullable=False),
+        Column('teacher_id', String(36), nullable=False),
+        Column('entity', String(40), nullable=False),
+        Column('entity_id', String(36), nullable=False)
+    )
+    ctx.create_index('ix_tombstones_teacher_created', 'tombstones', ['teacher_id', 'created_at'])
+    
+    ctx.create_index('ix_learning_experiences_teacher_updated', 'learning_experiences', ['teacher_id', 'updated_at'])
+    # Now a prefix of the index above
+    ctx.drop_index('ix_learning_experiences_teacher_id')
+    ctx.create_index('ix_lessons_teacher_updated', 'lessons', ['teacher_id', 'updated_at'])
+    ctx.create_index('ix_evidence_teacher_updated', 'evidence', ['teacher_id', 'updated_at'])
+    # Tables without a teacher_id are scanned per parent row of the teacher,
+    # so a sync never reads other teachers' changes
+    ctx.create_index('ix_worksheets_lesson_updated', 'worksheets', ['lesson_id', 'updated_at'])
+    ctx.create_index('ix_worksheet_questions_worksheet_updated', 'worksheet_questions', ['worksheet_id', 'updated_at'])
+    ctx.create_index('ix_student_progress_le_updated', 'student_progress', ['learning_experience_id', 'updated_at'])
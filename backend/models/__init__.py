@@ -7,6 +7,8 @@ from backend.models.learning_experience import LearningExperience
 from backend.models.lesson import Lesson
 from backend.models.evidence import Evidence
 from backend.models.student_progress import StudentProgress
+from backend.models.change_version import ChangeVersion
+from backend.models.tombstone import Tombstone
 
 __all__ = [
     'Teacher', 
@@ -16,5 +18,7 @@ __all__ = [
     'LearningExperience',
     'Lesson',
     'Evidence',
-    'StudentProgress'
+    'StudentProgress',
+    'ChangeVersion',
+    'Tombstone'
 ]
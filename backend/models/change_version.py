@@ -0,0 +1,28 @@
+"""Change version model - per-tag write counters for conditional GETs"""
+from backend.core.database import db
+from sqlalchemy import select
+
+class ChangeVersion(db.Model):
+    """
+    Number of committed writes under a cache tag (e.g. 'lessons:<teacher_id>')
+    
+    Bumped in the same transaction as the write, so every process derives
+    the same collection ETag from it.
+    """
+    __tablename__ = 'change_versions'
+    
+    tag = db.Column(db.String(120), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)
+    
+    @classmethod
+    def lookup(cls, tags):
+        """Rows (tag, version, updated_at) for the tags that have been written, by tag"""
+        return {
+            row.tag: row for row in db.session.execute(
+                select(cls.tag, cls.version, cls.updated_at).where(cls.tag.in_(tags))
+            )
+        }
+    
+    def __repr__(self):
+        return f'<ChangeVersion {self.tag} v{self.version}>'
@@ -1,13 +1,33 @@
 """Evidence model - tracking student learning"""
-from backend.core.database import BaseModel, db
-import json
+from backend.core.database import BaseModel, db, cached_lookup
+from backend.core.migrations import MigrationContext
+from backend.core.types import JSONDocument, json_value
+from backend.core import search
+from sqlalchemy import event
 
 class Evidence(BaseModel):
     """Evidence of student learning against success criteria"""
     __tablename__ = 'evidence'
+    __table_args__ = (
+        # find_by_student and the student evidence pages (newest first)
+        db.Index('ix_evidence_student_date', 'student_id', 'observation_date', 'id'),
+        # find_by_student_and_le and the trend window refill
+        db.Index('ix_evidence_student_le_date', 'student_id', 'learning_experience_id', 'observation_date', 'id'),
+        # find_by_teacher and the teacher evidence pages
+        db.Index('ix_evidence_teacher_date', 'teacher_id', 'observation_date', 'id'),
+        # Evidence counts per lesson (weekly planner)
+        db.Index('ix_evidence_lesson', 'lesson_id'),
+        # Delta sync
+        db.Index('ix_evidence_teacher_updated', 'teacher_id', 'updated_at'),
+        # SC containment queries (Postgres only)
+        db.Index(
+            'ix_evidence_success_criteria_ids', 'success_criteria_ids',
+            postgresql_using='gin', postgresql_ops={'success_criteria_ids': 'jsonb_path_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
     
-    teacher_id = db.Column(db.String(36), db.ForeignKey('teachers.id'), nullable=False, index=True)
-    student_id = db.Column(db.String(36), db.ForeignKey('students.id'), nullable=False, index=True)
+    teacher_id = db.Column(db.String(36), db.ForeignKey('teachers.id'), nullable=False)
+    student_id = db.Column(db.String(36), db.ForeignKey('students.id'), nullable=False)
     learning_experience_id = db.Column(db.String(36), db.ForeignKey('learning_experiences.id'), nullable=False, index=True)
     lesson_id = db.Column(db.String(36), db.ForeignKey('lessons.id'))
     
@@ -18,7 +38,7 @@ class Evidence(BaseModel):
     mastery_level = db.Column(db.Integer, nullable=False)
     
     # Success criteria demonstrated (JSON array of SC IDs)
-    success_criteria_ids = db.Column(db.Text)
+    success_criteria_ids = db.Column(JSONDocument)
     
     # File attachment (photo, work sample, etc.)
     attachment_url = db.Column(db.String(500))
@@ -31,26 +51,44 @@ class Evidence(BaseModel):
     
     def get_success_criteria_ids(self):
         """Get success criteria IDs as list"""
-        try:
-            return json.loads(self.success_criteria_ids) if self.success_criteria_ids else []
-        except:
-            return []
+        return list(json_value(self.success_criteria_ids, []))
     
     def set_success_criteria_ids(self, ids_list):
         """Set success criteria IDs from list"""
-        self.success_criteria_ids = json.dumps(ids_list)
+        self.success_criteria_ids = list(ids_list)
     
     @classmethod
+    @cached_lookup
     def find_by_student(cls, student_id):
         """Get all evidence for a student"""
         return cls.query.filter_by(student_id=student_id).order_by(cls.observation_date.desc()).all()
     
     @classmethod
+    @cached_lookup
     def find_by_student_and_le(cls, student_id, learning_experience_id):
         """Get all evidence for a student for a specific LE"""
         return cls.query.filter_by(student_id=student_id, learning_experience_id=learning_experience_id).all()
     
     @classmethod
+    @cached_lookup
+    def find_recent_by_student_and_le(cls, student_id, learning_experience_id, limit):
+        """Get the most recent evidence for a student on a specific LE"""
+        return cls.query.filter_by(
+            student_id=student_id, learning_experience_id=learning_experience_id
+        ).order_by(cls.observation_date.desc(), cls.id.desc()).limit(limit).all()
+    
+    @classmethod
+    @cached_lookup
     def find_by_teacher(cls, teacher_id):
         """Get all evidence logged by a teacher"""
         return cls.query.filter_by(teacher_id=teacher_id).order_by(cls.observation_date.desc()).all()
+
+# The full-text index lives outside the model metadata (see core/search.py);
+# keep it alongside the table when create_all/drop_all manage the schema
+@event.listens_for(Evidence.__table__, 'after_create')
+def _create_search_index(target, connection, **kw):
+    search.install(MigrationContext(connection))
+
+@event.listens_for(Evidence.__table__, 'before_drop')
+def _drop_search_index(target, connection, **kw):
+    search.uninstall(MigrationContext(connection))
@@ -1,17 +1,27 @@
 """Learning Experience model"""
-from backend.core.database import BaseModel, db
-import json
+from backend.core.database import BaseModel, db, cached_lookup
+from backend.core.types import JSONDocument, json_value
 
 class LearningExperience(BaseModel):
     """Learning Experience model - core lesson concept"""
     __tablename__ = 'learning_experiences'
+    __table_args__ = (
+        # find_by_teacher and find_by_unit: active LEs only
+        db.Index(
+            'ix_learning_experiences_active_unit', 'teacher_id', 'unit_number', 'experience_number',
+            postgresql_where=db.text('is_active'),
+            sqlite_where=db.text('is_active = 1')
+        ),
+        # Delta sync (and the teacher's LEs, active or not)
+        db.Index('ix_learning_experiences_teacher_updated', 'teacher_id', 'updated_at'),
+    )
     
-    teacher_id = db.Column(db.String(36), db.ForeignKey('teachers.id'), nullable=False, index=True)
+    teacher_id = db.Column(db.String(36), db.ForeignKey('teachers.id'), nullable=False)
     unit_number = db.Column(db.Integer, nullable=False)
     experience_number = db.Column(db.Integer, nullable=False)
     core_concept = db.Column(db.String(200), nullable=False)
     learning_intention = db.Column(db.Text, nullable=False)
-    success_criteria = db.Column(db.Text, nullable=False)  # JSON array of "I can..." statements
+    success_criteria = db.Column(JSONDocument, nullable=False)  # JSON array of "I can..." statements
     subject = db.Column(db.String(50), nullable=False)  # Maths, English, Science, History, Geography
     year_level = db.Column(db.Integer, nullable=False, default=6)
     nesa_outcome_code = db.Column(db.String(50))  # e.g., "MA3-RN-01"
@@ -23,21 +33,21 @@ class LearningExperience(BaseModel):
     
     def get_success_criteria_list(self):
         """Get success criteria as list"""
-        try:
-            return json.loads(self.success_criteria)
-        except:
-            return [self.success_criteria]
+        criteria = json_value(self.success_criteria, [])
+        return list(criteria) if isinstance(criteria, list) else [criteria]
     
     def set_success_criteria_list(self, criteria_list):
         """Set success criteria from list"""
-        self.success_criteria = json.dumps(criteria_list)
+        self.success_criteria = list(criteria_list)
     
     @classmethod
+    @cached_lookup
     def find_by_teacher(cls, teacher_id):
         """Get all LEs for a teacher"""
         return cls.query.filter_by(teacher_id=teacher_id, is_active=True).all()
     
     @classmethod
+    @cached_lookup
     def find_by_unit(cls, teacher_id, unit_number):
         """Get LEs for specific unit"""
         return cls.query.filter_by(teacher_id=teacher_id, unit_number=unit_number, is_active=True).all()
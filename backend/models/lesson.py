@@ -1,12 +1,24 @@
 """Lesson model - instance of a Learning Experience in a weekly plan"""
-from backend.core.database import BaseModel, db
+from backend.core.database import BaseModel, db, cached_lookup
 from datetime import datetime
 
 class Lesson(BaseModel):
     """Lesson model - scheduled instance of a Learning Experience"""
     __tablename__ = 'lessons'
+    __table_args__ = (
+        # find_by_teacher and the lesson pages
+        db.Index('ix_lessons_teacher_date', 'teacher_id', 'date_scheduled', 'id'),
+        # Delta sync
+        db.Index('ix_lessons_teacher_updated', 'teacher_id', 'updated_at'),
+        # Weekly planner: published lessons only
+        db.Index(
+            'ix_lessons_published_week', 'teacher_id', 'week_number', 'date_scheduled', 'id',
+            postgresql_where=db.text("status = 'published'"),
+            sqlite_where=db.text("status = 'published'")
+        ),
+    )
     
-    teacher_id = db.Column(db.String(36), db.ForeignKey('teachers.id'), nullable=False, index=True)
+    teacher_id = db.Column(db.String(36), db.ForeignKey('teachers.id'), nullable=False)
     learning_experience_id = db.Column(db.String(36), db.ForeignKey('learning_experiences.id'), nullable=False, index=True)
     week_number = db.Column(db.Integer, nullable=False)
     date_scheduled = db.Column(db.DateTime, nullable=False)
@@ -19,16 +31,19 @@ class Lesson(BaseModel):
         return f'<Lesson Week {self.week_number} - {self.date_scheduled.date()}>'
     
     @classmethod
+    @cached_lookup
     def find_by_teacher_and_week(cls, teacher_id, week_number):
         """Get all lessons for a teacher in a specific week"""
         return cls.query.filter_by(teacher_id=teacher_id, week_number=week_number, status='published').all()
     
     @classmethod
+    @cached_lookup
     def find_by_teacher(cls, teacher_id):
         """Get all lessons for a teacher"""
         return cls.query.filter_by(teacher_id=teacher_id).order_by(cls.date_scheduled).all()
     
     @classmethod
+    @cached_lookup
     def find_by_le(cls, learning_experience_id):
         """Get all scheduled lessons for a Learning Experience"""
         return cls.query.filter_by(learning_experience_id=learning_experience_id).all()
@@ -4,6 +4,10 @@ from backend.core.database import BaseModel, db
 class Student(BaseModel):
     """Student model"""
     __tablename__ = 'students'
+    __table_args__ = (
+        # Student pages in name order
+        db.Index('ix_students_name', 'last_name', 'first_name', 'id'),
+    )
     
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
@@ -1,19 +1,37 @@
 """Student Progress model - aggregated learning progress"""
-from backend.core.database import BaseModel, db
+from backend.core.database import BaseModel, db, cached_lookup
+from backend.core.types import JSONDocument, json_value
 import json
 
 class StudentProgress(BaseModel):
     """Aggregated progress for a student on a Learning Experience"""
     __tablename__ = 'student_progress'
+    __table_args__ = (
+        # find_by_student (find_by_student_and_le can use either index)
+        db.Index('ix_student_progress_student_le', 'student_id', 'learning_experience_id'),
+        # Class progress pages
+        db.Index('ix_student_progress_le_student', 'learning_experience_id', 'student_id', 'id'),
+        # Delta sync, scoped through the teacher's LEs
+        db.Index('ix_student_progress_le_updated', 'learning_experience_id', 'updated_at'),
+        # SC status containment queries (Postgres only)
+        db.Index(
+            'ix_student_progress_sc_status', 'success_criteria_status',
+            postgresql_using='gin', postgresql_ops={'success_criteria_status': 'jsonb_path_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
     
-    student_id = db.Column(db.String(36), db.ForeignKey('students.id'), nullable=False, index=True)
-    learning_experience_id = db.Column(db.String(36), db.ForeignKey('learning_experiences.id'), nullable=False, index=True)
+    student_id = db.Column(db.String(36), db.ForeignKey('students.id'), nullable=False)
+    learning_experience_id = db.Column(db.String(36), db.ForeignKey('learning_experiences.id'), nullable=False)
     
     # Current mastery level (1-4)
     mastery_level = db.Column(db.Integer, default=1)
     
     # Success criteria status (JSON: {sc_id: 'met'|'not_met'|'emerging'})
-    success_criteria_status = db.Column(db.Text)
+    success_criteria_status = db.Column(JSONDocument)
+    
+    # Success criteria met / on the LE, kept with the status for the unit mastery matrix
+    success_criteria_met = db.Column(db.Integer, default=0)
+    success_criteria_total = db.Column(db.Integer, default=0)
     
     # Number of evidence entries
     evidence_count = db.Column(db.Integer, default=0)
@@ -24,26 +42,76 @@ class StudentProgress(BaseModel):
     # Last evidence date
     last_evidence_date = db.Column(db.DateTime)
     
+    # Running counters for incremental aggregation
+    # Evidence count per mastery level (JSON: {level: count})
+    mastery_counts = db.Column(db.Text)
+    
+    # Sum of mastery levels across all evidence
+    mastery_total = db.Column(db.Integer, default=0)
+    
+    # Evidence count per success criterion (JSON: {sc_id: count})
+    success_criteria_hits = db.Column(db.Text)
+    
+    # Most recent evidence used for the trend (JSON: [[date, mastery_level, evidence_id], ...])
+    trend_window = db.Column(db.Text)
+    
     def __repr__(self):
         return f'<StudentProgress {self.student_id} - LE {self.learning_experience_id}>'
     
     def get_success_criteria_status(self):
         """Get SC status as dict"""
+        return dict(json_value(self.success_criteria_status, {}))
+    
+    def set_success_criteria_status(self, status_dict):
+        """Set SC status from dict"""
+        self.success_criteria_status = dict(status_dict)
+    
+    def get_mastery_counts(self):
+        """Get mastery level counts as dict"""
         try:
-            return json.loads(self.success_criteria_status) if self.success_criteria_status else {}
+            return json.loads(self.mastery_counts) if self.mastery_counts else {}
         except:
             return {}
     
-    def set_success_criteria_status(self, status_dict):
-        """Set SC status from dict"""
-        self.success_criteria_status = json.dumps(status_dict)
+    def set_mastery_counts(self, counts_dict):
+        """Set mastery level counts from dict"""
+        self.mastery_counts = json.dumps(counts_dict)
+    
+    def get_success_criteria_hits(self):
+        """Get SC hit counts as dict"""
+        try:
+            return json.loads(self.success_criteria_hits) if self.success_criteria_hits else {}
+        except:
+            return {}
+    
+    def set_success_criteria_hits(self, hits_dict):
+        """Set SC hit counts from dict"""
+        self.success_criteria_hits = json.dumps(hits_dict)
+    
+    def get_trend_window(self):
+        """Get trend window as list of [date, mastery_level, evidence_id]"""
+        try:
+            return json.loads(self.trend_window) if self.trend_window else []
+        except:
+            return []
+    
+    def set_trend_window(self, window):
+        """Set trend window from list"""
+        self.trend_window = json.dumps(window)
+    
+    @property
+    def has_counters(self):
+        """Whether running counters are populated (legacy rows only have summaries)"""
+        return self.mastery_counts is not None or not self.evidence_count
     
     @classmethod
+    @cached_lookup
     def find_by_student(cls, student_id):
         """Get all progress for a student"""
         return cls.query.filter_by(student_id=student_id).all()
     
     @classmethod
+    @cached_lookup
     def find_by_student_and_le(cls, student_id, learning_experience_id):
         """Get progress for student on specific LE"""
         return cls.query.filter_by(student_id=student_id, learning_experience_id=learning_experience_id).first()
@@ -1,5 +1,5 @@
 """Teacher model"""
-from backend.core.database import BaseModel, db
+from backend.core.database import BaseModel, db, cached_lookup
 
 class Teacher(BaseModel):
     """Teacher model"""
@@ -19,5 +19,6 @@ class Teacher(BaseModel):
         return f"{self.first_name} {self.last_name}"
     
     @classmethod
+    @cached_lookup
     def find_by_email(cls, email):
         return cls.query.filter_by(email=email).first()
@@ -0,0 +1,38 @@
+"""Tombstone model - hard deletes recorded for delta sync"""
+from backend.core.database import BaseModel, db
+from sqlalchemy import insert
+from datetime import datetime
+import uuid
+
+class Tombstone(BaseModel):
+    """
+    A deleted row, kept so sync clients can drop their copy
+    
+    created_at is the deletion time.
+    """
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        # Delta sync
+        db.Index('ix_tombstones_teacher_created', 'teacher_id', 'created_at'),
+    )
+    
+    teacher_id = db.Column(db.String(36), nullable=False)
+    entity = db.Column(db.String(40), nullable=False)  # Sync collection name, e.g. 'lessons'
+    entity_id = db.Column(db.String(36), nullable=False)
+    
+    def __repr__(self):
+        return f'<Tombstone {self.entity} {self.entity_id}>'
+    
+    @classmethod
+    def record(cls, teacher_id, entity, entity_ids):
+        """Record deleted rows in the current transaction (one bulk insert)"""
+        if not entity_ids:
+            return
+        now = datetime.utcnow()
+        db.session.execute(insert(cls), [
+            {
+                'id': str(uuid.uuid4()), 'teacher_id': teacher_id, 'entity': entity,
+                'entity_id': entity_id, 'created_at': now, 'updated_at': now
+            }
+            for entity_id in entity_ids
+        ])
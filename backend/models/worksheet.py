@@ -1,18 +1,27 @@
 """Worksheet model"""
-from backend.core.database import BaseModel, db
+from backend.core.database import BaseModel, db, cached_lookup
+from backend.core.types import JSONDocument
 
 class Worksheet(BaseModel):
     """Worksheet model - collection of questions at one tier level"""
     __tablename__ = 'worksheets'
+    __table_args__ = (
+        # find_by_lesson and find_by_lesson_and_tier
+        db.Index('ix_worksheets_lesson_tier', 'lesson_id', 'tier'),
+        # Worksheet pages
+        db.Index('ix_worksheets_created', 'created_at', 'id'),
+        # Delta sync, scoped through the teacher's lessons
+        db.Index('ix_worksheets_lesson_updated', 'lesson_id', 'updated_at'),
+    )
     
-    lesson_id = db.Column(db.String(36), db.ForeignKey('lessons.id'), nullable=False, index=True)
+    lesson_id = db.Column(db.String(36), db.ForeignKey('lessons.id'), nullable=False)
     tier = db.Column(db.String(20), nullable=False)  # mild, medium, spicy, enrichment
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     subject = db.Column(db.String(50), nullable=False)
     year_level = db.Column(db.Integer, nullable=False)
     learning_intention = db.Column(db.Text)
-    success_criteria = db.Column(db.Text)  # JSON
+    success_criteria = db.Column(JSONDocument)
     question_count = db.Column(db.Integer, default=0)
     file_path = db.Column(db.String(500))  # Path to generated .docx file
     
@@ -20,11 +29,13 @@ class Worksheet(BaseModel):
         return f'<Worksheet {self.tier} - {self.question_count} questions>'
     
     @classmethod
+    @cached_lookup
     def find_by_lesson(cls, lesson_id):
         """Get all worksheets for a lesson"""
         return cls.query.filter_by(lesson_id=lesson_id).all()
     
     @classmethod
+    @cached_lookup
     def find_by_lesson_and_tier(cls, lesson_id, tier):
         """Get worksheet for a specific tier"""
         return cls.query.filter_by(lesson_id=lesson_id, tier=tier).first()
@@ -1,11 +1,17 @@
 """Worksheet Question model"""
-from backend.core.database import BaseModel, db
+from backend.core.database import BaseModel, db, cached_lookup
 
 class WorksheetQuestion(BaseModel):
     """Individual question in a worksheet"""
     __tablename__ = 'worksheet_questions'
+    __table_args__ = (
+        # find_by_worksheet (ordered by question number)
+        db.Index('ix_worksheet_questions_worksheet_number', 'worksheet_id', 'question_number'),
+        # Delta sync, scoped through the teacher's worksheets
+        db.Index('ix_worksheet_questions_worksheet_updated', 'worksheet_id', 'updated_at'),
+    )
     
-    worksheet_id = db.Column(db.String(36), db.ForeignKey('worksheets.id'), nullable=False, index=True)
+    worksheet_id = db.Column(db.String(36), db.ForeignKey('worksheets.id'), nullable=False)
     question_number = db.Column(db.Integer, nullable=False)
     question_text = db.Column(db.Text, nullable=False)
     tier = db.Column(db.String(20), nullable=False)  # mild, medium, spicy, enrichment
@@ -17,6 +23,7 @@ class WorksheetQuestion(BaseModel):
         return f'<WorksheetQuestion {self.question_number} - {self.tier}>'
     
     @classmethod
+    @cached_lookup
     def find_by_worksheet(cls, worksheet_id):
         """Get all questions for a worksheet"""
         return cls.query.filter_by(worksheet_id=worksheet_id).order_by(cls.question_number).all()
@@ -6,6 +6,8 @@ from backend.models.learning_experience import LearningExperience
 from backend.models.lesson import Lesson
 from backend.models.worksheet import Worksheet
 from backend.services.worksheet_service import WorksheetService
+from backend.core.document_cache import document_cache
+from backend.services.lesson_bundle import LessonBundle
 import os
 
 class AnswerSheetGenerator:
@@ -13,6 +15,9 @@ class AnswerSheetGenerator:
     
     KRPS_GREEN = RGBColor(45, 139, 61)
     
+    # Bump when the document layout changes to invalidate cached copies
+    VERSION = 1
+    
     @staticmethod
     def generate(lesson_id, output_dir='/tmp'):
         """
@@ -25,19 +30,93 @@ class AnswerSheetGenerator:
         Returns:
             Dictionary with file_path and metadata
         """
-        lesson = Lesson.query_by_id(lesson_id)
-        if not lesson:
+        bundle = LessonBundle.load(lesson_id)
+        if not bundle:
             return None
         
-        le = LearningExperience.query_by_id(lesson.learning_experience_id)
-        if not le:
+        return AnswerSheetGenerator.render(bundle, output_dir)
+    
+    @staticmethod
+    def render(bundle, output_dir='/tmp'):
+        """
+        Generate the answer sheet from a preloaded lesson bundle
+        
+        Does not touch the database, so it is safe to run on a worker pool.
+        
+        Args:
+            bundle: LessonBundle for the lesson
+            output_dir: Where to save file
+        
+        Returns:
+            Dictionary with file_path and metadata
+        """
+        prepared = AnswerSheetGenerator.prepare(bundle)
+        if not prepared:
             return None
         
-        # Get worksheets
-        worksheets = WorksheetService.get_worksheets_by_lesson(lesson_id)
+        filepath = os.path.join(output_dir, prepared['filename'])
+        cached = document_cache.render(prepared['key'], filepath, prepared['build'])
+        
+        return {'file_path': filepath, **prepared['metadata'], 'cached': cached}
+    
+    @staticmethod
+    def prepare(bundle):
+        """
+        Work out the cache key, filename and builder for the answer sheet
+        
+        Args:
+            bundle: LessonBundle for the lesson
+        
+        Returns:
+            Dictionary with key, filename, build callable and metadata
+        """
+        lesson = bundle.lesson
+        le = bundle.learning_experience
+        worksheets = bundle.worksheets
+        questions_by_worksheet = bundle.questions_by_worksheet
         if not worksheets:
             return None
         
+        # Cache key covers every input that shapes the document
+        key = document_cache.make_key('answer_sheet', AnswerSheetGenerator.VERSION, {
+            'lesson': document_cache.fingerprint(lesson),
+            'learning_experience': document_cache.fingerprint(le),
+            'worksheets': [document_cache.fingerprint(ws) for ws in worksheets],
+            'questions': [
+                [document_cache.fingerprint(q) for q in questions_by_worksheet.get(ws.id, [])]
+                for ws in worksheets
+            ]
+        })
+        
+        filename = f"AnswerSheet_Unit{le.unit_number}_LE{le.experience_number}.docx"
+        
+        return {
+            'key': key,
+            'filename': filename,
+            'build': lambda: AnswerSheetGenerator._build(lesson, le, worksheets, questions_by_worksheet),
+            'metadata': {
+                'filename': filename,
+                'lesson_id': lesson.id,
+                'subject': le.subject,
+                'core_concept': le.core_concept,
+                'total_questions': sum(ws.question_count for ws in worksheets)
+            }
+        }
+    
+    @staticmethod
+    def _build(lesson, le, worksheets, questions_by_worksheet):
+        """
+        Render the answer sheet document
+        
+        Args:
+            lesson: Lesson object
+            le: LearningExperience object
+            worksheets: Worksheets for the lesson
+            questions_by_worksheet: Dictionary of worksheet ID -> questions
+        
+        Returns:
+            python-docx Document
+        """
         # Create document
         doc = Document()
         
@@ -71,7 +150,7 @@ class AnswerSheetGenerator:
             heading_run.font.size = Pt(12)
             
             # Get questions
-            questions = WorksheetService.get_questions(ws.id)
+            questions = questions_by_worksheet.get(ws.id, [])
             
             for q in questions:
                 # Question
@@ -91,16 +170,4 @@ class AnswerSheetGenerator:
             
             doc.add_paragraph()  # Tier spacing
         
-        # Save
-        filename = f"AnswerSheet_Unit{le.unit_number}_LE{le.experience_number}.docx"
-        filepath = os.path.join(output_dir, filename)
-        doc.save(filepath)
-        
-        return {
-            'file_path': filepath,
-            'filename': filename,
-            'lesson_id': lesson_id,
-            'subject': le.subject,
-            'core_concept': le.core_concept,
-            'total_questions': sum(ws.question_count for ws in worksheets)
-        }
+        return doc
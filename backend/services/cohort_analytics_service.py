@@ -0,0 +1,267 @@
+"""
+Cohort Analytics Service - vectorized statistics over evidence
+Loads the evidence for a scope (a teacher's LEs, optionally one unit, LE,
+year level or date range) into columnar NumPy arrays with one query, then
+computes cohort aggregates with groupby-style array operations
+"""
+from backend.core.database import db
+from backend.models.evidence import Evidence
+from backend.models.learning_experience import LearningExperience
+from backend.models.student import Student
+from backend.services.student_progress_service import StudentProgressService
+from sqlalchemy import String, select, type_coerce
+import json
+import numpy as np
+
+MASTERY_LEVELS = 4
+
+# Weeks start on Monday; 1970-01-05 was a Monday
+_WEEK_EPOCH = np.datetime64('1970-01-05', 'D')
+
+class EvidenceColumns:
+    """Evidence for a scope as parallel arrays, one element per evidence row"""
+    __slots__ = (
+        'student_ids', 'student', 'le_ids', 'le', 'evidence_ids',
+        'dates', 'mastery', 'sc_row', 'sc_ids', 'sc'
+    )
+    
+    def __init__(self, rows):
+        (evidence_ids, student_ids, le_ids, dates, mastery, sc_lists) = (
+            zip(*rows) if rows else ((),) * 6
+        )
+        
+        # Factorize string keys into dense integer codes
+        self.student_ids, self.student = np.unique(np.array(student_ids, dtype=str), return_inverse=True)
+        self.le_ids, self.le = np.unique(np.array(le_ids, dtype=str), return_inverse=True)
+        self.evidence_ids = np.array(evidence_ids, dtype=str)
+        # Raw ISO text on SQLite, datetimes from the Postgres driver - NumPy parses either
+        self.dates = np.array(dates, dtype='datetime64[us]')
+        self.mastery = np.array(mastery, dtype=np.int64)
+        
+        # Explode the SC ID lists: one element per (evidence row, SC ID)
+        sc_lists = _decode_json_lists(sc_lists)
+        lengths = np.fromiter((len(sc) for sc in sc_lists), dtype=np.int64, count=len(sc_lists))
+        self.sc_row = np.repeat(np.arange(len(sc_lists)), lengths)
+        flat = [str(sc_id) for sc in sc_lists for sc_id in sc]
+        self.sc_ids, self.sc = np.unique(np.array(flat, dtype=object).astype(str), return_inverse=True)
+    
+    def __len__(self):
+        return len(self.mastery)
+
+def _decode_json_lists(values):
+    """
+    Decode a column of JSON arrays in one parser call
+    
+    SQLite returns JSON text, which is decoded as a single document instead
+    of once per row; the Postgres driver already returns lists.
+    """
+    if not any(isinstance(value, str) for value in values):
+        return [value or () for value in values]
+    return json.loads('[' + ','.join(
+        value if isinstance(value, str) else json.dumps(value or [])
+        for value in values
+    ) + ']')
+
+def _group_starts(keys):
+    """Start offsets of runs of equal values in a sorted key array"""
+    if not len(keys):
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+
+class CohortAnalyticsService:
+    """Service for cohort-wide mastery, growth and trend statistics"""
+    
+    @staticmethod
+    def load(teacher_id, unit_number=None, learning_experience_id=None, year_level=None,
+             date_from=None, date_to=None):
+        """
+        Load evidence for a scope into columnar arrays with a single query
+        
+        Args:
+            teacher_id: ID of teacher who owns the LEs
+            unit_number: Only LEs in this unit
+            learning_experience_id: Only this LE
+            year_level: Only students in this year level (the grade)
+            date_from: Only evidence observed on or after this datetime
+            date_to: Only evidence observed before this datetime
+        
+        Returns:
+            EvidenceColumns
+        """
+        evidence = Evidence.__table__.c
+        le = LearningExperience.__table__.c
+        # Dates and SC IDs skip per-row result processing and are parsed column-wise
+        query = (
+            select(
+                evidence.id, evidence.student_id, evidence.learning_experience_id,
+                type_coerce(evidence.observation_date, String), evidence.mastery_level,
+                type_coerce(evidence.success_criteria_ids, String)
+            )
+            .join(LearningExperience.__table__, le.id == evidence.learning_experience_id)
+            .where(le.teacher_id == teacher_id)
+        )
+        if unit_number is not None:
+            query = query.where(le.unit_number == unit_number)
+        if learning_experience_id:
+            query = query.where(evidence.learning_experience_id == learning_experience_id)
+        if year_level is not None:
+            student = Student.__table__.c
+            query = query.join(Student.__table__, student.id == evidence.student_id).where(student.year_level == year_level)
+        if date_from:
+            query = query.where(evidence.observation_date >= date_from)
+        if date_to:
+            query = query.where(evidence.observation_date < date_to)
+        
+        return EvidenceColumns(db.session.connection().execute(query).all())
+    
+    @staticmethod
+    def sc_mastery_distribution(columns):
+        """
+        Distribution of students by mastery level for each success criterion
+        
+        A student's level on a SC is the highest mastery level on any of
+        their evidence tagged with it.
+        
+        Args:
+            columns: EvidenceColumns
+        
+        Returns:
+            List of dicts with learning_experience_id, sc_id, students and
+            levels ({level: student count}), ordered by LE then SC
+        """
+        if not len(columns.sc_row):
+            return []
+        
+        row = columns.sc_row
+        n_sc = len(columns.sc_ids)
+        n_students = len(columns.student_ids)
+        group = columns.le[row] * n_sc + columns.sc
+        
+        # Highest level per (LE, SC, student)
+        key = group * n_students + columns.student[row]
+        best = np.zeros(len(columns.le_ids) * n_sc * n_students, dtype=np.int64)
+        np.maximum.at(best, key, columns.mastery[row])
+        cells = np.flatnonzero(best)
+        cell_group = cells // n_students
+        
+        # Students per (LE, SC, level)
+        counts = np.bincount(
+            cell_group * (MASTERY_LEVELS + 1) + best[cells],
+            minlength=len(columns.le_ids) * n_sc * (MASTERY_LEVELS + 1)
+        ).reshape(-1, MASTERY_LEVELS + 1)[:, 1:]
+        
+        results = []
+        for g in np.unique(cell_group):
+            le_code, sc_code = divmod(int(g), n_sc)
+            results.append({
+                'learning_experience_id': columns.le_ids[le_code],
+                'sc_id': columns.sc_ids[sc_code],
+                'students': int(counts[g].sum()),
+                'levels': {str(level + 1): int(count) for level, count in enumerate(counts[g])}
+            })
+        results.sort(key=lambda r: (r['learning_experience_id'], _sc_sort_key(r['sc_id'])))
+        return results
+    
+    @staticmethod
+    def weekly_growth(columns):
+        """
+        Evidence volume and mean mastery per week, with week-on-week growth
+        
+        Args:
+            columns: EvidenceColumns
+        
+        Returns:
+            List of dicts with week_start, evidence_count, students,
+            mean_mastery and growth (change in mean mastery since the
+            previous week with evidence), in week order
+        """
+        if not len(columns):
+            return []
+        
+        days = columns.dates.astype('datetime64[D]')
+        week = (days - _WEEK_EPOCH).astype(np.int64) // 7
+        weeks, week_code = np.unique(week, return_inverse=True)
+        
+        evidence_count = np.bincount(week_code, minlength=len(weeks))
+        mastery_sum = np.bincount(week_code, weights=columns.mastery, minlength=len(weeks))
+        mean = mastery_sum / evidence_count
+        growth = np.concatenate(([np.nan], np.diff(mean)))
+        
+        # Distinct students per week
+        pairs = np.unique(week_code * len(columns.student_ids) + columns.student)
+        students = np.bincount(pairs // len(columns.student_ids), minlength=len(weeks))
+        
+        week_starts = _WEEK_EPOCH + weeks * 7
+        return [
+            {
+                'week_start': str(week_starts[i]),
+                'evidence_count': int(evidence_count[i]),
+                'students': int(students[i]),
+                'mean_mastery': round(float(mean[i]), 3),
+                'growth': None if np.isnan(growth[i]) else round(float(growth[i]), 3)
+            }
+            for i in range(len(weeks))
+        ]
+    
+    @staticmethod
+    def trends(columns):
+        """
+        Apply the progress trend rule to every (student, LE) pair at once
+        
+        Matches StudentProgressService: the mean mastery of each pair's
+        TREND_WINDOW most recent evidence is compared with the mean of the
+        older evidence.
+        
+        Args:
+            columns: EvidenceColumns
+        
+        Returns:
+            Dictionary with the cohort totals ({trend: pair count}) and
+            by_learning_experience ({le_id: {trend: pair count}})
+        """
+        empty = {'improving': 0, 'stable': 0, 'declining': 0}
+        if not len(columns):
+            return {'totals': dict(empty), 'by_learning_experience': {}}
+        
+        window = StudentProgressService.TREND_WINDOW
+        pair = columns.le * len(columns.student_ids) + columns.student
+        
+        # Newest first within each pair (ties broken by evidence ID, like the trend window)
+        order = np.lexsort((columns.evidence_ids, columns.dates, -pair))[::-1]
+        sorted_pair = pair[order]
+        starts = _group_starts(sorted_pair)
+        group = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(order))))
+        rank = np.arange(len(order)) - starts[group]
+        
+        mastery = columns.mastery[order]
+        recent = rank < window
+        total = np.bincount(group, weights=mastery).astype(np.int64)
+        count = np.bincount(group)
+        recent_total = np.bincount(group, weights=mastery * recent).astype(np.int64)
+        recent_count = np.minimum(count, window)
+        older_count = count - recent_count
+        
+        # Compare averages without floating point, as update_progress does
+        recent_weighted = recent_total * older_count
+        older_weighted = (total - recent_total) * recent_count
+        trend = np.where(
+            older_count == 0, 1,
+            np.where(recent_weighted > older_weighted, 0, np.where(recent_weighted < older_weighted, 2, 1))
+        )
+        
+        names = ('improving', 'stable', 'declining')
+        group_le = sorted_pair[starts] // len(columns.student_ids)
+        by_le = np.bincount(group_le * 3 + trend, minlength=len(columns.le_ids) * 3).reshape(-1, 3)
+        totals = by_le.sum(axis=0)
+        
+        return {
+            'totals': {name: int(totals[i]) for i, name in enumerate(names)},
+            'by_learning_experience': {
+                columns.le_ids[le_code]: {name: int(by_le[le_code, i]) for i, name in enumerate(names)}
+                for le_code in np.unique(group_le)
+            }
+        }
+
+def _sc_sort_key(sc_id):
+    """SC IDs are list indexes stored as strings; order them numerically"""
+    return (0, int(sc_id), '') if sc_id.isdigit() else (1, 0, sc_id)
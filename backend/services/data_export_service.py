@@ -0,0 +1,262 @@
+"""
+Data Export Service - stream evidence, progress and lessons as CSV, NDJSON,
+Parquet or Arrow
+Rows are read through a server-side cursor in fixed-size batches and each
+batch is encoded and yielded before the next is fetched, so memory stays
+flat however many rows are exported
+"""
+from flask import current_app
+from backend.core.database import db
+from backend.core.serialization import serializer_for
+from backend.models.evidence import Evidence
+from backend.models.learning_experience import LearningExperience
+from backend.models.lesson import Lesson
+from backend.models.student_progress import StudentProgress
+from backend.utils.streams import ChunkSink
+from datetime import datetime
+from sqlalchemy import Boolean, DateTime, Float, Integer
+import csv
+import io
+import json
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional - only needed for the columnar formats
+    pa = pq = None
+
+class DataExportService:
+    """Service for streaming bulk exports"""
+    
+    FORMATS = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+        'parquet': 'application/vnd.apache.parquet',
+        'arrow': 'application/vnd.apache.arrow.stream'
+    }
+    
+    # Formats written column-wise with pyarrow
+    COLUMNAR_FORMATS = ('parquet', 'arrow')
+    
+    DATASETS = ('evidence', 'progress', 'lessons')
+    
+    # Rows fetched from the cursor (and encoded) per batch
+    DEFAULT_BATCH_SIZE = 1000
+    
+    # Rows per Parquet row group / Arrow record batch; larger batches compress better
+    DEFAULT_COLUMNAR_BATCH_SIZE = 10000
+    
+    @staticmethod
+    def columnar_available():
+        """Whether pyarrow is installed for the Parquet and Arrow formats"""
+        return pa is not None
+    
+    @staticmethod
+    def build_query(dataset, teacher_id, learning_experience_id=None, date_from=None, date_to=None):
+        """
+        SELECT of every column of a dataset, scoped to a teacher
+        
+        Args:
+            dataset: 'evidence', 'progress' or 'lessons'
+            teacher_id: ID of teacher
+            learning_experience_id: Only rows for this LE
+            date_from: Only rows dated on or after this datetime
+            date_to: Only rows dated before this datetime
+        
+        Returns:
+            Tuple of (query, model class)
+        
+        Dates are the observation date for evidence, the scheduled date for
+        lessons and the last evidence date for progress.
+        """
+        if dataset == 'evidence':
+            model, date_column = Evidence, Evidence.observation_date
+            query = serializer_for(Evidence).select().where(Evidence.teacher_id == teacher_id)
+            order_by = (Evidence.observation_date, Evidence.id)
+        elif dataset == 'lessons':
+            model, date_column = Lesson, Lesson.date_scheduled
+            query = serializer_for(Lesson).select().where(Lesson.teacher_id == teacher_id)
+            order_by = (Lesson.date_scheduled, Lesson.id)
+        elif dataset == 'progress':
+            model, date_column = StudentProgress, StudentProgress.last_evidence_date
+            query = (
+                serializer_for(StudentProgress).select()
+                .join(LearningExperience, LearningExperience.id == StudentProgress.learning_experience_id)
+                .where(LearningExperience.teacher_id == teacher_id)
+            )
+            order_by = (StudentProgress.learning_experience_id, StudentProgress.student_id, StudentProgress.id)
+        else:
+            raise ValueError(f'Unknown dataset: {dataset}')
+        
+        if learning_experience_id:
+            query = query.where(model.learning_experience_id == learning_experience_id)
+        if date_from:
+            query = query.where(date_column >= date_from)
+        if date_to:
+            query = query.where(date_column < date_to)
+        
+        return query.order_by(*order_by), model
+    
+    @staticmethod
+    def stream(query, model_class, fmt, batch_size=None):
+        """
+        Generate an export body chunk by chunk
+        
+        Args:
+            query: Select from build_query
+            model_class: Model class whose columns the query selects
+            fmt: 'csv', 'ndjson', 'parquet' or 'arrow'
+            batch_size: Rows per fetch/chunk (default EXPORT_BATCH_SIZE, or
+                EXPORT_COLUMNAR_BATCH_SIZE for Parquet and Arrow)
+        
+        Yields:
+            Encoded chunks (bytes), one per batch, plus a CSV header chunk
+            or a Parquet/Arrow footer chunk
+        """
+        if fmt in DataExportService.COLUMNAR_FORMATS:
+            batch_size = batch_size or current_app.config.get(
+                'EXPORT_COLUMNAR_BATCH_SIZE', DataExportService.DEFAULT_COLUMNAR_BATCH_SIZE
+            )
+        else:
+            batch_size = batch_size or current_app.config.get('EXPORT_BATCH_SIZE', DataExportService.DEFAULT_BATCH_SIZE)
+        
+        result = db.session.execute(query, execution_options={'yield_per': batch_size})
+        try:
+            if fmt in DataExportService.COLUMNAR_FORMATS:
+                yield from DataExportService._columnar_chunks(result.partitions(), model_class, fmt)
+                return
+            
+            names = serializer_for(model_class).names
+            if fmt == 'csv':
+                encode = DataExportService._csv_encoder(names)
+                yield encode(None)
+            else:
+                encode = DataExportService._ndjson_encoder(serializer_for(model_class))
+            for rows in result.partitions():
+                yield encode(rows)
+        finally:
+            result.close()
+    
+    @staticmethod
+    def arrow_schema(model_class):
+        """
+        Typed Arrow schema for a model's columns
+        
+        Column types map to their Arrow equivalents (DateTime as timestamp,
+        Integer as int32, text as string), with the per-table overrides in
+        _ARROW_COLUMN_TYPES for mastery levels and success criteria.
+        
+        Args:
+            model_class: Model class to export
+        
+        Returns:
+            pyarrow.Schema in serializer column order
+        """
+        overrides = _arrow_column_types().get(model_class.__tablename__, {})
+        fields = []
+        for column in model_class.__table__.columns:
+            if column.name in overrides:
+                arrow_type = overrides[column.name]
+            elif isinstance(column.type, DateTime):
+                arrow_type = pa.timestamp('us')
+            elif isinstance(column.type, Boolean):
+                arrow_type = pa.bool_()
+            elif isinstance(column.type, Integer):
+                arrow_type = pa.int32()
+            elif isinstance(column.type, Float):
+                arrow_type = pa.float64()
+            else:
+                arrow_type = pa.string()
+            fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+        return pa.schema(fields)
+    
+    @staticmethod
+    def _columnar_chunks(partitions, model_class, fmt):
+        """Write each partition as a Parquet row group or Arrow record batch, draining the output as it goes"""
+        schema = DataExportService.arrow_schema(model_class)
+        converters = _COLUMN_CONVERTERS.get(model_class.__tablename__, {})
+        sink = ChunkSink()
+        if fmt == 'parquet':
+            writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+        
+        for rows in partitions:
+            columns = list(zip(*rows))
+            arrays = []
+            for field, values in zip(schema, columns):
+                convert = converters.get(field.name)
+                arrays.append(pa.array(convert(values) if convert else values, type=field.type))
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+        
+        writer.close()
+        yield sink.drain()
+    
+    @staticmethod
+    def _csv_encoder(names):
+        """Encoder writing the header (rows=None) or a batch of rows as CSV"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        def cell(value):
+            if value is None:
+                return ''
+            if isinstance(value, datetime):
+                return value.isoformat()
+            if isinstance(value, (list, dict)):
+                return json.dumps(value)
+            return value
+        
+        def encode(rows):
+            buffer.seek(0)
+            buffer.truncate()
+            if rows is None:
+                writer.writerow(names)
+            else:
+                writer.writerows([cell(value) for value in row] for row in rows)
+            return buffer.getvalue().encode('utf-8')
+        return encode
+    
+    @staticmethod
+    def _ndjson_encoder(serializer):
+        """Encoder writing a batch of rows as newline-delimited JSON objects"""
+        dumps = current_app.json.dumps
+        
+        def encode(rows):
+            return ''.join(dumps(row) + '\n' for row in serializer.serialize_many(rows)).encode('utf-8')
+        return encode
+
+def _sc_index(sc_id):
+    """SC IDs are list indexes stored as strings; legacy non-numeric IDs export as null"""
+    sc_id = str(sc_id)
+    return int(sc_id) if sc_id.isdigit() else None
+
+def _sc_id_lists(values):
+    return [[_sc_index(sc_id) for sc_id in value] if isinstance(value, list) else None for value in values]
+
+def _sc_status_maps(values):
+    return [
+        [(int(sc_id), status) for sc_id, status in value.items() if str(sc_id).isdigit()]
+        if isinstance(value, dict) else None
+        for value in values
+    ]
+
+# Column values that need reshaping into their Arrow type
+_COLUMN_CONVERTERS = {
+    'evidence': {'success_criteria_ids': _sc_id_lists},
+    'student_progress': {'success_criteria_status': _sc_status_maps}
+}
+
+def _arrow_column_types():
+    """Arrow types for columns whose SQL type is wider or untyped (JSON)"""
+    return {
+        'evidence': {
+            'mastery_level': pa.int8(),
+            'success_criteria_ids': pa.list_(pa.int32())
+        },
+        'student_progress': {
+            'mastery_level': pa.int8(),
+            'success_criteria_status': pa.map_(pa.int32(), pa.string())
+        }
+    }
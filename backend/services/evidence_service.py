@@ -1,14 +1,57 @@
 """Evidence Service - business logic for tracking student evidence"""
 from backend.core.database import db
+from backend.core.read_cache import read_cache, ReadCache
+from backend.core.serialization import serializer_for
+from backend.utils.helpers import keyset_paginate, page_results, DEFAULT_PAGE_SIZE
 from backend.models.evidence import Evidence
 from backend.models.student_progress import StudentProgress
 from backend.models.learning_experience import LearningExperience
+from backend.models.tombstone import Tombstone
+from backend.services.student_progress_service import StudentProgressService
+from backend.core.types import json_array_elements
+from backend.core import search
+from sqlalchemy import String, cast, distinct, func, insert, select, true
 from datetime import datetime
-import json
+import uuid
 
 class EvidenceService:
     """Service for logging and managing evidence"""
     
+    # Largest number of observations accepted in one batch
+    MAX_BATCH_SIZE = 100
+    
+    REQUIRED_FIELDS = ['student_id', 'learning_experience_id', 'observation_text', 'mastery_level']
+    
+    # Keyset pagination sort key (listed newest first)
+    PAGE_ORDER = (Evidence.observation_date, Evidence.id)
+    
+    @staticmethod
+    def validate_observation(data):
+        """
+        Validate a single observation payload
+        
+        Args:
+            data: Dictionary of observation fields
+        
+        Returns:
+            Error message, or None if valid
+        """
+        if not isinstance(data, dict):
+            return 'Observation must be an object'
+        
+        for field in EvidenceService.REQUIRED_FIELDS:
+            if field not in data:
+                return f'Missing required field: {field}'
+        
+        if data['mastery_level'] not in [1, 2, 3, 4]:
+            return 'Mastery level must be 1-4'
+        
+        sc_ids = data.get('success_criteria_ids')
+        if sc_ids is not None and not isinstance(sc_ids, list):
+            return 'success_criteria_ids must be a list'
+        
+        return None
+    
     @staticmethod
     def log_evidence(teacher_id, student_id, learning_experience_id, observation_text, 
                     mastery_level, success_criteria_ids=None, lesson_id=None, 
@@ -46,13 +89,78 @@ class EvidenceService:
             evidence.set_success_criteria_ids(success_criteria_ids)
         
         db.session.add(evidence)
-        db.session.commit()
+        db.session.flush()
+        read_cache.invalidate_on_commit(ReadCache.tag('evidence', teacher_id))
         
-        # Update student progress
-        StudentProgressService.update_progress(student_id, learning_experience_id)
+        # Apply the new evidence to student progress (commits both)
+        StudentProgressService.record_evidence_added(evidence)
         
         return evidence
     
+    @staticmethod
+    def log_evidence_batch(teacher_id, observations):
+        """
+        Log a round of observations in a single transaction
+        
+        All observations are validated before anything is written. Rows are
+        inserted with one bulk insert and progress is updated once per
+        distinct (student, LE) pair.
+        
+        Args:
+            teacher_id: ID of teacher logging evidence
+            observations: List of observation dicts (same fields as log_evidence)
+        
+        Returns:
+            Tuple of (results, ok). results has one entry per observation in
+            input order, with 'evidence' on success or 'error' on failure.
+            When ok is False nothing was written.
+        """
+        errors = [EvidenceService.validate_observation(obs) for obs in observations]
+        if any(errors):
+            results = [
+                {'index': i, 'error': error} if error else {'index': i}
+                for i, error in enumerate(errors)
+            ]
+            return results, False
+        
+        observation_date = datetime.utcnow()
+        rows = []
+        for obs in observations:
+            sc_ids = obs.get('success_criteria_ids')
+            rows.append({
+                'id': str(uuid.uuid4()),
+                'teacher_id': teacher_id,
+                'student_id': obs['student_id'],
+                'learning_experience_id': obs['learning_experience_id'],
+                'lesson_id': obs.get('lesson_id'),
+                'observation_date': observation_date,
+                'observation_text': obs['observation_text'],
+                'mastery_level': obs['mastery_level'],
+                'success_criteria_ids': list(sc_ids) if sc_ids else None,
+                'attachment_url': obs.get('attachment_url'),
+                'notes': obs.get('notes')
+            })
+        
+        try:
+            db.session.execute(insert(Evidence), rows)
+            
+            ids = [row['id'] for row in rows]
+            by_id = {e.id: e for e in Evidence.query.filter(Evidence.id.in_(ids)).all()}
+            evidence_list = [by_id[evidence_id] for evidence_id in ids]
+            
+            StudentProgressService.record_evidence_batch(evidence_list, commit=False)
+            read_cache.invalidate_on_commit(ReadCache.tag('evidence', teacher_id))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        results = [
+            {'index': i, 'evidence': evidence.to_dict()}
+            for i, evidence in enumerate(evidence_list)
+        ]
+        return results, True
+    
     @staticmethod
     def get_evidence(evidence_id):
         """Get evidence by ID"""
@@ -63,6 +171,21 @@ class EvidenceService:
         """Get all evidence for a student"""
         return Evidence.find_by_student(student_id)
     
+    @staticmethod
+    def get_student_evidence_page(student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Get one page of a student's evidence, newest first, as Core rows
+        
+        Args:
+            student_id: ID of student
+            cursor: Cursor from the previous page
+            limit: Page size
+        
+        Returns:
+            Tuple of (rows, next_cursor)
+        """
+        return EvidenceService._evidence_page(Evidence.student_id == student_id, cursor, limit)
+    
     @staticmethod
     def get_student_le_evidence(student_id, learning_experience_id):
         """Get evidence for student on specific LE"""
@@ -73,6 +196,90 @@ class EvidenceService:
         """Get all evidence logged by teacher"""
         return Evidence.find_by_teacher(teacher_id)
     
+    @staticmethod
+    def get_teacher_evidence_page(teacher_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Get one page of evidence logged by a teacher, newest first, as Core rows
+        
+        Returns:
+            Tuple of (rows, next_cursor)
+        """
+        return EvidenceService._evidence_page(Evidence.teacher_id == teacher_id, cursor, limit)
+    
+    @staticmethod
+    def _evidence_page(condition, cursor, limit):
+        """Keyset page of evidence matching a condition"""
+        query = keyset_paginate(
+            serializer_for(Evidence).select().where(condition),
+            EvidenceService.PAGE_ORDER, cursor, limit, descending=True
+        )
+        return page_results(db.session.execute(query).all(), EvidenceService.PAGE_ORDER, limit)
+    
+    @staticmethod
+    def search_evidence(teacher_id, text, student_id=None, learning_experience_id=None,
+                        cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Full-text search of a teacher's evidence, best matches first
+        
+        Args:
+            teacher_id: ID of teacher who logged the evidence
+            text: Search words and "quoted phrases" (all must match)
+            student_id: Only this student's evidence
+            learning_experience_id: Only evidence for this LE
+            cursor: Cursor from the previous page
+            limit: Page size
+        
+        Returns:
+            Tuple of (rows, next_cursor); rows are evidence columns plus rank
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        condition, rank, join = search.match(text, db.engine.dialect)
+        query = serializer_for(Evidence).select().add_columns(rank.label('rank'))
+        if join is not None:
+            query = query.join(*join)
+        query = query.where(condition, Evidence.teacher_id == teacher_id)
+        if student_id:
+            query = query.where(Evidence.student_id == student_id)
+        if learning_experience_id:
+            query = query.where(Evidence.learning_experience_id == learning_experience_id)
+        
+        # Rank is computed, so page over it from a subquery
+        ranked = query.subquery()
+        order = (ranked.c.rank, ranked.c.id)
+        page = keyset_paginate(select(ranked), order, cursor, limit, descending=True)
+        return page_results(db.session.execute(page).all(), order, limit)
+    
+    @staticmethod
+    def get_sc_evidence_counts(learning_experience_id, student_id=None):
+        """
+        Count evidence demonstrating each success criterion, in one aggregate query
+        
+        Args:
+            learning_experience_id: ID of LE
+            student_id: Only count this student's evidence, if given
+        
+        Returns:
+            Dictionary of {sc_id: {'evidence_count': n, 'student_count': m}}
+        """
+        elements = json_array_elements(Evidence.success_criteria_ids, db.engine.dialect)
+        sc_id = cast(elements.c.value, String)
+        query = (
+            select(sc_id, func.count(), func.count(distinct(Evidence.student_id)))
+            .select_from(Evidence)
+            .join(elements, true())
+            .where(Evidence.learning_experience_id == learning_experience_id)
+            .group_by(sc_id)
+        )
+        if student_id:
+            query = query.where(Evidence.student_id == student_id)
+        
+        return {
+            key: {'evidence_count': evidence_count, 'student_count': student_count}
+            for key, evidence_count, student_count in db.session.execute(query)
+        }
+    
     @staticmethod
     def update_evidence(evidence_id, **kwargs):
         """Update an evidence entry"""
@@ -80,14 +287,19 @@ class EvidenceService:
         if not evidence:
             return None
         
+        before = StudentProgressService.snapshot(evidence)
+        
         for key, value in kwargs.items():
-            if hasattr(evidence, key):
+            if key == 'success_criteria_ids' and isinstance(value, list):
+                evidence.set_success_criteria_ids(value)
+            elif hasattr(evidence, key):
                 setattr(evidence, key, value)
         
-        db.session.commit()
+        db.session.flush()
+        read_cache.invalidate_on_commit(ReadCache.tag('evidence', evidence.teacher_id))
         
-        # Update progress after change
-        StudentProgressService.update_progress(evidence.student_id, evidence.learning_experience_id)
+        # Swap the old values for the new ones in progress (commits both)
+        StudentProgressService.record_evidence_changed(before, evidence)
         
         return evidence
     
@@ -98,13 +310,14 @@ class EvidenceService:
         if not evidence:
             return None
         
-        student_id = evidence.student_id
-        le_id = evidence.learning_experience_id
+        snap = StudentProgressService.snapshot(evidence)
         
         db.session.delete(evidence)
-        db.session.commit()
+        db.session.flush()
+        Tombstone.record(evidence.teacher_id, 'evidence', [evidence.id])
+        read_cache.invalidate_on_commit(ReadCache.tag('evidence', evidence.teacher_id))
         
-        # Recalculate progress after deletion
-        StudentProgressService.update_progress(student_id, le_id)
+        # Remove the deleted evidence from progress (commits both)
+        StudentProgressService.record_evidence_removed(snap)
         
         return True
@@ -0,0 +1,55 @@
+"""Generation Jobs - background job handlers for worksheet and support file generation"""
+from backend.core.events import event_broker
+from backend.services.worksheet_service import WorksheetService
+from backend.services.support_files_service import SupportFilesService
+
+# Job types for the single-document support file endpoints
+SUPPORT_FILE_JOBS = {
+    'teacher_guide': SupportFilesService.generate_teacher_guide,
+    'answer_sheet': SupportFilesService.generate_answer_sheet,
+    'exemplar': SupportFilesService.generate_exemplar
+}
+
+def generate_worksheets_job(lesson_id):
+    """Generate all four tiered worksheets for a lesson"""
+    worksheets = WorksheetService.generate_worksheets(lesson_id)
+    if not worksheets:
+        raise ValueError('Failed to generate worksheets')
+    
+    return {
+        'worksheets': {
+            tier: ws.to_dict() for tier, ws in worksheets.items()
+        }
+    }
+
+def generate_support_files_job(lesson_id, document=None, output_dir='/tmp'):
+    """Generate all support files, or a single document when one is named"""
+    if document is None:
+        return {'files': SupportFilesService.generate_all(lesson_id, output_dir=output_dir)}
+    
+    result = SUPPORT_FILE_JOBS[document](lesson_id, output_dir=output_dir)
+    if not result:
+        raise ValueError(f'Failed to generate {document.replace("_", " ")}')
+    return {'file': result}
+
+def publish_job_finished(job):
+    """Tell the owner's open event streams that a generation job finished"""
+    if not job.get('teacher_id') or job['type'] not in ('generate_worksheets', 'generate_support_files'):
+        return
+    
+    # The result stays behind GET /jobs/<id>; streams only carry the outcome
+    event_broker.publish(job['teacher_id'], 'job', {
+        'id': job['id'],
+        'type': job['type'],
+        'status': job['status'],
+        'lesson_id': job['payload'].get('lesson_id'),
+        'document': job['payload'].get('document'),
+        'error': job['error'],
+        'finished_at': job['finished_at']
+    })
+
+def register_jobs(queue):
+    """Register generation handlers with the job queue"""
+    queue.register('generate_worksheets', generate_worksheets_job)
+    queue.register('generate_support_files', generate_support_files_job)
+    queue.on_finished(publish_job_finished)
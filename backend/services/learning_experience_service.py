@@ -1,7 +1,7 @@
 """Learning Experience Service"""
 from backend.core.database import db
 from backend.models.learning_experience import LearningExperience
-import json
+from backend.core.read_cache import read_cache, ReadCache
 
 class LearningExperienceService:
     """Service for managing Learning Experiences"""
@@ -12,10 +12,6 @@ class LearningExperienceService:
                   nesa_outcome_code=None, duration_minutes=60):
         """Create a new Learning Experience"""
         
-        # Convert success criteria to JSON if it's a list
-        if isinstance(success_criteria, list):
-            success_criteria = json.dumps(success_criteria)
-        
         le = LearningExperience(
             teacher_id=teacher_id,
             unit_number=unit_number,
@@ -30,6 +26,7 @@ class LearningExperienceService:
         )
         
         db.session.add(le)
+        read_cache.invalidate_on_commit(ReadCache.tag('les', teacher_id))
         db.session.commit()
         return le
     
@@ -55,14 +52,11 @@ class LearningExperienceService:
         if not le:
             return None
         
-        # Handle success criteria conversion
-        if 'success_criteria' in kwargs and isinstance(kwargs['success_criteria'], list):
-            kwargs['success_criteria'] = json.dumps(kwargs['success_criteria'])
-        
         for key, value in kwargs.items():
             if hasattr(le, key):
                 setattr(le, key, value)
         
+        read_cache.invalidate_on_commit(ReadCache.tag('les', le.teacher_id))
         db.session.commit()
         return le
     
@@ -74,6 +68,7 @@ class LearningExperienceService:
             return False
         
         le.is_active = False
+        read_cache.invalidate_on_commit(ReadCache.tag('les', le.teacher_id))
         db.session.commit()
         return True
     
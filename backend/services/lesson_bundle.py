@@ -0,0 +1,89 @@
+"""Lesson Bundle - immutable snapshot of the rows a lesson's documents are built from"""
+from backend.models.lesson import Lesson
+from backend.models.learning_experience import LearningExperience
+from backend.services.worksheet_service import WorksheetService
+from backend.core.serialization import serializer_for
+from collections import namedtuple
+import inspect
+import types
+
+class RecordSnapshot:
+    """Read-only copy of a model row, detached from the database session"""
+    __slots__ = ('_model_class', '_values')
+    
+    def __init__(self, model):
+        object.__setattr__(self, '_model_class', type(model))
+        object.__setattr__(self, '_values', {
+            column.name: getattr(model, column.name) for column in model.__table__.columns
+        })
+    
+    def __getattr__(self, name):
+        values = object.__getattribute__(self, '_values')
+        if name in values:
+            return values[name]
+        
+        # Fall back to the model class so read-only helpers such as
+        # get_success_criteria_list() and to_dict() keep working
+        model_class = object.__getattribute__(self, '_model_class')
+        attr = inspect.getattr_static(model_class, name)
+        if isinstance(attr, property):
+            return attr.fget(self)
+        if isinstance(attr, types.FunctionType):
+            return types.MethodType(attr, self)
+        return getattr(model_class, name)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+    
+    def to_dict(self):
+        """Serialize with the model class's compiled serializer"""
+        return serializer_for(self._model_class).serialize_mapping(self._values)
+    
+    def __reduce__(self):
+        return (_restore_snapshot, (self._model_class, self._values))
+    
+    def __repr__(self):
+        return f'<{type(self).__name__} {self._model_class.__name__} {self._values.get("id")}>'
+
+def _restore_snapshot(model_class, values):
+    """Rebuild a RecordSnapshot after pickling"""
+    snapshot = object.__new__(RecordSnapshot)
+    object.__setattr__(snapshot, '_model_class', model_class)
+    object.__setattr__(snapshot, '_values', values)
+    return snapshot
+
+class LessonBundle(namedtuple('LessonBundle', ['lesson', 'learning_experience', 'worksheets', 'questions_by_worksheet'])):
+    """Lesson, LE, worksheets and questions loaded once and shared by every generator"""
+    __slots__ = ()
+    
+    @classmethod
+    def load(cls, lesson_id):
+        """
+        Load and snapshot everything needed to render a lesson's documents
+        
+        Args:
+            lesson_id: ID of lesson
+        
+        Returns:
+            LessonBundle, or None if the lesson or its LE does not exist
+        """
+        lesson = Lesson.query_by_id(lesson_id)
+        if not lesson:
+            return None
+        
+        le = LearningExperience.query_by_id(lesson.learning_experience_id)
+        if not le:
+            return None
+        
+        worksheets = WorksheetService.get_worksheets_by_lesson(lesson_id)
+        questions = WorksheetService.get_questions_for_worksheets([ws.id for ws in worksheets])
+        
+        return cls(
+            lesson=RecordSnapshot(lesson),
+            learning_experience=RecordSnapshot(le),
+            worksheets=tuple(RecordSnapshot(ws) for ws in worksheets),
+            questions_by_worksheet={
+                worksheet_id: tuple(RecordSnapshot(q) for q in qs)
+                for worksheet_id, qs in questions.items()
+            }
+        )
@@ -2,11 +2,18 @@
 from backend.core.database import db
 from backend.models.lesson import Lesson
 from backend.models.learning_experience import LearningExperience
+from backend.models.tombstone import Tombstone
+from backend.core.read_cache import read_cache, ReadCache
+from backend.core.serialization import serializer_for
+from backend.utils.helpers import keyset_paginate, page_results, DEFAULT_PAGE_SIZE
 from datetime import datetime
 
 class LessonService:
     """Service for managing Lessons"""
     
+    # Keyset pagination sort key
+    PAGE_ORDER = (Lesson.date_scheduled, Lesson.id)
+    
     @staticmethod
     def create_lesson(teacher_id, learning_experience_id, week_number, date_scheduled, 
                      duration_minutes=60, location=None, notes=None):
@@ -42,6 +49,7 @@ class LessonService:
         )
         
         db.session.add(lesson)
+        read_cache.invalidate_on_commit(ReadCache.tag('lessons', teacher_id))
         db.session.commit()
         
         return lesson
@@ -61,6 +69,27 @@ class LessonService:
         """Get all lessons for a teacher"""
         return Lesson.find_by_teacher(teacher_id)
     
+    @staticmethod
+    def get_lessons_page(teacher_id, week_number=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Get one page of a teacher's lessons in schedule order, as Core rows
+        
+        Args:
+            teacher_id: ID of teacher
+            week_number: Only published lessons in this week, if given
+            cursor: Cursor from the previous page
+            limit: Page size
+        
+        Returns:
+            Tuple of (rows, next_cursor)
+        """
+        query = serializer_for(Lesson).select().where(Lesson.teacher_id == teacher_id)
+        if week_number:
+            query = query.where(Lesson.week_number == week_number, Lesson.status == 'published')
+        
+        query = keyset_paginate(query, LessonService.PAGE_ORDER, cursor, limit)
+        return page_results(db.session.execute(query).all(), LessonService.PAGE_ORDER, limit)
+    
     @staticmethod
     def get_le_lessons(learning_experience_id):
         """Get all scheduled lessons for a Learning Experience"""
@@ -86,6 +115,7 @@ class LessonService:
             if hasattr(lesson, key) and key != 'status':  # Don't allow direct status change
                 setattr(lesson, key, value)
         
+        read_cache.invalidate_on_commit(ReadCache.tag('lessons', lesson.teacher_id))
         db.session.commit()
         return lesson
     
@@ -96,6 +126,7 @@ class LessonService:
         if not lesson:
             return None
         
+        read_cache.invalidate_on_commit(ReadCache.tag('lessons', lesson.teacher_id))
         lesson.publish()
         return lesson
     
@@ -106,6 +137,7 @@ class LessonService:
         if not lesson:
             return None
         
+        read_cache.invalidate_on_commit(ReadCache.tag('lessons', lesson.teacher_id))
         lesson.mark_taught()
         return lesson
     
@@ -116,6 +148,7 @@ class LessonService:
         if not lesson:
             return None
         
+        read_cache.invalidate_on_commit(ReadCache.tag('lessons', lesson.teacher_id))
         lesson.archive()
         return lesson
     
@@ -127,5 +160,7 @@ class LessonService:
             return None
         
         db.session.delete(lesson)
+        Tombstone.record(lesson.teacher_id, 'lessons', [lesson.id])
+        read_cache.invalidate_on_commit(ReadCache.tag('lessons', lesson.teacher_id))
         db.session.commit()
         return True
@@ -0,0 +1,107 @@
+"""
+Planner Service - a teacher's week in one call
+Reads the week's published lessons with their LEs, worksheet tier summaries
+and evidence counts in a fixed number of queries, however many lessons the
+week holds
+"""
+from backend.core.database import db
+from backend.core.serialization import serializer_for
+from backend.models.evidence import Evidence
+from backend.models.learning_experience import LearningExperience
+from backend.models.lesson import Lesson
+from backend.models.worksheet import Worksheet
+from backend.services.worksheet_service import WorksheetService
+from sqlalchemy import distinct, func, select
+
+class PlannerService:
+    """Service for the weekly planner view"""
+    
+    # Fields of each lesson's LE included in the week
+    LE_FIELDS = (
+        'id', 'unit_number', 'experience_number', 'core_concept', 'learning_intention',
+        'success_criteria', 'subject', 'year_level', 'nesa_outcome_code', 'duration_minutes'
+    )
+    
+    @staticmethod
+    def get_week(teacher_id, week_number):
+        """
+        Published lessons in a week, each with its LE, worksheets and evidence counts
+        
+        Three queries: lessons joined to LEs, worksheet summaries for those
+        lessons and evidence counts for those lessons.
+        
+        Args:
+            teacher_id: ID of teacher
+            week_number: Week number
+        
+        Returns:
+            Dictionary with week_number and lessons in schedule order; each
+            lesson has learning_experience, worksheets (tier, id, title,
+            question_count, has_file, in tier order) and evidence
+            (count, students)
+        """
+        rows = db.session.execute(
+            select(Lesson, LearningExperience)
+            .join(LearningExperience, LearningExperience.id == Lesson.learning_experience_id)
+            .where(
+                Lesson.teacher_id == teacher_id,
+                Lesson.week_number == week_number,
+                Lesson.status == 'published'
+            )
+            .order_by(Lesson.date_scheduled, Lesson.id)
+        ).all()
+        
+        lesson_ids = [lesson.id for lesson, _ in rows]
+        worksheets = PlannerService._worksheet_summaries(lesson_ids)
+        evidence = PlannerService._evidence_counts(lesson_ids)
+        
+        lesson_serializer = serializer_for(Lesson)
+        le_serializer = serializer_for(LearningExperience)
+        lessons = []
+        for lesson, le in rows:
+            entry = lesson_serializer.serialize(lesson)
+            le_data = le_serializer.serialize(le)
+            entry['learning_experience'] = {field: le_data[field] for field in PlannerService.LE_FIELDS}
+            entry['worksheets'] = worksheets.get(lesson.id, [])
+            entry['evidence'] = evidence.get(lesson.id, {'count': 0, 'students': 0})
+            lessons.append(entry)
+        
+        return {'week_number': week_number, 'lessons': lessons}
+    
+    @staticmethod
+    def _worksheet_summaries(lesson_ids):
+        """{lesson_id: [worksheet summary, ...]} in tier order"""
+        if not lesson_ids:
+            return {}
+        
+        tier_order = {tier: i for i, (tier, _) in enumerate(WorksheetService.TIER_QUESTION_COUNTS)}
+        summaries = {}
+        for row in db.session.execute(
+            select(
+                Worksheet.lesson_id, Worksheet.id, Worksheet.tier, Worksheet.title,
+                Worksheet.question_count, Worksheet.file_path.isnot(None)
+            ).where(Worksheet.lesson_id.in_(lesson_ids))
+        ):
+            summaries.setdefault(row[0], []).append({
+                'id': row[1], 'tier': row[2], 'title': row[3],
+                'question_count': row[4], 'has_file': bool(row[5])
+            })
+        for entries in summaries.values():
+            entries.sort(key=lambda entry: tier_order.get(entry['tier'], len(tier_order)))
+        return summaries
+    
+    @staticmethod
+    def _evidence_counts(lesson_ids):
+        """{lesson_id: {'count': evidence rows, 'students': distinct students}}"""
+        if not lesson_ids:
+            return {}
+        
+        query = (
+            select(Evidence.lesson_id, func.count(), func.count(distinct(Evidence.student_id)))
+            .where(Evidence.lesson_id.in_(lesson_ids))
+            .group_by(Evidence.lesson_id)
+        )
+        return {
+            lesson_id: {'count': count, 'students': students}
+            for lesson_id, count, students in db.session.execute(query)
+        }
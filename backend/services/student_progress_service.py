@@ -3,80 +3,395 @@ from backend.core.database import db
 from backend.models.student_progress import StudentProgress
 from backend.models.evidence import Evidence
 from backend.models.learning_experience import LearningExperience
+from backend.models.student import Student
+from backend.core.events import event_broker
+from backend.core.read_cache import read_cache, ReadCache
+from backend.core.serialization import serializer_for
+from backend.core.types import json_member_equals, json_object_members
+from backend.utils.helpers import keyset_paginate, page_results, DEFAULT_PAGE_SIZE
+from sqlalchemy import case, func, select, true
 from datetime import datetime
-import json
 
 class StudentProgressService:
     """Service for tracking and aggregating student progress"""
     
+    # Number of most recent evidence entries compared against older ones for the trend
+    TREND_WINDOW = 3
+    
+    # Keyset pagination sort key for class progress
+    PAGE_ORDER = (StudentProgress.student_id, StudentProgress.id)
+    
+    @staticmethod
+    def snapshot(evidence):
+        """
+        Capture the evidence fields that feed into progress
+        
+        Take the snapshot before changing or deleting the evidence so the
+        old values can be subtracted from the running counters.
+        
+        Args:
+            evidence: Evidence object
+        
+        Returns:
+            Dictionary of the progress-relevant fields
+        """
+        return {
+            'id': evidence.id,
+            'student_id': evidence.student_id,
+            'learning_experience_id': evidence.learning_experience_id,
+            'observation_date': evidence.observation_date,
+            'mastery_level': int(evidence.mastery_level),
+            'success_criteria_ids': sorted({str(sc_id) for sc_id in evidence.get_success_criteria_ids()})
+        }
+    
+    @staticmethod
+    def record_evidence_added(evidence, commit=True):
+        """
+        Apply a newly logged evidence entry to the running counters
+        
+        Args:
+            evidence: Evidence object (already added to the session)
+            commit: Whether to commit the session
+        
+        Returns:
+            Updated StudentProgress object
+        """
+        if evidence.id is None:
+            db.session.flush()
+        
+        snap = StudentProgressService.snapshot(evidence)
+        progress = StudentProgressService._get_or_create(snap['student_id'], snap['learning_experience_id'])
+        
+        if not progress.has_counters:
+            # Legacy row without counters - rebuild from scratch
+            return StudentProgressService.update_progress(
+                snap['student_id'], snap['learning_experience_id'], commit=commit
+            )
+        
+        StudentProgressService._apply_delta(progress, snap, 1)
+        StudentProgressService._refresh_summary(progress)
+        
+        if commit:
+            db.session.commit()
+        return progress
+    
+    @staticmethod
+    def record_evidence_batch(evidence_list, commit=True):
+        """
+        Apply many new evidence entries, touching each progress row once
+        
+        Args:
+            evidence_list: List of Evidence objects (already flushed)
+            commit: Whether to commit the session
+        
+        Returns:
+            Dictionary of (student_id, learning_experience_id) -> StudentProgress
+        """
+        groups = {}
+        for evidence in evidence_list:
+            snap = StudentProgressService.snapshot(evidence)
+            key = (snap['student_id'], snap['learning_experience_id'])
+            groups.setdefault(key, []).append(snap)
+        
+        updated = {}
+        for (student_id, le_id), snaps in groups.items():
+            progress = StudentProgressService._get_or_create(student_id, le_id)
+            
+            if not progress.has_counters:
+                updated[(student_id, le_id)] = StudentProgressService.update_progress(
+                    student_id, le_id, commit=False
+                )
+                continue
+            
+            for snap in snaps:
+                StudentProgressService._apply_delta(progress, snap, 1)
+            StudentProgressService._refresh_summary(progress)
+            updated[(student_id, le_id)] = progress
+        
+        if commit:
+            db.session.commit()
+        return updated
+    
     @staticmethod
-    def update_progress(student_id, learning_experience_id):
+    def record_evidence_removed(snap, commit=True):
+        """
+        Remove a deleted evidence entry from the running counters
+        
+        Args:
+            snap: Snapshot of the evidence taken before deletion
+            commit: Whether to commit the session
+        
+        Returns:
+            Updated StudentProgress object, or None if no progress existed
+        """
+        progress = StudentProgress.find_by_student_and_le(snap['student_id'], snap['learning_experience_id'])
+        if not progress:
+            return None
+        
+        if not progress.has_counters:
+            return StudentProgressService.update_progress(
+                snap['student_id'], snap['learning_experience_id'], commit=commit
+            )
+        
+        StudentProgressService._apply_delta(progress, snap, -1)
+        StudentProgressService._refresh_summary(progress)
+        
+        if commit:
+            db.session.commit()
+        return progress
+    
+    @staticmethod
+    def record_evidence_changed(before, evidence, commit=True):
+        """
+        Apply an edited evidence entry to the running counters
+        
+        Args:
+            before: Snapshot of the evidence taken before the edit
+            evidence: Evidence object after the edit
+            commit: Whether to commit the session
+        
+        Returns:
+            StudentProgress object the evidence now counts towards
+        """
+        pairs = [(before['student_id'], before['learning_experience_id'])]
+        if (evidence.student_id, evidence.learning_experience_id) not in pairs:
+            pairs.append((evidence.student_id, evidence.learning_experience_id))
+        
+        existing = [StudentProgress.find_by_student_and_le(*pair) for pair in pairs]
+        if any(row and not row.has_counters for row in existing):
+            # Legacy row: a recompute already sees the edited evidence, so
+            # applying the remove/add deltas on top would count it twice
+            for pair, row in zip(pairs[:-1], existing[:-1]):
+                if row:
+                    StudentProgressService.update_progress(*pair, commit=False)
+            progress = StudentProgressService.update_progress(*pairs[-1], commit=False)
+        else:
+            StudentProgressService.record_evidence_removed(before, commit=False)
+            progress = StudentProgressService.record_evidence_added(evidence, commit=False)
+        
+        if commit:
+            db.session.commit()
+        return progress
+    
+    @staticmethod
+    def update_progress(student_id, learning_experience_id, commit=True):
         """
         Update student progress by aggregating all evidence
         
+        Full recompute of the running counters. Used for rows created before
+        the counters existed and as a fallback when they are suspect.
+        
         Args:
             student_id: ID of student
             learning_experience_id: ID of LE
+            commit: Whether to commit the session
         
         Returns:
             Updated StudentProgress object
         """
-        # Get or create progress record
+        progress = StudentProgressService._get_or_create(student_id, learning_experience_id)
+        
+        evidence_list = Evidence.find_by_student_and_le(student_id, learning_experience_id)
+        counters = StudentProgressService._aggregate(evidence_list)
+        
+        progress.set_mastery_counts(counters['mastery_counts'])
+        progress.mastery_total = counters['mastery_total']
+        progress.evidence_count = counters['evidence_count']
+        progress.set_success_criteria_hits(counters['success_criteria_hits'])
+        progress.set_trend_window(counters['trend_window'])
+        StudentProgressService._refresh_summary(progress)
+        
+        if commit:
+            db.session.commit()
+        return progress
+    
+    @staticmethod
+    def verify_progress(student_id, learning_experience_id):
+        """
+        Compare the stored running counters against a full recompute
+        
+        Args:
+            student_id: ID of student
+            learning_experience_id: ID of LE
+        
+        Returns:
+            List of counter names that differ (empty when consistent)
+        """
+        progress = StudentProgress.find_by_student_and_le(student_id, learning_experience_id)
+        evidence_list = Evidence.find_by_student_and_le(student_id, learning_experience_id)
+        expected = StudentProgressService._aggregate(evidence_list)
+        
+        if not progress:
+            return [] if not evidence_list else list(expected.keys())
+        
+        stored = {
+            'mastery_counts': progress.get_mastery_counts(),
+            'mastery_total': progress.mastery_total or 0,
+            'evidence_count': progress.evidence_count or 0,
+            'success_criteria_hits': progress.get_success_criteria_hits(),
+            'trend_window': progress.get_trend_window()
+        }
+        return [name for name, value in expected.items() if stored[name] != value]
+    
+    @staticmethod
+    def _get_or_create(student_id, learning_experience_id):
+        """Get or create the progress record for a student on a LE"""
         progress = StudentProgress.find_by_student_and_le(student_id, learning_experience_id)
         if not progress:
             progress = StudentProgress(
                 student_id=student_id,
-                learning_experience_id=learning_experience_id
+                learning_experience_id=learning_experience_id,
+                mastery_total=0,
+                evidence_count=0
             )
+            progress.set_mastery_counts({})
+            progress.set_success_criteria_hits({})
+            progress.set_trend_window([])
             db.session.add(progress)
+        return progress
+    
+    @staticmethod
+    def _window_entry(snap):
+        """Build a trend window entry from an evidence snapshot"""
+        return [snap['observation_date'].isoformat(), snap['mastery_level'], snap['id']]
+    
+    @staticmethod
+    def _aggregate(evidence_list):
+        """
+        Build running counters from a full list of evidence
         
-        # Get all evidence
-        evidence_list = Evidence.find_by_student_and_le(student_id, learning_experience_id)
+        Args:
+            evidence_list: List of Evidence objects for one student and LE
         
-        if not evidence_list:
-            db.session.commit()
-            return progress
+        Returns:
+            Dictionary of counter values
+        """
+        mastery_counts = {}
+        sc_hits = {}
+        window = []
         
-        # Calculate mastery level (take highest)
-        mastery_levels = [e.mastery_level for e in evidence_list]
-        progress.mastery_level = max(mastery_levels)
-        progress.evidence_count = len(evidence_list)
-        progress.last_evidence_date = evidence_list[0].observation_date
+        for evidence in evidence_list:
+            snap = StudentProgressService.snapshot(evidence)
+            level = str(snap['mastery_level'])
+            mastery_counts[level] = mastery_counts.get(level, 0) + 1
+            for sc_id in snap['success_criteria_ids']:
+                sc_hits[sc_id] = sc_hits.get(sc_id, 0) + 1
+            window.append(StudentProgressService._window_entry(snap))
         
-        # Get LE to find success criteria
-        le = LearningExperience.query_by_id(learning_experience_id)
+        window.sort(key=lambda w: (w[0], w[2]), reverse=True)
+        
+        return {
+            'mastery_counts': mastery_counts,
+            'mastery_total': sum(e.mastery_level for e in evidence_list),
+            'evidence_count': len(evidence_list),
+            'success_criteria_hits': sc_hits,
+            'trend_window': window[:StudentProgressService.TREND_WINDOW]
+        }
+    
+    @staticmethod
+    def _apply_delta(progress, snap, sign):
+        """
+        Add (sign=1) or subtract (sign=-1) one evidence entry from the counters
+        
+        Args:
+            progress: StudentProgress object
+            snap: Evidence snapshot
+            sign: 1 for insert, -1 for delete
+        """
+        level = str(snap['mastery_level'])
+        counts = progress.get_mastery_counts()
+        counts[level] = counts.get(level, 0) + sign
+        if counts[level] <= 0:
+            del counts[level]
+        progress.set_mastery_counts(counts)
+        
+        progress.mastery_total = (progress.mastery_total or 0) + sign * snap['mastery_level']
+        progress.evidence_count = (progress.evidence_count or 0) + sign
+        
+        hits = progress.get_success_criteria_hits()
+        for sc_id in snap['success_criteria_ids']:
+            hits[sc_id] = hits.get(sc_id, 0) + sign
+            if hits[sc_id] <= 0:
+                del hits[sc_id]
+        progress.set_success_criteria_hits(hits)
+        
+        window = progress.get_trend_window()
+        remaining = [w for w in window if w[2] != snap['id']]
+        
+        if sign > 0:
+            remaining.append(StudentProgressService._window_entry(snap))
+            remaining.sort(key=lambda w: (w[0], w[2]), reverse=True)
+            window = remaining[:StudentProgressService.TREND_WINDOW]
+        elif len(remaining) != len(window):
+            # An entry left the window - refill it with a bounded query
+            db.session.flush()
+            recent = Evidence.find_recent_by_student_and_le(
+                progress.student_id, progress.learning_experience_id,
+                StudentProgressService.TREND_WINDOW
+            )
+            window = [
+                StudentProgressService._window_entry(StudentProgressService.snapshot(e))
+                for e in recent
+            ]
+        
+        progress.set_trend_window(window)
+    
+    @staticmethod
+    def _refresh_summary(progress):
+        """Derive mastery level, SC status, last date and trend from the counters"""
+        read_cache.invalidate_on_commit(
+            ReadCache.tag('progress', progress.learning_experience_id), ReadCache.tag('student', progress.student_id)
+        )
+        
+        counts = progress.get_mastery_counts()
+        progress.mastery_level = max((int(level) for level in counts), default=1)
+        
+        window = progress.get_trend_window()
+        progress.last_evidence_date = datetime.fromisoformat(window[0][0]) if window else None
+        
+        # Success criteria are identified by their index in the LE's list
+        le = LearningExperience.query_by_id(progress.learning_experience_id)
         if le:
-            sc_list = le.get_success_criteria_list()
+            hits = progress.get_success_criteria_hits()
             sc_status = {}
-            
-            # Check if each SC was demonstrated
-            for i, sc in enumerate(sc_list):
-                sc_id = str(i)  # Use index as ID
-                demonstrated = any(
-                    sc_id in e.get_success_criteria_ids() for e in evidence_list
-                )
-                sc_status[sc_id] = 'met' if demonstrated else 'not_met'
-            
+            for i, sc in enumerate(le.get_success_criteria_list()):
+                sc_id = str(i)
+                sc_status[sc_id] = 'met' if hits.get(sc_id) else 'not_met'
             progress.set_success_criteria_status(sc_status)
+            progress.success_criteria_met = sum(1 for status in sc_status.values() if status == 'met')
+            progress.success_criteria_total = len(sc_status)
+            read_cache.invalidate_on_commit(ReadCache.tag('matrix', le.teacher_id))
         
         # Calculate trend (comparing recent vs older evidence)
-        if len(evidence_list) >= 2:
-            recent_levels = [e.mastery_level for e in evidence_list[:3]]
-            older_levels = [e.mastery_level for e in evidence_list[3:]]
+        older_count = (progress.evidence_count or 0) - len(window)
+        if older_count > 0:
+            recent_total = sum(w[1] for w in window)
+            older_total = (progress.mastery_total or 0) - recent_total
             
-            if older_levels:
-                recent_avg = sum(recent_levels) / len(recent_levels)
-                older_avg = sum(older_levels) / len(older_levels)
-                
-                if recent_avg > older_avg:
-                    progress.trend = 'improving'
-                elif recent_avg < older_avg:
-                    progress.trend = 'declining'
-                else:
-                    progress.trend = 'stable'
-        
-        db.session.commit()
-        return progress
+            # Compare averages without floating point: recent/len(window) vs older/older_count
+            recent_weighted = recent_total * older_count
+            older_weighted = older_total * len(window)
+            
+            if recent_weighted > older_weighted:
+                progress.trend = 'improving'
+            elif recent_weighted < older_weighted:
+                progress.trend = 'declining'
+            else:
+                progress.trend = 'stable'
+        else:
+            progress.trend = 'stable'
+        
+        if le:
+            event_broker.publish_on_commit(le.teacher_id, 'progress', {
+                'student_id': progress.student_id,
+                'learning_experience_id': progress.learning_experience_id,
+                'mastery_level': progress.mastery_level,
+                'trend': progress.trend,
+                'evidence_count': progress.evidence_count,
+                'success_criteria_met': progress.success_criteria_met,
+                'success_criteria_total': progress.success_criteria_total,
+                'last_evidence_date': progress.last_evidence_date.isoformat() if progress.last_evidence_date else None
+            }, key=(progress.student_id, progress.learning_experience_id))
     
     @staticmethod
     def get_progress(student_id, learning_experience_id):
@@ -92,3 +407,164 @@ class StudentProgressService:
     def get_class_progress(learning_experience_id):
         """Get progress for all students on a LE"""
         return StudentProgress.query.filter_by(learning_experience_id=learning_experience_id).all()
+    
+    @staticmethod
+    def get_class_progress_page(learning_experience_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Get one page of class progress on a LE, ordered by student, as Core rows
+        
+        Returns:
+            Tuple of (rows, next_cursor)
+        """
+        query = keyset_paginate(
+            serializer_for(StudentProgress).select()
+            .where(StudentProgress.learning_experience_id == learning_experience_id),
+            StudentProgressService.PAGE_ORDER, cursor, limit
+        )
+        return page_results(db.session.execute(query).all(), StudentProgressService.PAGE_ORDER, limit)
+    
+    @staticmethod
+    def get_unit_matrix(teacher_id, unit_number):
+        """
+        Get the students x Learning Experiences mastery matrix for a unit
+        
+        Reads the incrementally maintained student_progress aggregate in one
+        query (LEs left-joined to progress and student names), whatever the
+        class size, and lays it out column-wise: one list per LE attribute,
+        one list per student attribute, and one row per student in each
+        matrix with None where the student has no evidence on that LE.
+        
+        Args:
+            teacher_id: ID of teacher who owns the unit
+            unit_number: Unit number
+        
+        Returns:
+            Dictionary with unit_number, learning_experiences, students and
+            mastery_level / success_criteria_met / evidence_count / trend matrices
+        """
+        progress_with_students = StudentProgress.__table__.join(
+            Student.__table__, Student.id == StudentProgress.student_id
+        )
+        query = (
+            select(
+                LearningExperience.id, LearningExperience.experience_number,
+                LearningExperience.core_concept, LearningExperience.success_criteria,
+                Student.id, Student.first_name, Student.last_name,
+                StudentProgress.mastery_level, StudentProgress.success_criteria_met,
+                StudentProgress.evidence_count, StudentProgress.trend
+            )
+            .select_from(LearningExperience)
+            .outerjoin(progress_with_students, StudentProgress.learning_experience_id == LearningExperience.id)
+            .where(
+                LearningExperience.teacher_id == teacher_id,
+                LearningExperience.unit_number == unit_number,
+                LearningExperience.is_active == True
+            )
+            .order_by(LearningExperience.experience_number, LearningExperience.id)
+        )
+        
+        les = {}
+        students = {}
+        cells = {}
+        for (le_id, experience_number, core_concept, criteria, student_id, first_name, last_name,
+             mastery_level, sc_met, evidence_count, trend) in db.session.execute(query):
+            if le_id not in les:
+                les[le_id] = (experience_number, core_concept, len(criteria) if isinstance(criteria, list) else 1)
+            if student_id is not None:
+                students[student_id] = (last_name, first_name)
+                cells[student_id, le_id] = (mastery_level, sc_met or 0, evidence_count or 0, trend)
+        
+        le_ids = list(les)
+        student_ids = sorted(students, key=lambda sid: students[sid] + (sid,))
+        
+        def matrix(field):
+            return [
+                [cells[sid, le_id][field] if (sid, le_id) in cells else None for le_id in le_ids]
+                for sid in student_ids
+            ]
+        
+        return {
+            'unit_number': unit_number,
+            'learning_experiences': {
+                'id': le_ids,
+                'experience_number': [les[le_id][0] for le_id in le_ids],
+                'core_concept': [les[le_id][1] for le_id in le_ids],
+                'success_criteria_count': [les[le_id][2] for le_id in le_ids]
+            },
+            'students': {
+                'id': student_ids,
+                'first_name': [students[sid][1] for sid in student_ids],
+                'last_name': [students[sid][0] for sid in student_ids]
+            },
+            'mastery_level': matrix(0),
+            'success_criteria_met': matrix(1),
+            'evidence_count': matrix(2),
+            'trend': matrix(3)
+        }
+    
+    @staticmethod
+    def get_sc_coverage(learning_experience_id):
+        """
+        Summarise how many students have met each success criterion of a LE
+        
+        Counts come from one aggregate query over the SC status documents
+        rather than loading and decoding every progress row.
+        
+        Args:
+            learning_experience_id: ID of LE
+        
+        Returns:
+            List of dicts with sc_id, criterion, met, not_met and students,
+            in success criteria order, or None if the LE does not exist
+        """
+        le = LearningExperience.query_by_id(learning_experience_id)
+        if not le:
+            return None
+        
+        members = json_object_members(StudentProgress.success_criteria_status, db.engine.dialect)
+        query = (
+            select(
+                members.c.key,
+                func.count(),
+                func.sum(case((members.c.value == 'met', 1), else_=0))
+            )
+            .select_from(StudentProgress)
+            .join(members, true())
+            .where(StudentProgress.learning_experience_id == learning_experience_id)
+            .group_by(members.c.key)
+        )
+        counts = {key: (students, met or 0) for key, students, met in db.session.execute(query)}
+        
+        coverage = []
+        for i, criterion in enumerate(le.get_success_criteria_list()):
+            students, met = counts.get(str(i), (0, 0))
+            coverage.append({
+                'sc_id': str(i),
+                'criterion': criterion,
+                'met': met,
+                'not_met': students - met,
+                'students': students
+            })
+        return coverage
+    
+    @staticmethod
+    def get_students_meeting_sc(learning_experience_id, sc_id):
+        """
+        Get IDs of students who have met a success criterion on a LE
+        
+        Args:
+            learning_experience_id: ID of LE
+            sc_id: Success criterion ID (its index in the LE's list)
+        
+        Returns:
+            List of student IDs
+        """
+        query = (
+            select(StudentProgress.student_id)
+            .where(
+                StudentProgress.learning_experience_id == learning_experience_id,
+                json_member_equals(StudentProgress.success_criteria_status, str(sc_id), 'met', db.engine.dialect)
+            )
+            .order_by(StudentProgress.student_id)
+        )
+        return list(db.session.execute(query).scalars())
@@ -2,50 +2,176 @@
 from backend.services.teacher_guide_generator import TeacherGuideGenerator
 from backend.services.answer_sheet_generator import AnswerSheetGenerator
 from backend.services.exemplar_generator import ExemplarGenerator
+from backend.services.lesson_bundle import LessonBundle
+from backend.core.document_cache import document_cache
 from backend.core.database import db
 from backend.models.lesson import Lesson
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from flask import current_app, has_app_context
+import multiprocessing
+import threading
 import os
 
+# Documents produced by generate_all, in result order
+DOCUMENT_GENERATORS = {
+    'teacher_guide': TeacherGuideGenerator,
+    'answer_sheet': AnswerSheetGenerator,
+    'exemplar': ExemplarGenerator
+}
+
+# Worker pools shared across requests, keyed by (executor type, worker count)
+_executors = {}
+_executors_lock = threading.Lock()
+
+def _get_executor(kind, max_workers):
+    """Get or create a shared worker pool"""
+    key = (kind, max_workers)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            if kind == 'process':
+                # Spawn rather than fork so workers never inherit open DB connections
+                executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='support-files')
+            _executors[key] = executor
+        return executor
+
+def _render_document(name, bundle, output_dir, cache_dir, max_bytes):
+    """
+    Render one document from a bundle (runs on a worker thread or process)
+    
+    Returns:
+        Tuple of (result, (hits, misses)) - the cache lookups this render
+        made, which a worker process's own counters would otherwise lose
+    """
+    if document_cache.cache_dir != cache_dir or document_cache.max_bytes != max_bytes:
+        document_cache.configure(cache_dir, max_bytes)
+    hits, misses = document_cache.hits, document_cache.misses
+    result = DOCUMENT_GENERATORS[name].render(bundle, output_dir)
+    return result, (document_cache.hits - hits, document_cache.misses - misses)
+
 class SupportFilesService:
     """Coordinate generation of all support files for a lesson"""
     
+    DEFAULT_WORKERS = 3
+    DEFAULT_DIR = '/tmp/nsw_support_files'
+    
     @staticmethod
-    def generate_all(lesson_id, output_dir='/tmp'):
+    def output_dir_for(teacher_id, lesson_id):
+        """
+        Per-teacher directory for a lesson's generated files
+        
+        Keeps each teacher's artifacts apart so identically named documents
+        from different teachers never overwrite each other.
+        
+        Args:
+            teacher_id: ID of teacher
+            lesson_id: ID of lesson
+        
+        Returns:
+            Directory path (created if missing)
+        """
+        config = current_app.config if has_app_context() else {}
+        root = config.get('SUPPORT_FILES_DIR', SupportFilesService.DEFAULT_DIR)
+        output_dir = os.path.join(root, str(teacher_id), str(lesson_id))
+        os.makedirs(output_dir, exist_ok=True)
+        return output_dir
+    
+    @staticmethod
+    def open_document(lesson_id, document):
+        """
+        Get one document for download without writing a copy to disk
+        
+        Serves the cached artifact when there is one, otherwise renders the
+        document into memory (and populates the cache for next time).
+        
+        Args:
+            lesson_id: ID of lesson
+            document: 'teacher_guide', 'answer_sheet' or 'exemplar'
+        
+        Returns:
+            Dictionary with source (file path or BytesIO), filename, etag and
+            cached flag, or None if the document cannot be generated
+        """
+        bundle = LessonBundle.load(lesson_id)
+        if not bundle:
+            return None
+        
+        prepared = DOCUMENT_GENERATORS[document].prepare(bundle)
+        if not prepared:
+            return None
+        
+        source, cached = document_cache.fetch(prepared['key'], prepared['build'])
+        return {
+            'source': source,
+            'filename': prepared['filename'],
+            'etag': prepared['key'],
+            'cached': cached
+        }
+    
+    @staticmethod
+    def generate_all(lesson_id, output_dir='/tmp', max_workers=None, executor=None):
         """
         Generate all support files (Teacher Guide, Answer Sheet, Exemplar)
         
+        The lesson is loaded once into an immutable bundle and the three
+        documents are rendered concurrently.
+        
         Args:
             lesson_id: ID of lesson
             output_dir: Where to save files
+            max_workers: Worker count (default SUPPORT_FILES_WORKERS config)
+            executor: 'thread' or 'process' (default SUPPORT_FILES_EXECUTOR config)
         
         Returns:
             Dictionary with all generated files
         """
         results = {}
         
-        try:
-            # Generate Teacher Guide
-            guide_result = TeacherGuideGenerator.generate(lesson_id, output_dir)
-            if guide_result:
-                results['teacher_guide'] = guide_result
-        except Exception as e:
-            results['teacher_guide_error'] = str(e)
-        
-        try:
-            # Generate Answer Sheet
-            answer_result = AnswerSheetGenerator.generate(lesson_id, output_dir)
-            if answer_result:
-                results['answer_sheet'] = answer_result
-        except Exception as e:
-            results['answer_sheet_error'] = str(e)
-        
-        try:
-            # Generate Exemplar
-            exemplar_result = ExemplarGenerator.generate(lesson_id, output_dir)
-            if exemplar_result:
-                results['exemplar'] = exemplar_result
-        except Exception as e:
-            results['exemplar_error'] = str(e)
+        bundle = LessonBundle.load(lesson_id)
+        if not bundle:
+            return results
+        
+        config = current_app.config if has_app_context() else {}
+        if max_workers is None:
+            max_workers = config.get('SUPPORT_FILES_WORKERS', SupportFilesService.DEFAULT_WORKERS)
+        if executor is None:
+            executor = config.get('SUPPORT_FILES_EXECUTOR', 'thread')
+        
+        if max_workers <= 1:
+            # Sequential fallback
+            for name, generator in DOCUMENT_GENERATORS.items():
+                try:
+                    result = generator.render(bundle, output_dir)
+                    if result:
+                        results[name] = result
+                except Exception as e:
+                    results[f'{name}_error'] = str(e)
+            return results
+        
+        pool = _get_executor(executor, max_workers)
+        futures = {
+            name: pool.submit(
+                _render_document, name, bundle, output_dir,
+                document_cache.cache_dir, document_cache.max_bytes
+            )
+            for name in DOCUMENT_GENERATORS
+        }
+        
+        for name, future in futures.items():
+            try:
+                result, lookups = future.result()
+                if executor == 'process':
+                    # Threads share this process's cache counters already
+                    document_cache.record(*lookups)
+                if result:
+                    results[name] = result
+            except Exception as e:
+                results[f'{name}_error'] = str(e)
         
         return results
     
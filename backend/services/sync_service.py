@@ -0,0 +1,113 @@
+"""
+Sync Service - delta sync for offline-capable clients
+Returns the rows a teacher's client needs to catch up since its last sync:
+rows whose updated_at moved (indexed range scans) plus tombstones for hard
+deletes, so the cost follows the volume of changes rather than of data
+"""
+from flask import current_app
+from backend.core.database import db
+from backend.core.serialization import serializer_for, serialize_many
+from backend.models.evidence import Evidence
+from backend.models.learning_experience import LearningExperience
+from backend.models.lesson import Lesson
+from backend.models.student_progress import StudentProgress
+from backend.models.tombstone import Tombstone
+from backend.models.worksheet import Worksheet
+from backend.models.worksheet_question import WorksheetQuestion
+from backend.utils.helpers import decode_cursor, encode_cursor
+from sqlalchemy import select
+from datetime import datetime, timedelta
+
+class SyncService:
+    """Service for delta sync"""
+    
+    # Collections in the order clients should apply them (parents first)
+    COLLECTIONS = ('learning_experiences', 'lessons', 'worksheets', 'worksheet_questions', 'evidence', 'progress')
+    
+    # Writes committed this long after their updated_at was set are still
+    # picked up: each token starts this far before the sync that issued it
+    DEFAULT_OVERLAP_SECONDS = 5
+    
+    @staticmethod
+    def get_changes(teacher_id, token=None):
+        """
+        Rows created, updated or deleted since a sync token
+        
+        Rows changed shortly before the token may be sent again; applying
+        changes is an upsert by ID, so repeats are harmless.
+        
+        Args:
+            teacher_id: ID of teacher
+            token: next_token from the previous sync, or None for a full sync
+        
+        Returns:
+            Dictionary with full (bool), changes ({collection: [rows]}),
+            deleted ({collection: [ids]}) and next_token
+        
+        Raises:
+            ValueError: If the token is invalid
+        """
+        since = decode_cursor(token, 1)[0] if token else None
+        if since is not None and not isinstance(since, datetime):
+            raise ValueError('Invalid sync token')
+        
+        started = datetime.utcnow()
+        changes = {}
+        for collection in SyncService.COLLECTIONS:
+            query, model_class = SyncService._changed_rows(collection, teacher_id, since)
+            changes[collection] = serialize_many(db.session.execute(query).all(), model_class)
+        
+        deleted = {}
+        if since is not None:
+            rows = db.session.execute(
+                select(Tombstone.entity, Tombstone.entity_id)
+                .where(Tombstone.teacher_id == teacher_id, Tombstone.created_at > since)
+                .order_by(Tombstone.created_at)
+            )
+            for entity, entity_id in rows:
+                deleted.setdefault(entity, []).append(entity_id)
+        
+        overlap = current_app.config.get('SYNC_OVERLAP_SECONDS', SyncService.DEFAULT_OVERLAP_SECONDS)
+        return {
+            'full': since is None,
+            'changes': changes,
+            'deleted': deleted,
+            'next_token': encode_cursor([started - timedelta(seconds=overlap)])
+        }
+    
+    @staticmethod
+    def _changed_rows(collection, teacher_id, since):
+        """SELECT of a collection's rows for a teacher changed after since (all rows if None)"""
+        if collection in ('learning_experiences', 'lessons', 'evidence'):
+            model_class = {
+                'learning_experiences': LearningExperience, 'lessons': Lesson, 'evidence': Evidence
+            }[collection]
+            query = serializer_for(model_class).select().where(model_class.teacher_id == teacher_id)
+        elif collection == 'worksheets':
+            model_class = Worksheet
+            query = (
+                serializer_for(Worksheet).select()
+                .join(Lesson, Lesson.id == Worksheet.lesson_id)
+                .where(Lesson.teacher_id == teacher_id)
+            )
+        elif collection == 'worksheet_questions':
+            model_class = WorksheetQuestion
+            query = (
+                serializer_for(WorksheetQuestion).select()
+                .join(Worksheet, Worksheet.id == WorksheetQuestion.worksheet_id)
+                .join(Lesson, Lesson.id == Worksheet.lesson_id)
+                .where(Lesson.teacher_id == teacher_id)
+            )
+        elif collection == 'progress':
+            model_class = StudentProgress
+            query = (
+                serializer_for(StudentProgress).select()
+                .join(LearningExperience, LearningExperience.id == StudentProgress.learning_experience_id)
+                .where(LearningExperience.teacher_id == teacher_id)
+            )
+        else:
+            raise ValueError(f'Unknown collection: {collection}')
+        
+        if since is not None:
+            query = query.where(model_class.updated_at > since)
+        return query.order_by(model_class.updated_at, model_class.id), model_class
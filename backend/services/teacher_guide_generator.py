@@ -4,6 +4,8 @@ from docx.shared import Pt, RGBColor, Cm, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from backend.models.learning_experience import LearningExperience
 from backend.models.lesson import Lesson
+from backend.core.document_cache import document_cache
+from backend.services.lesson_bundle import LessonBundle
 import json
 import os
 
@@ -13,6 +15,9 @@ class TeacherGuideGenerator:
     # KRPS Green brand color
     KRPS_GREEN = RGBColor(45, 139, 61)  # #2D8B3D
     
+    # Bump when the document layout changes to invalidate cached copies
+    VERSION = 1
+    
     @staticmethod
     def generate(lesson_id, output_dir='/tmp'):
         """
@@ -25,14 +30,81 @@ class TeacherGuideGenerator:
         Returns:
             Dictionary with file_path and metadata
         """
-        lesson = Lesson.query_by_id(lesson_id)
-        if not lesson:
+        bundle = LessonBundle.load(lesson_id)
+        if not bundle:
             return None
         
-        le = LearningExperience.query_by_id(lesson.learning_experience_id)
-        if not le:
+        return TeacherGuideGenerator.render(bundle, output_dir)
+    
+    @staticmethod
+    def render(bundle, output_dir='/tmp'):
+        """
+        Generate the teacher guide from a preloaded lesson bundle
+        
+        Does not touch the database, so it is safe to run on a worker pool.
+        
+        Args:
+            bundle: LessonBundle for the lesson
+            output_dir: Where to save file
+        
+        Returns:
+            Dictionary with file_path and metadata
+        """
+        prepared = TeacherGuideGenerator.prepare(bundle)
+        if not prepared:
             return None
         
+        filepath = os.path.join(output_dir, prepared['filename'])
+        cached = document_cache.render(prepared['key'], filepath, prepared['build'])
+        
+        return {'file_path': filepath, **prepared['metadata'], 'cached': cached}
+    
+    @staticmethod
+    def prepare(bundle):
+        """
+        Work out the cache key, filename and builder for the teacher guide
+        
+        Args:
+            bundle: LessonBundle for the lesson
+        
+        Returns:
+            Dictionary with key, filename, build callable and metadata
+        """
+        lesson = bundle.lesson
+        le = bundle.learning_experience
+        
+        # Cache key covers every input that shapes the document
+        key = document_cache.make_key('teacher_guide', TeacherGuideGenerator.VERSION, {
+            'lesson': document_cache.fingerprint(lesson),
+            'learning_experience': document_cache.fingerprint(le)
+        })
+        
+        filename = f"TeacherGuide_Unit{le.unit_number}_LE{le.experience_number}.docx"
+        
+        return {
+            'key': key,
+            'filename': filename,
+            'build': lambda: TeacherGuideGenerator._build(lesson, le),
+            'metadata': {
+                'filename': filename,
+                'lesson_id': lesson.id,
+                'subject': le.subject,
+                'core_concept': le.core_concept
+            }
+        }
+    
+    @staticmethod
+    def _build(lesson, le):
+        """
+        Render the teacher guide document
+        
+        Args:
+            lesson: Lesson object
+            le: LearningExperience object
+        
+        Returns:
+            python-docx Document
+        """
         # Create document
         doc = Document()
         
@@ -156,15 +228,4 @@ class TeacherGuideGenerator:
         footer_para.text = "Page "
         footer_para.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.RIGHT
         
-        # Save file
-        filename = f"TeacherGuide_Unit{le.unit_number}_LE{le.experience_number}.docx"
-        filepath = os.path.join(output_dir, filename)
-        doc.save(filepath)
-        
-        return {
-            'file_path': filepath,
-            'filename': filename,
-            'lesson_id': lesson_id,
-            'subject': le.subject,
-            'core_concept': le.core_concept
-        }
+        return doc
@@ -0,0 +1,138 @@
+"""Unit Export Service - streams a whole unit's worksheets and support files as a ZIP"""
+from backend.models.learning_experience import LearningExperience
+from backend.models.lesson import Lesson
+from backend.services.lesson_bundle import LessonBundle
+from backend.services.support_files_service import DOCUMENT_GENERATORS
+from backend.core.document_cache import document_cache
+from backend.utils.streams import ChunkSink
+import json
+import zipfile
+
+class UnitExportService:
+    """Build unit exports one document at a time"""
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    @staticmethod
+    def plan_unit(teacher_id, unit_number):
+        """
+        List the lessons in a unit and where their files go in the archive
+        
+        Args:
+            teacher_id: ID of teacher
+            unit_number: Unit number
+        
+        Returns:
+            List of (lesson_id, folder) tuples, empty if the unit has no LEs
+        """
+        les = sorted(
+            LearningExperience.find_by_unit(teacher_id, unit_number),
+            key=lambda le: le.experience_number
+        )
+        
+        plan = []
+        for le in les:
+            lessons = sorted(Lesson.find_by_le(le.id), key=lambda lesson: lesson.date_scheduled)
+            for i, lesson in enumerate(lessons, start=1):
+                folder = f'Unit{unit_number}/LE{le.experience_number}/Lesson{i}_Week{lesson.week_number}'
+                plan.append((lesson.id, folder))
+        return plan
+    
+    @staticmethod
+    def stream_unit(plan):
+        """
+        Stream a ZIP archive of every lesson in a unit plan
+        
+        Each lesson is loaded, rendered (or fetched from the document cache)
+        and written before the next one is touched, so memory is bounded by a
+        single lesson and output starts before the last document is ready.
+        Documents that fail are listed in errors.txt instead of aborting the
+        download.
+        
+        Args:
+            plan: Output of plan_unit
+        
+        Yields:
+            Chunks of the ZIP archive
+        """
+        sink = ChunkSink()
+        errors = []
+        
+        with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for lesson_id, folder in plan:
+                bundle = LessonBundle.load(lesson_id)
+                if not bundle:
+                    continue
+                
+                archive.writestr(f'{folder}/worksheets.json', UnitExportService._worksheets_json(bundle))
+                
+                for name, generator in DOCUMENT_GENERATORS.items():
+                    try:
+                        prepared = generator.prepare(bundle)
+                        if not prepared:
+                            continue
+                        source = UnitExportService._open_document(prepared)
+                    except Exception as e:
+                        errors.append(f'{folder}: {name}: {e}')
+                        continue
+                    
+                    with source:
+                        yield from UnitExportService._write_entry(
+                            archive, sink, f'{folder}/{prepared["filename"]}', source
+                        )
+            
+            if errors:
+                archive.writestr('errors.txt', '\n'.join(errors) + '\n')
+        
+        yield sink.drain()
+    
+    @staticmethod
+    def _open_document(prepared):
+        """
+        Open a prepared document for reading, building it on a cache miss
+        
+        Opening happens before the archive entry starts so an eviction race
+        can be retried without leaving a half-written entry behind.
+        """
+        source, _ = document_cache.fetch(prepared['key'], prepared['build'])
+        if not isinstance(source, str):
+            return source
+        try:
+            return open(source, 'rb')
+        except FileNotFoundError:
+            source, _ = document_cache.fetch(prepared['key'], prepared['build'])
+            return source if not isinstance(source, str) else open(source, 'rb')
+    
+    @staticmethod
+    def _write_entry(archive, sink, arcname, source):
+        """Copy a document into the archive, yielding output as it is produced"""
+        with archive.open(arcname, mode='w') as entry:
+            yield from UnitExportService._copy_chunks(source, entry, sink)
+        
+        # Closing the entry writes its data descriptor
+        data = sink.drain()
+        if data:
+            yield data
+    
+    @staticmethod
+    def _copy_chunks(src, entry, sink):
+        """Copy src into an archive entry in CHUNK_SIZE pieces"""
+        while True:
+            chunk = src.read(UnitExportService.CHUNK_SIZE)
+            if not chunk:
+                return
+            entry.write(chunk)
+            data = sink.drain()
+            if data:
+                yield data
+    
+    @staticmethod
+    def _worksheets_json(bundle):
+        """Worksheets and their questions for one lesson, as JSON"""
+        return json.dumps({
+            ws.tier: {
+                'worksheet': ws.to_dict(),
+                'questions': [q.to_dict() for q in bundle.questions_by_worksheet.get(ws.id, ())]
+            }
+            for ws in bundle.worksheets
+        }, indent=2)
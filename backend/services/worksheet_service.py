@@ -1,19 +1,35 @@
 """Worksheet Service - business logic for worksheet generation"""
 from backend.core.database import db
+from backend.core.read_cache import read_cache, ReadCache
+from sqlalchemy import insert, select
 from backend.models.worksheet import Worksheet
 from backend.models.worksheet_question import WorksheetQuestion
 from backend.models.lesson import Lesson
 from backend.models.learning_experience import LearningExperience
+from backend.models.tombstone import Tombstone
+from datetime import datetime
 import json
+import uuid
 
 class WorksheetService:
     """Service for managing and generating worksheets"""
     
+    # Tiers in generation order with their question counts
+    TIER_QUESTION_COUNTS = [
+        ('mild', 5),
+        ('medium', 10),
+        ('spicy', 15),
+        ('enrichment', 2)
+    ]
+    
     @staticmethod
     def generate_worksheets(lesson_id):
         """
         Generate all four tiered worksheets for a lesson
         
+        Old worksheets and questions are removed with one statement each and
+        the new rows are written with two bulk inserts in a single transaction.
+        
         Args:
             lesson_id: ID of lesson to generate worksheets for
         
@@ -28,32 +44,36 @@ class WorksheetService:
         if not le:
             return None
         
-        # Delete any existing worksheets for this lesson
-        existing = Worksheet.find_by_lesson(lesson_id)
-        for ws in existing:
-            # Delete all questions first
-            db.session.query(WorksheetQuestion).filter_by(worksheet_id=ws.id).delete()
-            # Then delete the worksheet
-            db.session.delete(ws)
-        db.session.commit()
-        
-        # Generate all four tiers
-        worksheets = {}
-        
-        worksheets['mild'] = WorksheetService._generate_tier(
-            lesson_id, le, 'mild', 5
-        )
-        worksheets['medium'] = WorksheetService._generate_tier(
-            lesson_id, le, 'medium', 10
-        )
-        worksheets['spicy'] = WorksheetService._generate_tier(
-            lesson_id, le, 'spicy', 15
-        )
-        worksheets['enrichment'] = WorksheetService._generate_tier(
-            lesson_id, le, 'enrichment', 2
-        )
-        
-        return worksheets
+        worksheet_rows = []
+        question_rows = []
+        for tier, question_count in WorksheetService.TIER_QUESTION_COUNTS:
+            worksheet_row, rows = WorksheetService._generate_tier(lesson_id, le, tier, question_count)
+            worksheet_rows.append(worksheet_row)
+            question_rows.extend(rows)
+        
+        try:
+            # Delete any existing worksheets (questions first) for this lesson
+            existing_ids = select(Worksheet.id).where(Worksheet.lesson_id == lesson_id)
+            question_ids = db.session.scalars(
+                select(WorksheetQuestion.id).where(WorksheetQuestion.worksheet_id.in_(existing_ids))
+            ).all()
+            Tombstone.record(lesson.teacher_id, 'worksheet_questions', question_ids)
+            Tombstone.record(lesson.teacher_id, 'worksheets', db.session.scalars(existing_ids).all())
+            db.session.query(WorksheetQuestion).filter(
+                WorksheetQuestion.worksheet_id.in_(existing_ids)
+            ).delete(synchronize_session=False)
+            db.session.query(Worksheet).filter_by(lesson_id=lesson_id).delete(synchronize_session=False)
+            
+            db.session.execute(insert(Worksheet), worksheet_rows)
+            db.session.execute(insert(WorksheetQuestion), question_rows)
+            read_cache.invalidate_on_commit(ReadCache.tag('worksheets', lesson.teacher_id))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        by_tier = {ws.tier: ws for ws in Worksheet.find_by_lesson(lesson_id)}
+        return {tier: by_tier[tier] for tier, _ in WorksheetService.TIER_QUESTION_COUNTS}
     
     @staticmethod
     def _generate_tier(lesson_id, le, tier, question_count):
@@ -67,23 +87,21 @@ class WorksheetService:
             question_count: Number of questions to generate
         
         Returns:
-            Worksheet object
+            Tuple of (worksheet row, list of question rows) ready for bulk insert
         """
-        # Create worksheet
-        worksheet = Worksheet(
-            lesson_id=lesson_id,
-            tier=tier,
-            title=f"{le.core_concept} - {tier.capitalize()}",
-            description=f"{tier.capitalize()} tier worksheet for {le.core_concept}",
-            subject=le.subject,
-            year_level=le.year_level,
-            learning_intention=le.learning_intention,
-            success_criteria=le.success_criteria,
-            question_count=question_count
-        )
-        
-        db.session.add(worksheet)
-        db.session.commit()
+        worksheet_id = str(uuid.uuid4())
+        worksheet_row = {
+            'id': worksheet_id,
+            'lesson_id': lesson_id,
+            'tier': tier,
+            'title': f"{le.core_concept} - {tier.capitalize()}",
+            'description': f"{tier.capitalize()} tier worksheet for {le.core_concept}",
+            'subject': le.subject,
+            'year_level': le.year_level,
+            'learning_intention': le.learning_intention,
+            'success_criteria': le.success_criteria,
+            'question_count': question_count
+        }
         
         # Generate questions based on tier
         if tier == 'mild':
@@ -95,22 +113,21 @@ class WorksheetService:
         else:  # enrichment
             questions = WorksheetService._generate_enrichment_questions(le, question_count)
         
-        # Add questions to worksheet
-        for i, q in enumerate(questions, 1):
-            question = WorksheetQuestion(
-                worksheet_id=worksheet.id,
-                question_number=i,
-                question_text=q['text'],
-                tier=tier,
-                hints=q.get('hints'),
-                model_answer=q.get('model_answer'),
-                difficulty_level=q.get('difficulty_level')
-            )
-            db.session.add(question)
-        
-        db.session.commit()
-        
-        return worksheet
+        question_rows = [
+            {
+                'id': str(uuid.uuid4()),
+                'worksheet_id': worksheet_id,
+                'question_number': i,
+                'question_text': q['text'],
+                'tier': tier,
+                'hints': q.get('hints'),
+                'model_answer': q.get('model_answer'),
+                'difficulty_level': q.get('difficulty_level')
+            }
+            for i, q in enumerate(questions, 1)
+        ]
+        
+        return worksheet_row, question_rows
     
     @staticmethod
     def _generate_mild_questions(le, count):
@@ -181,6 +198,29 @@ class WorksheetService:
         """Get all questions for a worksheet"""
         return WorksheetQuestion.find_by_worksheet(worksheet_id)
     
+    @staticmethod
+    def get_questions_for_worksheets(worksheet_ids):
+        """
+        Get questions for several worksheets in one query
+        
+        Args:
+            worksheet_ids: List of worksheet IDs
+        
+        Returns:
+            Dictionary of worksheet ID -> questions ordered by number
+        """
+        questions_by_worksheet = {worksheet_id: [] for worksheet_id in worksheet_ids}
+        if not worksheet_ids:
+            return questions_by_worksheet
+        
+        questions = WorksheetQuestion.query.filter(
+            WorksheetQuestion.worksheet_id.in_(worksheet_ids)
+        ).order_by(WorksheetQuestion.question_number).all()
+        
+        for q in questions:
+            questions_by_worksheet[q.worksheet_id].append(q)
+        return questions_by_worksheet
+    
     @staticmethod
     def update_question(question_id, **kwargs):
         """Update a worksheet question"""
@@ -192,5 +232,13 @@ class WorksheetService:
             if hasattr(question, key):
                 setattr(question, key, value)
         
+        # Questions are part of the worksheet's representation (and ETag)
+        worksheet = Worksheet.query_by_id(question.worksheet_id)
+        if worksheet:
+            worksheet.updated_at = datetime.utcnow()
+            lesson = Lesson.query_by_id(worksheet.lesson_id)
+            if lesson:
+                read_cache.invalidate_on_commit(ReadCache.tag('worksheets', lesson.teacher_id))
+        
         db.session.commit()
         return question
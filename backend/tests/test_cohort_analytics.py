@@ -0,0 +1,121 @@
+"""Tests for vectorized cohort analytics"""
+import pytest
+import random
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from backend.main import create_app
+from backend.core.database import db
+from backend.models.teacher import Teacher
+from backend.models.student import Student
+from backend.models.learning_experience import LearningExperience
+from backend.models.student_progress import StudentProgress
+from backend.services.evidence_service import EvidenceService
+from backend.services.cohort_analytics_service import CohortAnalyticsService
+
+@pytest.fixture
+def app():
+    """Create test app"""
+    app = create_app('development')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _setup(email, students=3):
+    """Create a teacher, students and two LEs in unit 22"""
+    teacher = Teacher(email=email, first_name='Test', last_name='Teacher', password_hash='hash123')
+    db.session.add(teacher)
+    db.session.commit()
+    
+    student_list = [Student(first_name=f'S{i}', last_name='Student', year_level=6) for i in range(students)]
+    les = [
+        LearningExperience(
+            teacher_id=teacher.id, unit_number=22, experience_number=n, core_concept=f'Concept {n}',
+            learning_intention='Learn', success_criteria=['I can one', 'I can two'], subject='Maths'
+        )
+        for n in (1, 2)
+    ]
+    db.session.add_all(student_list + les)
+    db.session.commit()
+    return teacher.id, [s.id for s in student_list], [le.id for le in les]
+
+def _log(teacher_id, student_id, le_id, mastery_level, when, sc_ids=None):
+    evidence = EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observed', mastery_level,
+                                            success_criteria_ids=sc_ids)
+    EvidenceService.update_evidence(evidence.id, observation_date=when)
+    return evidence
+
+def test_distribution_and_weekly_growth(app):
+    """Test SC mastery distribution and per-week growth on a small known cohort"""
+    with app.app_context():
+        teacher_id, students, les = _setup('ca1@test.com')
+        monday = datetime(2024, 2, 5, 9)
+        
+        _log(teacher_id, students[0], les[0], 2, monday, ['0'])
+        _log(teacher_id, students[0], les[0], 4, monday + timedelta(days=8), ['0', '1'])
+        _log(teacher_id, students[1], les[0], 3, monday + timedelta(days=1), ['0'])
+        _log(teacher_id, students[2], les[1], 1, monday + timedelta(days=9))
+        
+        columns = CohortAnalyticsService.load(teacher_id, unit_number=22)
+        assert len(columns) == 4
+        
+        distribution = CohortAnalyticsService.sc_mastery_distribution(columns)
+        assert [(d['learning_experience_id'], d['sc_id'], d['levels']) for d in distribution] == [
+            (les[0], '0', {'1': 0, '2': 0, '3': 1, '4': 1}),
+            (les[0], '1', {'1': 0, '2': 0, '3': 0, '4': 1})
+        ]
+        
+        weeks = CohortAnalyticsService.weekly_growth(columns)
+        assert [w['week_start'] for w in weeks] == ['2024-02-05', '2024-02-12']
+        assert [w['evidence_count'] for w in weeks] == [2, 2]
+        assert [w['mean_mastery'] for w in weeks] == [2.5, 2.5]
+        assert weeks[0]['growth'] is None and weeks[1]['growth'] == 0.0
+        
+        scoped = CohortAnalyticsService.load(teacher_id, date_to=monday + timedelta(days=7))
+        assert len(scoped) == 2
+        
+        print("✅ Distribution and weekly growth: PASS")
+
+def test_vectorized_trends_match_progress(app):
+    """Test that cohort trends agree with the per-pair trend kept by StudentProgressService"""
+    with app.app_context():
+        teacher_id, students, les = _setup('ca2@test.com', students=6)
+        rng = random.Random(18)
+        start = datetime(2024, 2, 1)
+        
+        for student_id in students:
+            for le_id in les:
+                for i in range(rng.randint(1, 7)):
+                    _log(teacher_id, student_id, le_id, rng.randint(1, 4), start + timedelta(days=rng.randint(0, 60)))
+        
+        expected = {'improving': 0, 'stable': 0, 'declining': 0}
+        for progress in StudentProgress.query.all():
+            expected[progress.trend] += 1
+        
+        trends = CohortAnalyticsService.trends(CohortAnalyticsService.load(teacher_id))
+        assert trends['totals'] == expected
+        assert sum(sum(t.values()) for t in trends['by_learning_experience'].values()) == len(students) * len(les)
+        
+        print("✅ Vectorized trends match progress: PASS")
+
+def test_cohort_endpoints(app):
+    """Test the analytics endpoints and their date validation"""
+    with app.app_context():
+        teacher_id, students, les = _setup('ca3@test.com')
+        _log(teacher_id, students[0], les[0], 3, datetime(2024, 3, 4), ['1'])
+        headers = {'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'}
+        client = app.test_client()
+        
+        response = client.get('/api/v1/analytics/cohort/trends?year_level=6', headers=headers)
+        assert response.status_code == 200
+        assert response.get_json()['totals']['stable'] == 1
+        
+        response = client.get('/api/v1/analytics/cohort/growth?from=2024-03-01&to=2024-03-04', headers=headers)
+        assert response.get_json()['weeks'][0]['week_start'] == '2024-03-04'
+        
+        response = client.get('/api/v1/analytics/cohort/mastery?from=March', headers=headers)
+        assert response.status_code == 400
+        
+        print("✅ Cohort endpoints: PASS")
@@ -0,0 +1,117 @@
+"""Tests for ETag / Last-Modified conditional GETs"""
+import pytest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from backend.main import create_app
+from backend.core.database import db
+from backend.core.read_cache import read_cache, ReadCache
+from backend.models.teacher import Teacher
+from backend.models.learning_experience import LearningExperience
+from backend.models.change_version import ChangeVersion
+from backend.services.lesson_service import LessonService
+from backend.services.worksheet_service import WorksheetService
+
+@pytest.fixture
+def app():
+    """Create test app"""
+    app = create_app('development')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _setup(email):
+    """Create a teacher with an LE and one lesson"""
+    teacher = Teacher(email=email, first_name='Test', last_name='Teacher', password_hash='hash123')
+    db.session.add(teacher)
+    db.session.commit()
+    
+    le = LearningExperience(
+        teacher_id=teacher.id, unit_number=22, experience_number=1, core_concept='Fractions',
+        learning_intention='Learn', success_criteria=['I can one'], subject='Maths'
+    )
+    db.session.add(le)
+    db.session.commit()
+    
+    lesson = LessonService.create_lesson(teacher.id, le.id, 4, datetime(2024, 2, 5, 9))
+    headers = {'Authorization': f'Bearer {create_access_token(identity=teacher.id)}'}
+    return teacher.id, le.id, lesson.id, headers
+
+def test_collection_not_modified_before_view_runs(app):
+    """Test that a current collection ETag is answered from the change versions alone"""
+    with app.app_context():
+        teacher_id, le_id, lesson_id, headers = _setup('cg1@test.com')
+        client = app.test_client()
+        
+        response = client.get('/api/v1/lessons', headers=headers)
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+        assert not etag.startswith('W/')
+        assert 'Last-Modified' in response.headers
+        
+        response = client.get('/api/v1/lessons', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.get_data() == b''
+        assert response.headers['X-Query-Count'] == '1'  # The change version lookup only
+        
+        # Query string and teacher are part of the ETag
+        response = client.get('/api/v1/lessons?week_number=4', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        
+        LessonService.create_lesson(teacher_id, le_id, 4, datetime(2024, 2, 6, 9))
+        response = client.get('/api/v1/lessons', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        
+        print("✅ Collection not modified before view runs: PASS")
+
+def test_resource_etag_follows_updated_at(app):
+    """Test single-resource ETags for lessons and worksheets, including question edits"""
+    with app.app_context():
+        teacher_id, le_id, lesson_id, headers = _setup('cg2@test.com')
+        client = app.test_client()
+        
+        response = client.get(f'/api/v1/lessons/{lesson_id}', headers=headers)
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+        assert client.get(f'/api/v1/lessons/{lesson_id}', headers={**headers, 'If-None-Match': etag}).status_code == 304
+        
+        LessonService.update_lesson(lesson_id, location='Room 4')
+        response = client.get(f'/api/v1/lessons/{lesson_id}', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['lesson']['location'] == 'Room 4'
+        
+        worksheets = WorksheetService.generate_worksheets(lesson_id)
+        worksheet_id = worksheets['mild'].id
+        url = f'/api/v1/worksheets/{worksheet_id}/tier/mild'
+        etag = client.get(url, headers=headers).headers['ETag']
+        assert client.get(url, headers={**headers, 'If-None-Match': etag}).status_code == 304
+        
+        question = WorksheetService.get_questions(worksheet_id)[0]
+        WorksheetService.update_question(question.id, question_text='Edited')
+        response = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['questions'][0]['question_text'] == 'Edited'
+        
+        print("✅ Resource ETag follows updated_at: PASS")
+
+def test_change_versions_bump_on_commit_only(app):
+    """Test that tag versions count committed writes and ignore rolled-back ones"""
+    with app.app_context():
+        teacher_id, le_id, lesson_id, headers = _setup('cg3@test.com')
+        tag = ReadCache.tag('lessons', teacher_id)
+        assert db.session.get(ChangeVersion, tag).version == 1
+        
+        LessonService.publish_lesson(lesson_id)
+        db.session.expire_all()
+        assert db.session.get(ChangeVersion, tag).version == 2
+        
+        read_cache.invalidate_on_commit(tag)
+        db.session.rollback()
+        db.session.commit()
+        db.session.expire_all()
+        assert db.session.get(ChangeVersion, tag).version == 2
+        
+        print("✅ Change versions bump on commit only: PASS")
@@ -0,0 +1,161 @@
+"""Tests for BaseModel lookups, serialization, the request-scoped lookup cache and query stats"""
+import pytest
+from backend.main import create_app
+from backend.core.database import db
+from backend.core.serialization import serializer_for, serialize_many
+from backend.core.query_profiler import query_count, query_profiler, QueryBudgetExceeded
+from backend.models.teacher import Teacher
+from backend.models.learning_experience import LearningExperience
+
+@pytest.fixture
+def app():
+    """Create test app"""
+    app = create_app('development')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _create_le(email):
+    """Create a teacher with one LE in unit 22"""
+    teacher = Teacher(
+        email=email,
+        first_name='Test',
+        last_name='Teacher',
+        password_hash='hash123'
+    )
+    db.session.add(teacher)
+    db.session.commit()
+    
+    le = LearningExperience(
+        teacher_id=teacher.id,
+        unit_number=22,
+        experience_number=1,
+        core_concept='Fractions',
+        learning_intention='Understand fractions',
+        success_criteria='["I can identify fractions"]',
+        subject='Maths',
+        year_level=6
+    )
+    db.session.add(le)
+    db.session.commit()
+    return teacher.id, le.id
+
+def test_repeated_lookups_cost_no_queries(app):
+    """Test that repeated query_by_id and find_by_* calls hit the cache"""
+    with app.app_context():
+        teacher_id, le_id = _create_le('db1@test.com')
+    
+    with app.app_context():
+        first = LearningExperience.query_by_id(le_id)
+        unit = LearningExperience.find_by_unit(teacher_id, 22)
+        before = query_count()
+        
+        assert LearningExperience.query_by_id(le_id) is first
+        assert LearningExperience.find_by_unit(teacher_id, 22) == unit
+        assert Teacher.find_by_email('db1@test.com') is not None
+        assert Teacher.find_by_email('db1@test.com') is not None
+        assert query_count() == before + 1
+        
+        print("✅ Repeated lookups cost no queries: PASS")
+
+def test_save_invalidates_lookups(app):
+    """Test that writes drop cached find_by_* results"""
+    with app.app_context():
+        teacher_id, le_id = _create_le('db2@test.com')
+    
+    with app.app_context():
+        assert len(LearningExperience.find_by_unit(teacher_id, 22)) == 1
+        
+        LearningExperience(
+            teacher_id=teacher_id,
+            unit_number=22,
+            experience_number=2,
+            core_concept='Decimals',
+            learning_intention='Understand decimals',
+            success_criteria='[]',
+            subject='Maths'
+        ).save()
+        assert len(LearningExperience.find_by_unit(teacher_id, 22)) == 2
+        
+        le = LearningExperience.query_by_id(le_id)
+        le.is_active = False
+        # Unflushed changes bypass the cache
+        assert len(LearningExperience.find_by_unit(teacher_id, 22)) == 1
+        
+        le.delete()
+        assert LearningExperience.query_by_id(le_id) is None
+        assert len(LearningExperience.find_by_unit(teacher_id, 22)) == 1
+        
+        print("✅ Save invalidates lookups: PASS")
+
+def _add_n_plus_one_route(app):
+    """Register an endpoint that looks teachers up one at a time"""
+    @app.route('/test/n-plus-one')
+    def n_plus_one():
+        for i in range(6):
+            Teacher.query.filter_by(email=f'missing{i}@test.com').first()
+        return {'ok': True}, 200
+
+def test_query_stats_headers_flag_repeated_statements(app):
+    """Test that repeated statement shapes are reported in development headers"""
+    _add_n_plus_one_route(app)
+    client = app.test_client()
+    
+    response = client.get('/test/n-plus-one')
+    
+    assert response.headers['X-Query-Count'] == '6'
+    assert float(response.headers['X-Query-Time-Ms']) >= 0
+    fingerprint, count = response.headers['X-Query-Repeated'].split('x')
+    assert count == '6'
+    
+    print("✅ Query stats headers flag repeated statements: PASS")
+
+def test_strict_mode_enforces_query_budget(app, monkeypatch):
+    """Test that strict mode raises once an endpoint exceeds its budget"""
+    _add_n_plus_one_route(app)
+    app.config['PROPAGATE_EXCEPTIONS'] = True
+    monkeypatch.setattr(query_profiler, 'strict', True)
+    monkeypatch.setattr(query_profiler, 'budgets', {'n_plus_one': 3})
+    client = app.test_client()
+    
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/test/n-plus-one')
+    
+    print("✅ Strict mode enforces query budget: PASS")
+
+def test_failed_statements_leave_no_timing_state(app):
+    """Test that statements that raise don't leave start times on pooled connections"""
+    with app.app_context():
+        for _ in range(3):
+            with pytest.raises(Exception):
+                db.session.execute(db.text('SELECT * FROM missing_table'))
+            db.session.rollback()
+        
+        before = query_count()
+        assert db.session.execute(db.text('SELECT 1')).scalar() == 1
+        assert query_count() == before + 1
+        assert not db.session.connection().info.get('query_start')
+        
+        print("✅ Failed statements leave no timing state: PASS")
+
+def test_serialize_many_from_core_rows_matches_to_dict(app):
+    """Test that Core rows and ORM objects serialize to the same JSON"""
+    with app.app_context():
+        teacher_id, le_id = _create_le('db3@test.com')
+        le = LearningExperience.query_by_id(le_id)
+        
+        expected = le.to_dict()
+        assert expected['created_at'] == le.created_at.isoformat()
+        assert set(expected) == {column.name for column in LearningExperience.__table__.columns}
+        
+        rows = db.session.execute(serializer_for(LearningExperience).select()).all()
+        from_rows = serialize_many(rows, LearningExperience)
+        from_objects = serialize_many([le], LearningExperience)
+        
+        assert app.json.loads(app.json.dumps(from_rows)) == [expected]
+        assert app.json.loads(app.json.dumps(from_objects)) == [expected]
+        
+        print("✅ Serialize many from Core rows matches to_dict: PASS")
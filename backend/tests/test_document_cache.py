@@ -0,0 +1,129 @@
+"""Tests for the generated document cache"""
+import pytest
+import json
+import os
+from datetime import datetime
+from backend.main import create_app
+from backend.core.database import db
+from backend.core.document_cache import document_cache
+from backend.models.teacher import Teacher
+from backend.models.learning_experience import LearningExperience
+from backend.models.lesson import Lesson
+from backend.services.worksheet_service import WorksheetService
+from backend.services.teacher_guide_generator import TeacherGuideGenerator
+from backend.services.answer_sheet_generator import AnswerSheetGenerator
+
+@pytest.fixture
+def app(tmp_path):
+    """Create test app with an isolated cache directory"""
+    app = create_app('development')
+    app.config['DOCUMENT_CACHE_DIR'] = str(tmp_path / 'cache')
+    document_cache.init_app(app)
+    document_cache.hits = 0
+    document_cache.misses = 0
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _create_lesson(email):
+    """Create a teacher, LE and lesson"""
+    teacher = Teacher(
+        email=email,
+        first_name='Test',
+        last_name='Teacher',
+        password_hash='hash123'
+    )
+    db.session.add(teacher)
+    db.session.commit()
+    
+    le = LearningExperience(
+        teacher_id=teacher.id,
+        unit_number=22,
+        experience_number=1,
+        core_concept='Fractions',
+        learning_intention='Understand fractions',
+        success_criteria=json.dumps(['I can identify fractions']),
+        subject='Maths',
+        year_level=6
+    )
+    db.session.add(le)
+    db.session.commit()
+    
+    lesson = Lesson(
+        teacher_id=teacher.id,
+        learning_experience_id=le.id,
+        week_number=1,
+        date_scheduled=datetime.now()
+    )
+    db.session.add(lesson)
+    db.session.commit()
+    return le, lesson
+
+def test_unchanged_inputs_hit_cache(app, tmp_path):
+    """Test that regenerating with the same inputs reuses the artifact"""
+    with app.app_context():
+        le, lesson = _create_lesson('cache1@test.com')
+        
+        first = TeacherGuideGenerator.generate(lesson.id, str(tmp_path))
+        second = TeacherGuideGenerator.generate(lesson.id, str(tmp_path))
+        
+        assert first['cached'] is False
+        assert second['cached'] is True
+        assert os.path.exists(second['file_path'])
+        assert document_cache.stats()['hits'] == 1
+        assert document_cache.stats()['misses'] == 1
+        
+        print("✅ Unchanged inputs hit cache: PASS")
+
+def test_regenerated_worksheets_with_same_content_hit_cache(app, tmp_path):
+    """Test that new worksheet and question IDs alone don't miss the cache"""
+    with app.app_context():
+        le, lesson = _create_lesson('cache1b@test.com')
+        WorksheetService.generate_worksheets(lesson.id)
+        first = AnswerSheetGenerator.generate(lesson.id, str(tmp_path))
+        
+        WorksheetService.generate_worksheets(lesson.id)
+        second = AnswerSheetGenerator.generate(lesson.id, str(tmp_path))
+        
+        assert first['cached'] is False
+        assert second['cached'] is True
+        
+        print("✅ Regenerated worksheets with same content hit cache: PASS")
+
+def test_changed_inputs_miss_cache(app, tmp_path):
+    """Test that editing a question invalidates the answer sheet"""
+    with app.app_context():
+        le, lesson = _create_lesson('cache2@test.com')
+        worksheets = WorksheetService.generate_worksheets(lesson.id)
+        
+        assert AnswerSheetGenerator.generate(lesson.id, str(tmp_path))['cached'] is False
+        assert AnswerSheetGenerator.generate(lesson.id, str(tmp_path))['cached'] is True
+        
+        question = WorksheetService.get_questions(worksheets['mild'].id)[0]
+        WorksheetService.update_question(question.id, model_answer='1/2')
+        
+        assert AnswerSheetGenerator.generate(lesson.id, str(tmp_path))['cached'] is False
+        
+        print("✅ Changed inputs miss cache: PASS")
+
+def test_eviction_keeps_cache_under_limit(app, tmp_path):
+    """Test that least-recently-used artifacts are evicted"""
+    with app.app_context():
+        le, lesson = _create_lesson('cache3@test.com')
+        
+        TeacherGuideGenerator.generate(lesson.id, str(tmp_path))
+        size = document_cache.stats()['size_bytes']
+        document_cache.max_bytes = size + size // 2
+        
+        le.core_concept = 'Decimals'
+        db.session.commit()
+        TeacherGuideGenerator.generate(lesson.id, str(tmp_path))
+        
+        stats = document_cache.stats()
+        assert stats['entries'] == 1
+        assert stats['size_bytes'] <= stats['max_bytes']
+        
+        print("✅ Eviction keeps cache under limit: PASS")
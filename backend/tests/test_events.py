@@ -0,0 +1,142 @@
+"""Tests for live Server-Sent Events"""
+import pytest
+import json
+import threading
+import time
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from backend.main import create_app
+from backend.core.database import db
+from backend.core.events import LocalBroker, event_broker
+from backend.core.jobs import job_queue
+from backend.models.teacher import Teacher
+from backend.models.student import Student
+from backend.models.learning_experience import LearningExperience
+from backend.services.evidence_service import EvidenceService
+from backend.services.lesson_service import LessonService
+from backend.services.student_progress_service import StudentProgressService
+
+@pytest.fixture
+def app():
+    """Create test app with the in-process broker, short streams and no job workers"""
+    app = create_app('development')
+    app.config['REDIS_URL'] = None
+    app.config['JOB_WORKERS'] = 0
+    app.config['EVENTS_HEARTBEAT_SECONDS'] = 0.05
+    app.config['EVENTS_STREAM_MAX_SECONDS'] = 0.2
+    event_broker.init_app(app)
+    job_queue.init_app(app)
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _setup(email):
+    """Create a teacher, a student, an LE and a lesson"""
+    teacher = Teacher(email=email, first_name='Test', last_name='Teacher', password_hash='hash123')
+    student = Student(first_name='Sam', last_name='Student', year_level=6)
+    db.session.add_all([teacher, student])
+    db.session.commit()
+    
+    le = LearningExperience(
+        teacher_id=teacher.id, unit_number=22, experience_number=1, core_concept='Concept',
+        learning_intention='Learn', success_criteria=['I can one'], subject='Maths'
+    )
+    db.session.add(le)
+    db.session.commit()
+    lesson = LessonService.create_lesson(teacher.id, le.id, 4, datetime(2024, 2, 5, 9))
+    return teacher.id, student.id, le.id, lesson.id
+
+def _parse(body):
+    """SSE text to a list of (id, event, data) for the events in it"""
+    events = []
+    for block in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+def test_local_broker_channels_resume_and_reset():
+    """Test per-channel numbering, Last-Event-ID replay, history overflow and wake-up"""
+    broker = LocalBroker(history_size=3)
+    for i in range(1, 5):
+        broker.publish('t1', 'progress', {'n': i})
+    broker.publish('t2', 'job', {})
+    
+    listener = broker.listen('t1', 2, timeout=0.01)
+    assert [next(listener)['id'] for _ in range(2)] == [3, 4]
+    assert next(listener) is None
+    
+    # Event 1 has left the 3-event history, so a client at 0 must refetch
+    assert next(broker.listen('t1', 0, timeout=0.01)) == {'id': 4, 'event': 'reset', 'data': {}}
+    # An ID from before a restart is ahead of this broker
+    assert next(broker.listen('t2', 9, timeout=0.01))['event'] == 'reset'
+    
+    waiting = broker.listen('t1', None, timeout=5)
+    threading.Timer(0.05, broker.publish, ('t1', 'progress', {'n': 5})).start()
+    started = time.monotonic()
+    assert next(waiting)['data'] == {'n': 5}
+    assert time.monotonic() - started < 1
+    
+    print("✅ Local broker channels, resume and reset: PASS")
+
+def test_progress_and_job_events_published_after_commit(app):
+    """Test that committed progress changes and finished jobs reach the teacher's channel"""
+    with app.app_context():
+        teacher_id, student_id, le_id, lesson_id = _setup('ev1@test.com')
+        listener = event_broker.listen(teacher_id, 0, timeout=0.01)
+        
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observed', 3, success_criteria_ids=['0'])
+        progress = next(listener)
+        assert progress['event'] == 'progress'
+        assert progress['data']['student_id'] == student_id
+        assert progress['data']['mastery_level'] == 3
+        assert progress['data']['success_criteria_met'] == 1
+        
+        # Rolled-back writes publish nothing
+        StudentProgressService.update_progress(student_id, le_id, commit=False)
+        db.session.rollback()
+        assert next(listener) is None
+        
+        job = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id}, teacher_id=teacher_id)
+        job_queue.run_next(timeout=0.1)
+        finished = next(listener)
+        assert finished['event'] == 'job'
+        assert finished['data']['id'] == job['id']
+        assert finished['data']['status'] == 'succeeded'
+        assert finished['data']['lesson_id'] == lesson_id
+        
+        print("✅ Progress and job events published after commit: PASS")
+
+def test_event_stream_endpoint(app):
+    """Test the SSE endpoint, Last-Event-ID resume and query-string tokens"""
+    with app.app_context():
+        teacher_id, student_id, le_id, lesson_id = _setup('ev2@test.com')
+        other_id = _setup('ev2-other@test.com')[0]
+        token = create_access_token(identity=teacher_id)
+        client = app.test_client()
+        
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observed', 2)
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observed again', 4)
+        event_broker.publish(other_id, 'progress', {})
+        
+        response = client.get('/api/v1/events/stream', headers={
+            'Authorization': f'Bearer {token}', 'Last-Event-ID': '0'
+        })
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        events = _parse(response.get_data(as_text=True))
+        assert [(e[0], e[1]) for e in events] == [(1, 'progress'), (2, 'progress')]
+        assert events[1][2]['mastery_level'] == 4
+        
+        response = client.get(f'/api/v1/events/stream?jwt={token}&last_event_id=1')
+        assert [e[0] for e in _parse(response.get_data(as_text=True))] == [2]
+        
+        response = client.get('/api/v1/events/stream', headers={
+            'Authorization': f'Bearer {token}', 'Last-Event-ID': 'latest'
+        })
+        assert response.status_code == 400
+        
+        print("✅ Event stream endpoint: PASS")
@@ -0,0 +1,443 @@
+"""Tests for Evidence logging and StudentProgress aggregation"""
+import pytest
+import json
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from backend.main import create_app
+from sqlalchemy.dialects import postgresql
+from backend.core import search
+from backend.core.database import db
+from backend.models.teacher import Teacher
+from backend.models.student import Student
+from backend.models.learning_experience import LearningExperience
+from backend.models.student_progress import StudentProgress
+from backend.services.evidence_service import EvidenceService
+from backend.services.learning_experience_service import LearningExperienceService
+from backend.services.student_progress_service import StudentProgressService
+from backend.core.query_profiler import query_count
+from backend.utils.helpers import encode_cursor
+
+@pytest.fixture
+def app():
+    """Create test app"""
+    app = create_app('development')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _setup(email):
+    """Create a teacher, student and LE with three success criteria"""
+    teacher = Teacher(
+        email=email,
+        first_name='Test',
+        last_name='Teacher',
+        password_hash='hash123'
+    )
+    student = Student(first_name='Sam', last_name='Student', year_level=6)
+    db.session.add_all([teacher, student])
+    db.session.commit()
+    
+    le = LearningExperience(
+        teacher_id=teacher.id,
+        unit_number=22,
+        experience_number=1,
+        core_concept='Fractions',
+        learning_intention='Understand fractions',
+        success_criteria=json.dumps(['I can identify', 'I can compare', 'I can order']),
+        subject='Maths',
+        year_level=6
+    )
+    db.session.add(le)
+    db.session.commit()
+    return teacher.id, student.id, le.id
+
+def test_log_evidence_updates_progress(app):
+    """Test that logging evidence applies counters to progress"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev1@test.com')
+        
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Identified 1/2', 2,
+                                     success_criteria_ids=['0'])
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Compared 1/2 and 1/3', 3,
+                                     success_criteria_ids=['0', '1'])
+        
+        progress = StudentProgressService.get_progress(student_id, le_id)
+        assert progress.evidence_count == 2
+        assert progress.mastery_level == 3
+        assert progress.get_success_criteria_hits() == {'0': 2, '1': 1}
+        assert progress.get_success_criteria_status() == {'0': 'met', '1': 'met', '2': 'not_met'}
+        assert StudentProgressService.verify_progress(student_id, le_id) == []
+        
+        print("✅ Log evidence updates progress: PASS")
+
+def test_trend_from_running_counters(app):
+    """Test that the trend compares the recent window against older evidence"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev2@test.com')
+        
+        for level in [1, 1, 3, 3, 4]:
+            EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observation', level)
+        
+        progress = StudentProgressService.get_progress(student_id, le_id)
+        assert progress.trend == 'improving'
+        assert StudentProgressService.verify_progress(student_id, le_id) == []
+        
+        print("✅ Trend from running counters: PASS")
+
+def test_update_evidence_applies_delta(app):
+    """Test that editing evidence swaps old values for new ones"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev3@test.com')
+        
+        evidence = EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observation', 4,
+                                                success_criteria_ids=['2'])
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observation', 2)
+        
+        EvidenceService.update_evidence(evidence.id, mastery_level=1, success_criteria_ids=['1'])
+        
+        progress = StudentProgressService.get_progress(student_id, le_id)
+        assert progress.mastery_level == 2
+        assert progress.get_mastery_counts() == {'1': 1, '2': 1}
+        assert progress.get_success_criteria_hits() == {'1': 1}
+        assert StudentProgressService.verify_progress(student_id, le_id) == []
+        
+        print("✅ Update evidence applies delta: PASS")
+
+def test_delete_evidence_refills_window(app):
+    """Test that deleting recent evidence keeps counters consistent"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev4@test.com')
+        
+        logged = [
+            EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observation', level)
+            for level in [2, 1, 3, 4]
+        ]
+        start = datetime(2024, 2, 1)
+        for i, evidence in enumerate(logged):
+            EvidenceService.update_evidence(evidence.id, observation_date=start + timedelta(days=i))
+        
+        EvidenceService.delete_evidence(logged[-1].id)
+        
+        progress = StudentProgressService.get_progress(student_id, le_id)
+        assert progress.evidence_count == 3
+        assert progress.mastery_level == 3
+        assert progress.last_evidence_date == start + timedelta(days=2)
+        assert StudentProgressService.verify_progress(student_id, le_id) == []
+        
+        EvidenceService.delete_evidence(logged[0].id)
+        EvidenceService.delete_evidence(logged[1].id)
+        EvidenceService.delete_evidence(logged[2].id)
+        
+        progress = StudentProgressService.get_progress(student_id, le_id)
+        assert progress.evidence_count == 0
+        assert progress.mastery_level == 1
+        assert progress.last_evidence_date is None
+        
+        print("✅ Delete evidence refills window: PASS")
+
+def test_legacy_progress_falls_back_to_recompute(app):
+    """Test that progress rows without counters are rebuilt on the next write"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev5@test.com')
+        
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observation', 3)
+        
+        progress = StudentProgress.find_by_student_and_le(student_id, le_id)
+        progress.mastery_counts = None
+        progress.trend_window = None
+        db.session.commit()
+        
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observation', 2)
+        
+        progress = StudentProgressService.get_progress(student_id, le_id)
+        assert progress.evidence_count == 2
+        assert progress.get_mastery_counts() == {'3': 1, '2': 1}
+        assert StudentProgressService.verify_progress(student_id, le_id) == []
+        
+        print("✅ Legacy progress falls back to recompute: PASS")
+
+def test_update_evidence_on_legacy_progress(app):
+    """Test that editing evidence on a row without counters counts it once"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev5b@test.com')
+        
+        evidence = EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observation', 3)
+        
+        progress = StudentProgress.find_by_student_and_le(student_id, le_id)
+        progress.mastery_counts = None
+        progress.trend_window = None
+        db.session.commit()
+        
+        EvidenceService.update_evidence(evidence.id, mastery_level=2)
+        
+        progress = StudentProgressService.get_progress(student_id, le_id)
+        assert progress.evidence_count == 1
+        assert progress.get_mastery_counts() == {'2': 1}
+        assert StudentProgressService.verify_progress(student_id, le_id) == []
+        
+        print("✅ Update evidence on legacy progress: PASS")
+
+def test_log_evidence_batch(app):
+    """Test that a batch of observations is logged with progress per pair"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev6@test.com')
+        other = Student(first_name='Alex', last_name='Student', year_level=6)
+        db.session.add(other)
+        db.session.commit()
+        other_id = other.id
+        
+        observations = [
+            {'student_id': student_id, 'learning_experience_id': le_id,
+             'observation_text': 'Compared fractions', 'mastery_level': 3,
+             'success_criteria_ids': ['1']},
+            {'student_id': student_id, 'learning_experience_id': le_id,
+             'observation_text': 'Ordered fractions', 'mastery_level': 4},
+            {'student_id': other_id, 'learning_experience_id': le_id,
+             'observation_text': 'Identified fractions', 'mastery_level': 2}
+        ]
+        
+        results, ok = EvidenceService.log_evidence_batch(teacher_id, observations)
+        
+        assert ok
+        assert [r['index'] for r in results] == [0, 1, 2]
+        assert results[0]['evidence']['observation_text'] == 'Compared fractions'
+        assert results[0]['evidence']['teacher_id'] == teacher_id
+        
+        progress = StudentProgressService.get_progress(student_id, le_id)
+        assert progress.evidence_count == 2
+        assert progress.mastery_level == 4
+        assert progress.get_success_criteria_hits() == {'1': 1}
+        assert StudentProgressService.verify_progress(student_id, le_id) == []
+        assert StudentProgressService.get_progress(other_id, le_id).evidence_count == 1
+        
+        print("✅ Log evidence batch: PASS")
+
+def test_log_evidence_batch_rejects_invalid(app):
+    """Test that one invalid observation rejects the whole batch"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev7@test.com')
+        
+        observations = [
+            {'student_id': student_id, 'learning_experience_id': le_id,
+             'observation_text': 'Compared fractions', 'mastery_level': 3},
+            {'student_id': student_id, 'learning_experience_id': le_id,
+             'observation_text': 'Ordered fractions', 'mastery_level': 7}
+        ]
+        
+        results, ok = EvidenceService.log_evidence_batch(teacher_id, observations)
+        
+        assert not ok
+        assert 'error' not in results[0]
+        assert results[1]['error'] == 'Mastery level must be 1-4'
+        assert EvidenceService.get_student_evidence(student_id) == []
+        
+        print("✅ Log evidence batch rejects invalid: PASS")
+
+def test_student_evidence_pages_newest_first(app):
+    """Test that evidence pages run newest first without gaps or repeats"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev8@test.com')
+        
+        start = datetime(2024, 2, 1)
+        for i in range(5):
+            evidence = EvidenceService.log_evidence(teacher_id, student_id, le_id, f'Observation {i}', 2)
+            EvidenceService.update_evidence(evidence.id, observation_date=start + timedelta(days=i))
+        
+        first, cursor = EvidenceService.get_student_evidence_page(student_id, limit=3)
+        second, end = EvidenceService.get_student_evidence_page(student_id, cursor=cursor, limit=3)
+        
+        assert [row.observation_text for row in first] == ['Observation 4', 'Observation 3', 'Observation 2']
+        assert [row.observation_text for row in second] == ['Observation 1', 'Observation 0']
+        assert end is None
+        
+        print("✅ Student evidence pages newest first: PASS")
+
+def test_malformed_cursor_values_are_rejected(app):
+    """Test that cursors holding nested values get a 400 instead of reaching SQL"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev8b@test.com')
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observed', 2)
+        headers = {'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'}
+        client = app.test_client()
+        
+        for values in ([[1], 'x'], [{'at': '2024-01-01'}, 'x'], [{'dt': 5}, 'x'], [{'dt': '2024-01-01', 'x': 1}, 'x']):
+            response = client.get('/api/v1/evidence/teacher', query_string={'cursor': encode_cursor(values)}, headers=headers)
+            assert response.status_code == 400
+        
+        valid = encode_cursor([datetime(2024, 1, 1), 'id'])
+        assert client.get('/api/v1/evidence/teacher', query_string={'cursor': valid}, headers=headers).status_code == 200
+        
+        print("✅ Malformed cursor values are rejected: PASS")
+
+def test_sc_coverage_aggregates_in_sql(app):
+    """Test SC coverage and 'who has met SC n' answered from the JSON documents"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev9@test.com')
+        other = Student(first_name='Alex', last_name='Other', year_level=6)
+        db.session.add(other)
+        db.session.commit()
+        
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Identified', 2, success_criteria_ids=['0', '1'])
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Compared', 3, success_criteria_ids=['1'])
+        EvidenceService.log_evidence(teacher_id, other.id, le_id, 'Identified', 2, success_criteria_ids=['0'])
+        
+        coverage = StudentProgressService.get_sc_coverage(le_id)
+        assert [(c['sc_id'], c['criterion'], c['met'], c['not_met']) for c in coverage] == [
+            ('0', 'I can identify', 2, 0),
+            ('1', 'I can compare', 1, 1),
+            ('2', 'I can order', 0, 2)
+        ]
+        assert StudentProgressService.get_students_meeting_sc(le_id, '1') == [student_id]
+        assert sorted(StudentProgressService.get_students_meeting_sc(le_id, 0)) == sorted([student_id, other.id])
+        
+        assert EvidenceService.get_sc_evidence_counts(le_id) == {
+            '0': {'evidence_count': 2, 'student_count': 2},
+            '1': {'evidence_count': 2, 'student_count': 1}
+        }
+        assert EvidenceService.get_sc_evidence_counts(le_id, student_id=other.id) == {
+            '0': {'evidence_count': 1, 'student_count': 1}
+        }
+        
+        # Stored as JSON documents, read back as lists and dicts
+        evidence = EvidenceService.get_student_evidence(student_id)[0]
+        assert isinstance(evidence.to_dict()['success_criteria_ids'], list)
+        assert db.session.get(LearningExperience, le_id).success_criteria[0] == 'I can identify'
+        
+        print("✅ SC coverage aggregates in SQL: PASS")
+
+def test_sc_coverage_endpoint_follows_le_edits(app):
+    """Test that editing the LE's criteria refreshes the cached coverage body and its ETag"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev9b@test.com')
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Identified', 2, success_criteria_ids=['0'])
+        headers = {'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'}
+        client = app.test_client()
+        url = f'/api/v1/evidence/progress/le/{le_id}/success-criteria'
+        
+        first = client.get(url, headers=headers)
+        assert first.get_json()['success_criteria'][0]['criterion'] == 'I can identify'
+        
+        LearningExperienceService.update_le(le_id, success_criteria=['I can name', 'I can compare', 'I can order'])
+        
+        second = client.get(url, headers={**headers, 'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+        assert second.get_json()['success_criteria'][0]['criterion'] == 'I can name'
+        assert second.headers['ETag'] != first.headers['ETag']
+        
+        print("✅ SC coverage endpoint follows LE edits: PASS")
+
+def test_sc_coverage_endpoints_are_teacher_scoped(app):
+    """Test another teacher can't read a LE's SC coverage or the students meeting a criterion"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev9c@test.com')
+        other_id, _, _ = _setup('ev9d@test.com')
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Identified', 2, success_criteria_ids=['0'])
+        client = app.test_client()
+        urls = [
+            f'/api/v1/evidence/progress/le/{le_id}/success-criteria',
+            f'/api/v1/evidence/progress/le/{le_id}/success-criteria/0/students'
+        ]
+        
+        for url in urls:
+            owner = client.get(url, headers={'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'})
+            assert owner.status_code == 200
+            other = client.get(url, headers={'Authorization': f'Bearer {create_access_token(identity=other_id)}'})
+            assert other.status_code == 404
+            assert student_id not in other.get_data(as_text=True)
+        
+        print("✅ SC coverage endpoints are teacher-scoped: PASS")
+
+def test_unit_matrix_is_one_query(app):
+    """Test the columnar unit mastery matrix and that it reads in a single query"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev10@test.com')
+        other = Student(first_name='Alex', last_name='Adams', year_level=6)
+        le2 = LearningExperience(
+            teacher_id=teacher_id, unit_number=22, experience_number=2, core_concept='Decimals',
+            learning_intention='Understand decimals', success_criteria=['I can read decimals'],
+            subject='Maths', year_level=6
+        )
+        db.session.add_all([other, le2])
+        db.session.commit()
+        
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Identified', 2, success_criteria_ids=['0', '1'])
+        EvidenceService.log_evidence(teacher_id, other.id, le2.id, 'Read 0.5', 4, success_criteria_ids=['0'])
+        
+        before = query_count()
+        matrix = StudentProgressService.get_unit_matrix(teacher_id, 22)
+        assert query_count() - before == 1
+        
+        assert matrix['learning_experiences']['id'] == [le_id, le2.id]
+        assert matrix['learning_experiences']['success_criteria_count'] == [3, 1]
+        assert matrix['students']['id'] == [other.id, student_id]  # Adams before Student
+        assert matrix['mastery_level'] == [[None, 4], [2, None]]
+        assert matrix['success_criteria_met'] == [[None, 1], [2, None]]
+        assert matrix['evidence_count'] == [[None, 1], [1, None]]
+        
+        assert StudentProgressService.get_unit_matrix(teacher_id, 99)['students']['id'] == []
+        
+        print("✅ Unit matrix is one query: PASS")
+
+def test_search_evidence_ranked_and_scoped(app):
+    """Test full-text search ranking, phrases, filters, paging and index sync"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev12@test.com')
+        other = Student(first_name='Alex', last_name='Student', year_level=6)
+        db.session.add(other)
+        db.session.commit()
+        
+        best = EvidenceService.log_evidence(teacher_id, student_id, le_id,
+                                            'Explained equivalent fractions with a fraction wall', 3)
+        notes_only = EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Worked on a number line', 2,
+                                                  notes='Still unsure about equivalent fractions')
+        EvidenceService.log_evidence(teacher_id, other.id, le_id, 'Found equivalent fractions by folding', 4)
+        EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Ordered decimals', 2)
+        
+        rows, next_cursor = EvidenceService.search_evidence(teacher_id, 'equivalent fraction', student_id=student_id)
+        assert [row.id for row in rows] == [best.id, notes_only.id]
+        assert next_cursor is None
+        
+        # Phrases must match in order; FTS syntax in input is searched literally
+        rows, _ = EvidenceService.search_evidence(teacher_id, '"fractions equivalent"')
+        assert rows == []
+        assert EvidenceService.search_evidence(teacher_id, 'decimals OR (walls')[0] == []
+        
+        first, cursor = EvidenceService.search_evidence(teacher_id, 'equivalent', limit=2)
+        rest, last_cursor = EvidenceService.search_evidence(teacher_id, 'equivalent', cursor=cursor, limit=2)
+        assert len(first) == 2 and len(rest) == 1 and last_cursor is None
+        assert {row.id for row in first + rest} == {row.id for row in first} | {rest[0].id}
+        
+        # Edits and deletes are reflected in the index
+        EvidenceService.update_evidence(notes_only.id, notes='Confident now')
+        EvidenceService.delete_evidence(best.id)
+        rows, _ = EvidenceService.search_evidence(teacher_id, 'equivalent', student_id=student_id)
+        assert rows == []
+        assert len(EvidenceService.search_evidence(teacher_id, 'confident')[0]) == 1
+        
+        print("✅ Search evidence ranked and scoped: PASS")
+
+def test_search_paging_over_tied_ranks(app):
+    """Test search pages neither skip nor repeat rows tied on rank at a page boundary"""
+    with app.app_context():
+        teacher_id, student_id, le_id = _setup('ev12b@test.com')
+        ids = [
+            EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Compared fractions on a number line', 2).id
+            for _ in range(5)
+        ]
+        
+        seen, cursor = [], None
+        while True:
+            rows, cursor = EvidenceService.search_evidence(teacher_id, 'fractions', cursor=cursor, limit=2)
+            seen += [row.id for row in rows]
+            if cursor is None:
+                break
+        assert seen == sorted(ids, reverse=True)
+        
+        # The Postgres rank is compared as a double, like the cursor value
+        _, rank, _ = search.match('fractions', postgresql.dialect())
+        assert 'AS FLOAT(53)' in str(rank.compile(dialect=postgresql.dialect()))
+        
+        print("✅ Search paging over tied ranks: PASS")
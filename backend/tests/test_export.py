@@ -0,0 +1,141 @@
+"""Tests for streaming CSV/NDJSON exports"""
+import pytest
+import csv
+import io
+import json
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from backend.main import create_app
+from backend.core.database import db
+from backend.models.teacher import Teacher
+from backend.models.student import Student
+from backend.models.learning_experience import LearningExperience
+from backend.models.lesson import Lesson
+from backend.services.evidence_service import EvidenceService
+from backend.services.data_export_service import DataExportService
+
+@pytest.fixture
+def app():
+    """Create test app"""
+    app = create_app('development')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _setup(email):
+    """Create a teacher with two LEs, three students and dated evidence"""
+    teacher = Teacher(email=email, first_name='Test', last_name='Teacher', password_hash='hash123')
+    db.session.add(teacher)
+    db.session.commit()
+    
+    students = [Student(first_name=f'S{i}', last_name='Student', year_level=6) for i in range(3)]
+    les = [
+        LearningExperience(
+            teacher_id=teacher.id, unit_number=22, experience_number=n, core_concept=f'Concept {n}',
+            learning_intention='Learn', success_criteria=['I can one', 'I can two'], subject='Maths'
+        )
+        for n in (1, 2)
+    ]
+    db.session.add_all(students + les)
+    db.session.commit()
+    
+    for day, student in enumerate(students, start=1):
+        for le in les:
+            evidence = EvidenceService.log_evidence(teacher.id, student.id, le.id, 'Observed, with "quotes"', 3,
+                                                    success_criteria_ids=['0'])
+            EvidenceService.update_evidence(evidence.id, observation_date=datetime(2024, 3, day, 10))
+    return teacher.id, [le.id for le in les]
+
+def test_csv_and_ndjson_exports(app):
+    """Test both formats and the LE and date filters"""
+    with app.app_context():
+        teacher_id, les = _setup('ex1@test.com')
+        headers = {'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'}
+        client = app.test_client()
+        
+        response = client.get('/api/v1/exports/evidence?format=csv', headers=headers)
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert 'attachment; filename=evidence.csv' == response.headers['Content-Disposition']
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        assert len(rows) == 6
+        assert rows[0]['observation_text'] == 'Observed, with "quotes"'
+        assert json.loads(rows[0]['success_criteria_ids']) == ['0']
+        assert [r['observation_date'][:10] for r in rows] == sorted(r['observation_date'][:10] for r in rows)
+        
+        response = client.get(
+            f'/api/v1/exports/evidence?format=ndjson&learning_experience_id={les[0]}&from=2024-03-02&to=2024-03-03',
+            headers=headers
+        )
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert len(lines) == 2
+        assert {line['learning_experience_id'] for line in lines} == {les[0]}
+        assert lines[0]['observation_date'].startswith('2024-03-02')
+        
+        progress = client.get(f'/api/v1/exports/progress?format=ndjson&learning_experience_id={les[1]}', headers=headers)
+        assert len(progress.get_data(as_text=True).splitlines()) == 3
+        
+        db.session.add(Lesson(teacher_id=teacher_id, learning_experience_id=les[0], week_number=1,
+                              date_scheduled=datetime(2024, 3, 4)))
+        db.session.commit()
+        lessons = client.get('/api/v1/exports/lessons', headers=headers).get_data(as_text=True)
+        assert len(list(csv.DictReader(io.StringIO(lessons)))) == 1
+        
+        print("✅ CSV and NDJSON exports: PASS")
+
+def test_export_streams_in_batches(app):
+    """Test that rows are fetched and encoded one batch at a time"""
+    with app.app_context():
+        teacher_id, les = _setup('ex2@test.com')
+        query, model_class = DataExportService.build_query('evidence', teacher_id)
+        
+        chunks = list(DataExportService.stream(query, model_class, 'csv', batch_size=4))
+        assert len(chunks) == 3  # Header, then batches of 4 and 2 rows
+        assert chunks[0].startswith(b'teacher_id,student_id,')
+        assert [len(chunk.splitlines()) for chunk in chunks[1:]] == [4, 2]
+        
+        print("✅ Export streams in batches: PASS")
+
+def test_export_validation(app):
+    """Test that unknown datasets, formats and dates are rejected"""
+    with app.app_context():
+        teacher_id, les = _setup('ex3@test.com')
+        headers = {'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'}
+        client = app.test_client()
+        
+        assert client.get('/api/v1/exports/teachers', headers=headers).status_code == 404
+        assert client.get('/api/v1/exports/evidence?format=xlsx', headers=headers).status_code == 400
+        assert client.get('/api/v1/exports/evidence?from=March', headers=headers).status_code == 400
+        
+        print("✅ Export validation: PASS")
+
+def test_parquet_and_arrow_exports(app):
+    """Test the typed columnar exports"""
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    
+    with app.app_context():
+        teacher_id, les = _setup('ex4@test.com')
+        headers = {'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'}
+        client = app.test_client()
+        
+        response = client.get('/api/v1/exports/evidence?format=parquet', headers=headers)
+        assert response.status_code == 200
+        table = pq.read_table(io.BytesIO(response.get_data()))
+        assert table.num_rows == 6
+        assert table.schema.field('mastery_level').type == pa.int8()
+        assert table.schema.field('observation_date').type == pa.timestamp('us')
+        assert table.schema.field('success_criteria_ids').type == pa.list_(pa.int32())
+        assert table.column('success_criteria_ids').to_pylist()[0] == [0]
+        assert table.column('observation_date').to_pylist()[0] == datetime(2024, 3, 1, 10)
+        
+        response = client.get(f'/api/v1/exports/progress?format=arrow&learning_experience_id={les[0]}', headers=headers)
+        table = pa.ipc.open_stream(response.get_data()).read_all()
+        assert table.num_rows == 3
+        assert table.column('success_criteria_status').to_pylist()[0] [:1] == [(0, 'met')]
+        
+        print("✅ Parquet and Arrow exports: PASS")
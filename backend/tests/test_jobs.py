@@ -0,0 +1,183 @@
+"""Tests for the background job queue"""
+import pytest
+import json
+from datetime import datetime
+from backend.main import create_app
+from backend.core.database import db
+from backend.core.jobs import job_queue
+from backend.models.teacher import Teacher
+from backend.models.learning_experience import LearningExperience
+from backend.models.lesson import Lesson
+
+@pytest.fixture
+def app():
+    """Create test app with an in-process queue and no background workers"""
+    app = create_app('development')
+    app.config['REDIS_URL'] = None
+    app.config['JOB_WORKERS'] = 0
+    job_queue.init_app(app)
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _create_lesson(email):
+    """Create a teacher, LE and lesson"""
+    teacher = Teacher(
+        email=email,
+        first_name='Test',
+        last_name='Teacher',
+        password_hash='hash123'
+    )
+    db.session.add(teacher)
+    db.session.commit()
+    
+    le = LearningExperience(
+        teacher_id=teacher.id,
+        unit_number=22,
+        experience_number=1,
+        core_concept='Fractions',
+        learning_intention='Understand fractions',
+        success_criteria=json.dumps(['I can identify fractions']),
+        subject='Maths',
+        year_level=6
+    )
+    db.session.add(le)
+    db.session.commit()
+    
+    lesson = Lesson(
+        teacher_id=teacher.id,
+        learning_experience_id=le.id,
+        week_number=1,
+        date_scheduled=datetime.now()
+    )
+    db.session.add(lesson)
+    db.session.commit()
+    return teacher.id, lesson.id
+
+def test_identical_pending_jobs_are_deduplicated(app):
+    """Test that queuing the same job twice returns the pending job"""
+    with app.app_context():
+        teacher_id, lesson_id = _create_lesson('job1@test.com')
+        
+        first = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id}, teacher_id=teacher_id)
+        second = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id}, teacher_id=teacher_id)
+        
+        assert first['id'] == second['id']
+        metrics = job_queue.metrics()
+        assert metrics['queue_depth']['normal'] == 1
+        assert metrics['counters']['deduplicated'] == 1
+        
+        print("✅ Identical pending jobs are deduplicated: PASS")
+
+def test_enqueue_racing_a_claim_is_deduplicated(app):
+    """Test that an enqueue arriving right after another's claim joins that job"""
+    with app.app_context():
+        teacher_id, lesson_id = _create_lesson('job1b@test.com')
+        claim_pending = job_queue.backend.claim_pending
+        racing = []
+        
+        def claim_then_race(fingerprint, job_id):
+            existing = claim_pending(fingerprint, job_id)
+            # The identical request lands once, between the first claim and its push
+            if not racing:
+                racing.append(None)
+                racing[0] = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id}, teacher_id=teacher_id)
+            return existing
+        
+        job_queue.backend.claim_pending = claim_then_race
+        try:
+            first = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id}, teacher_id=teacher_id)
+        finally:
+            job_queue.backend.claim_pending = claim_pending
+        
+        assert racing[0]['id'] == first['id']
+        assert job_queue.metrics()['queue_depth']['normal'] == 1
+        assert job_queue.run_next(timeout=0.1)['id'] == first['id']
+        
+        print("✅ Enqueue racing a claim is deduplicated: PASS")
+
+def test_high_priority_lane_runs_first(app):
+    """Test that the high lane is drained before normal and low"""
+    with app.app_context():
+        teacher_id, lesson_id = _create_lesson('job2@test.com')
+        
+        low = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id}, teacher_id=teacher_id, lane='low')
+        high = job_queue.enqueue('generate_support_files', {'lesson_id': lesson_id}, teacher_id=teacher_id, lane='high')
+        
+        assert job_queue.run_next(timeout=0.1)['id'] == high['id']
+        assert job_queue.run_next(timeout=0.1)['id'] == low['id']
+        assert job_queue.run_next(timeout=0.1) is None
+        
+        print("✅ High priority lane runs first: PASS")
+
+def test_job_result_and_failure(app):
+    """Test that finished jobs record their result or error"""
+    with app.app_context():
+        teacher_id, lesson_id = _create_lesson('job3@test.com')
+        
+        ok = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id}, teacher_id=teacher_id)
+        bad = job_queue.enqueue('generate_worksheets', {'lesson_id': 'missing'}, teacher_id=teacher_id)
+        job_queue.run_next(timeout=0.1)
+        job_queue.run_next(timeout=0.1)
+        
+        ok = job_queue.get(ok['id'])
+        assert ok['status'] == 'succeeded'
+        assert set(ok['result']['worksheets']) == {'mild', 'medium', 'spicy', 'enrichment'}
+        
+        bad = job_queue.get(bad['id'])
+        assert bad['status'] == 'failed'
+        assert bad['error'] == 'Failed to generate worksheets'
+        assert job_queue.metrics()['counters']['failed'] == 1
+        
+        print("✅ Job result and failure: PASS")
+
+def test_jobs_abandoned_by_a_stopped_worker_are_requeued(app):
+    """Test that a job whose worker died mid-run is requeued, then failed after max attempts"""
+    with app.app_context():
+        teacher_id, lesson_id = _create_lesson('job4@test.com')
+        handlers = dict(job_queue.handlers)
+        lease_seconds = job_queue.lease_seconds
+        
+        def worker_dies(**payload):
+            raise SystemExit()
+        
+        def run_and_die():
+            with pytest.raises(SystemExit):
+                job_queue.run_next(timeout=0.1)
+        
+        job_queue.handlers['generate_worksheets'] = worker_dies
+        job_queue.handlers['generate_support_files'] = worker_dies
+        job_queue.lease_seconds = 0
+        try:
+            job = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id}, teacher_id=teacher_id)
+            run_and_die()
+            assert job_queue.get(job['id'])['status'] == 'running'
+            
+            # The dead job is queued again, and identical requests join it
+            assert job_queue.requeue_stale() == 1
+            assert job_queue.get(job['id'])['status'] == 'queued'
+            again = job_queue.enqueue('generate_worksheets', {'lesson_id': lesson_id}, teacher_id=teacher_id)
+            assert again['id'] == job['id']
+            
+            job_queue.handlers['generate_worksheets'] = handlers['generate_worksheets']
+            assert job_queue.run_next(timeout=0.1)['status'] == 'succeeded'
+            assert job_queue.requeue_stale() == 0
+            
+            # A job that keeps killing its worker is eventually failed
+            job = job_queue.enqueue('generate_support_files', {'lesson_id': lesson_id}, teacher_id=teacher_id)
+            for _ in range(job_queue.max_attempts):
+                run_and_die()
+                assert job_queue.requeue_stale() == 1
+        finally:
+            job_queue.handlers.update(handlers)
+            job_queue.lease_seconds = lease_seconds
+        
+        failed = job_queue.get(job['id'])
+        assert failed['status'] == 'failed'
+        assert failed['attempts'] == job_queue.max_attempts
+        assert job_queue.metrics()['counters']['requeued'] == job_queue.max_attempts
+        
+        print("✅ Jobs abandoned by a stopped worker are requeued: PASS")
@@ -7,6 +7,7 @@ from backend.core.database import db
 from backend.models.teacher import Teacher
 from backend.models.learning_experience import LearningExperience
 from backend.models.lesson import Lesson
+from backend.services.lesson_service import LessonService
 
 @pytest.fixture
 def app():
@@ -369,3 +370,58 @@ def test_lesson_archive(app):
         lesson.archive()
         assert lesson.status == 'archived'
         print("✅ Lesson archive: PASS")
+
+def test_get_lessons_page_walks_keyset(app):
+    """Test that cursor pages cover every lesson once, in schedule order"""
+    with app.app_context():
+        teacher = Teacher(
+            email='pages@test.com',
+            first_name='Test',
+            last_name='Teacher',
+            password_hash='hash123'
+        )
+        db.session.add(teacher)
+        db.session.commit()
+        
+        le = LearningExperience(
+            teacher_id=teacher.id,
+            unit_number=22,
+            experience_number=1,
+            core_concept='Comparing Fractions',
+            learning_intention='Use visual models to compare fractions',
+            success_criteria=json.dumps(['I can compare fractions']),
+            subject='Maths',
+            year_level=6
+        )
+        db.session.add(le)
+        db.session.commit()
+        
+        # Two lessons share a time so the id tie-breaker is exercised
+        start = datetime(2024, 2, 5, 9, 0)
+        for offset in [0, 0, 1, 2, 3]:
+            db.session.add(Lesson(
+                teacher_id=teacher.id,
+                learning_experience_id=le.id,
+                week_number=1,
+                date_scheduled=start + timedelta(days=offset)
+            ))
+        db.session.commit()
+        
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            rows, cursor = LessonService.get_lessons_page(teacher.id, cursor=cursor, limit=2)
+            seen.extend(rows)
+            pages += 1
+            if cursor is None:
+                break
+        
+        assert pages == 3
+        assert len({row.id for row in seen}) == 5
+        assert [row.date_scheduled for row in seen] == sorted(row.date_scheduled for row in seen)
+        
+        with pytest.raises(ValueError):
+            LessonService.get_lessons_page(teacher.id, cursor='not-a-cursor', limit=2)
+        
+        print("✅ Get lessons page walks keyset: PASS")
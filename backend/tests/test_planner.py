@@ -0,0 +1,124 @@
+"""Tests for the weekly planner endpoint"""
+import pytest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from backend.main import create_app
+from backend.core.database import db
+from backend.models.teacher import Teacher
+from backend.models.student import Student
+from backend.models.learning_experience import LearningExperience
+from backend.services.lesson_service import LessonService
+from backend.services.worksheet_service import WorksheetService
+from backend.services.evidence_service import EvidenceService
+from backend.services.planner_service import PlannerService
+from backend.core.query_profiler import query_count
+
+@pytest.fixture
+def app():
+    """Create test app"""
+    app = create_app('development')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _setup(email, lessons=3):
+    """Create a teacher, a student, two LEs and published lessons in week 4"""
+    teacher = Teacher(email=email, first_name='Test', last_name='Teacher', password_hash='hash123')
+    student = Student(first_name='Sam', last_name='Student', year_level=6)
+    db.session.add_all([teacher, student])
+    db.session.commit()
+    
+    les = [
+        LearningExperience(
+            teacher_id=teacher.id, unit_number=22, experience_number=n, core_concept=f'Concept {n}',
+            learning_intention='Learn', success_criteria=['I can one'], subject='Maths'
+        )
+        for n in (1, 2)
+    ]
+    db.session.add_all(les)
+    db.session.commit()
+    
+    lesson_ids = []
+    for i in range(lessons):
+        lesson = LessonService.create_lesson(teacher.id, les[i % 2].id, 4, datetime(2024, 2, 5 + i, 9))
+        LessonService.publish_lesson(lesson.id)
+        lesson_ids.append(lesson.id)
+    # Drafts are not part of the planner week
+    LessonService.create_lesson(teacher.id, les[0].id, 4, datetime(2024, 2, 9, 9))
+    return teacher.id, student.id, [le.id for le in les], lesson_ids
+
+def test_week_is_hydrated_in_constant_queries(app):
+    """Test that a week of any size takes the same three queries"""
+    with app.app_context():
+        teacher_id, student_id, les, lessons = _setup('pl1@test.com', lessons=5)
+        WorksheetService.generate_worksheets(lessons[0])
+        EvidenceService.log_evidence(teacher_id, student_id, les[0], 'Observed', 3, lesson_id=lessons[0])
+        EvidenceService.log_evidence(teacher_id, student_id, les[0], 'Observed again', 4, lesson_id=lessons[0])
+        db.session.expire_all()
+        
+        before = query_count()
+        week = PlannerService.get_week(teacher_id, 4)
+        assert query_count() - before == 3
+        
+        assert [lesson['id'] for lesson in week['lessons']] == lessons
+        first = week['lessons'][0]
+        assert first['learning_experience']['core_concept'] == 'Concept 1'
+        assert [w['tier'] for w in first['worksheets']] == ['mild', 'medium', 'spicy', 'enrichment']
+        assert first['worksheets'][0]['question_count'] == 5
+        assert first['evidence'] == {'count': 2, 'students': 1}
+        assert week['lessons'][1]['worksheets'] == []
+        assert week['lessons'][1]['evidence'] == {'count': 0, 'students': 0}
+        
+        assert PlannerService.get_week(teacher_id, 5) == {'week_number': 5, 'lessons': []}
+        
+        print("✅ Week is hydrated in constant queries: PASS")
+
+def test_week_endpoint_weak_etag(app):
+    """Test that an unchanged week revalidates as 304 and a change produces a new ETag"""
+    with app.app_context():
+        teacher_id, student_id, les, lessons = _setup('pl2@test.com')
+        headers = {'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'}
+        client = app.test_client()
+        
+        response = client.get('/api/v1/planner/week/4', headers=headers)
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+        assert etag.startswith('W/')
+        assert len(response.get_json()['lessons']) == 3
+        
+        response = client.get('/api/v1/planner/week/4', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.get_data() == b''
+        
+        WorksheetService.generate_worksheets(lessons[1])
+        response = client.get('/api/v1/planner/week/4', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert len(response.get_json()['lessons'][1]['worksheets']) == 4
+        
+        print("✅ Week endpoint weak ETag: PASS")
+
+def test_week_endpoint_follows_evidence_writes(app):
+    """Test that cached evidence counts change with every evidence write, not just progress changes"""
+    with app.app_context():
+        teacher_id, student_id, les, lessons = _setup('pl3@test.com')
+        headers = {'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'}
+        client = app.test_client()
+        
+        # Evidence against an LE row that no longer exists still counts for its lesson,
+        # though no progress summary (and so no matrix change) follows its writes
+        evidence = EvidenceService.log_evidence(teacher_id, student_id, 'retired-le', 'Observed', 3,
+                                                lesson_id=lessons[0])
+        
+        week = client.get('/api/v1/planner/week/4', headers=headers).get_json()
+        assert week['lessons'][0]['evidence'] == {'count': 1, 'students': 1}
+        
+        EvidenceService.update_evidence(evidence.id, lesson_id=lessons[2])
+        week = client.get('/api/v1/planner/week/4', headers=headers).get_json()
+        assert week['lessons'][0]['evidence'] == {'count': 0, 'students': 0}
+        assert week['lessons'][2]['evidence'] == {'count': 1, 'students': 1}
+        
+        print("✅ Week endpoint follows evidence writes: PASS")
@@ -0,0 +1,229 @@
+"""
+Query plan regression tests
+Seeds a realistic volume of data, runs the real lookups and page queries,
+and checks the database plans them on the intended composite index
+"""
+import pytest
+import contextlib
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert, text
+from backend.main import create_app
+from backend.core.database import db
+from backend.models.teacher import Teacher
+from backend.models.student import Student
+from backend.models.learning_experience import LearningExperience
+from backend.models.lesson import Lesson
+from backend.models.evidence import Evidence
+from backend.models.student_progress import StudentProgress
+from backend.models.worksheet import Worksheet
+from backend.models.worksheet_question import WorksheetQuestion
+from backend.services.evidence_service import EvidenceService
+from backend.services.lesson_service import LessonService
+from backend.services.student_progress_service import StudentProgressService
+from backend.services.sync_service import SyncService
+from backend.utils.helpers import encode_cursor
+
+TEACHERS = 3
+LES_PER_TEACHER = 4
+LESSONS_PER_LE = 5
+STUDENTS = 60
+EVIDENCE_PER_STUDENT_LE = 4
+
+@pytest.fixture
+def app():
+    """Create test app"""
+    app = create_app('development')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _seed():
+    """Bulk insert a few teachers' worth of data and refresh planner statistics"""
+    start = datetime(2024, 2, 1)
+    teachers = [
+        {'email': f'plan{t}@test.com', 'first_name': 'Plan', 'last_name': f'Teacher{t}', 'password_hash': 'hash123'}
+        for t in range(TEACHERS)
+    ]
+    db.session.execute(insert(Teacher), teachers)
+    teacher_ids = [row.id for row in db.session.execute(db.select(Teacher.id))]
+    
+    db.session.execute(insert(Student), [
+        {'first_name': f'First{s}', 'last_name': f'Last{s % 17}', 'year_level': 6}
+        for s in range(STUDENTS)
+    ])
+    student_ids = [row.id for row in db.session.execute(db.select(Student.id))]
+    
+    db.session.execute(insert(LearningExperience), [
+        {
+            'teacher_id': teacher_id, 'unit_number': 20 + n % 2, 'experience_number': n,
+            'core_concept': f'Concept {n}', 'learning_intention': 'Learn', 'success_criteria': '["I can"]',
+            'subject': 'Maths', 'is_active': n != 0
+        }
+        for teacher_id in teacher_ids for n in range(LES_PER_TEACHER)
+    ])
+    les = db.session.execute(db.select(LearningExperience.id, LearningExperience.teacher_id)).all()
+    
+    db.session.execute(insert(Lesson), [
+        {
+            'teacher_id': le.teacher_id, 'learning_experience_id': le.id, 'week_number': i + 1,
+            'date_scheduled': start + timedelta(days=i), 'status': 'published' if i % 2 else 'draft'
+        }
+        for le in les for i in range(LESSONS_PER_LE)
+    ])
+    lesson_ids = [row.id for row in db.session.execute(db.select(Lesson.id))]
+    
+    db.session.execute(insert(Evidence), [
+        {
+            'teacher_id': le.teacher_id, 'student_id': student_id, 'learning_experience_id': le.id,
+            'observation_date': start + timedelta(hours=s * 7 + e), 'observation_text': 'Observed',
+            'mastery_level': 1 + e % 4
+        }
+        for le in les for s, student_id in enumerate(student_ids) for e in range(EVIDENCE_PER_STUDENT_LE)
+    ])
+    db.session.execute(insert(StudentProgress), [
+        {'student_id': student_id, 'learning_experience_id': le.id}
+        for le in les for student_id in student_ids
+    ])
+    
+    db.session.execute(insert(Worksheet), [
+        {'lesson_id': lesson_id, 'tier': tier, 'title': 'Sheet', 'subject': 'Maths', 'year_level': 6}
+        for lesson_id in lesson_ids for tier in ('mild', 'medium', 'spicy')
+    ])
+    worksheet_ids = [row.id for row in db.session.execute(db.select(Worksheet.id))]
+    db.session.execute(insert(WorksheetQuestion), [
+        {'worksheet_id': worksheet_id, 'question_number': q, 'question_text': 'Q', 'tier': 'mild'}
+        for worksheet_id in worksheet_ids for q in range(1, 6)
+    ])
+    db.session.commit()
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+    
+    return teacher_ids[0], student_ids[0], les[1], lesson_ids[0], worksheet_ids[0]
+
+@contextlib.contextmanager
+def _captured_statements():
+    """Record (statement, parameters) for every SELECT run inside the block"""
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+
+def _plan(statement, parameters):
+    """The database's plan for a statement as one line per step"""
+    if db.engine.dialect.name == 'sqlite':
+        rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+        return [row[-1] for row in rows]
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN {statement}', parameters)
+    return [row[0] for row in rows]
+
+def _full_scan(plan, table):
+    """Whether a plan reads every row of a table"""
+    if db.engine.dialect.name == 'sqlite':
+        return any(step == f'SCAN {table}' or step.startswith(f'SCAN {table} ') for step in plan)
+    return any(f'Seq Scan on {table}' in step for step in plan)
+
+def _assert_uses_index(run, table, index_name):
+    """Run a lookup and assert each of its queries seeks on index_name"""
+    with _captured_statements() as statements:
+        run()
+    
+    assert statements, 'lookup ran no SELECT'
+    for statement, parameters in statements:
+        plan = _plan(statement, parameters)
+        assert any(index_name in step for step in plan), f'{index_name} unused: {plan}'
+        assert not _full_scan(plan, table), f'full scan of {table}: {plan}'
+        if db.engine.dialect.name == 'sqlite' and 'ORDER BY' in statement:
+            assert not any('TEMP B-TREE' in step for step in plan), f'sort not served by index: {plan}'
+
+def test_lookups_use_composite_indexes(app):
+    """Test that model lookups are planned on their composite indexes"""
+    with app.app_context():
+        teacher_id, student_id, le, lesson_id, worksheet_id = _seed()
+        
+        _assert_uses_index(lambda: Evidence.find_by_student(student_id), 'evidence', 'ix_evidence_student_date')
+        _assert_uses_index(
+            lambda: Evidence.find_recent_by_student_and_le(student_id, le.id, 5),
+            'evidence', 'ix_evidence_student_le_date'
+        )
+        _assert_uses_index(lambda: Evidence.find_by_teacher(teacher_id), 'evidence', 'ix_evidence_teacher_date')
+        _assert_uses_index(lambda: Lesson.find_by_teacher(teacher_id), 'lessons', 'ix_lessons_teacher_date')
+        _assert_uses_index(
+            lambda: Lesson.find_by_teacher_and_week(teacher_id, 2), 'lessons', 'ix_lessons_published_week'
+        )
+        _assert_uses_index(
+            lambda: LearningExperience.find_by_unit(teacher_id, 21),
+            'learning_experiences', 'ix_learning_experiences_active_unit'
+        )
+        _assert_uses_index(
+            lambda: StudentProgress.find_by_student(student_id),
+            'student_progress', 'ix_student_progress_student_le'
+        )
+        _assert_uses_index(
+            lambda: Worksheet.find_by_lesson_and_tier(lesson_id, 'mild'), 'worksheets', 'ix_worksheets_lesson_tier'
+        )
+        _assert_uses_index(
+            lambda: WorksheetQuestion.find_by_worksheet(worksheet_id),
+            'worksheet_questions', 'ix_worksheet_questions_worksheet_number'
+        )
+        
+        print("✅ Lookups use composite indexes: PASS")
+
+def test_keyset_pages_seek_on_indexes(app):
+    """Test that first and later keyset pages seek on an index without sorting"""
+    with app.app_context():
+        teacher_id, student_id, le, lesson_id, worksheet_id = _seed()
+        
+        pages = [
+            (lambda cursor: EvidenceService.get_student_evidence_page(student_id, cursor, limit=3),
+             'evidence', 'ix_evidence_student_date'),
+            (lambda cursor: EvidenceService.get_teacher_evidence_page(teacher_id, cursor, limit=3),
+             'evidence', 'ix_evidence_teacher_date'),
+            (lambda cursor: LessonService.get_lessons_page(teacher_id, cursor=cursor, limit=3),
+             'lessons', 'ix_lessons_teacher_date'),
+            (lambda cursor: LessonService.get_lessons_page(teacher_id, week_number=2, cursor=cursor, limit=1),
+             'lessons', 'ix_lessons_published_week'),
+            (lambda cursor: StudentProgressService.get_class_progress_page(le.id, cursor, limit=3),
+             'student_progress', 'ix_student_progress_le_student'),
+        ]
+        for page, table, index_name in pages:
+            rows, next_cursor = page(None)
+            assert next_cursor is not None
+            _assert_uses_index(lambda: page(None), table, index_name)
+            _assert_uses_index(lambda: page(next_cursor), table, index_name)
+        
+        print("✅ Keyset pages seek on indexes: PASS")
+
+def test_delta_sync_seeks_within_the_teachers_rows(app):
+    """Test that every delta sync query seeks on an owner-scoped updated_at index"""
+    with app.app_context():
+        teacher_id, student_id, le, lesson_id, worksheet_id = _seed()
+        
+        with _captured_statements() as statements:
+            SyncService.get_changes(teacher_id, encode_cursor([datetime(2024, 1, 1)]))
+        
+        expected = {
+            'learning_experiences': 'ix_learning_experiences_teacher_updated',
+            'lessons': 'ix_lessons_teacher_updated',
+            'worksheets': 'ix_worksheets_lesson_updated',
+            'worksheet_questions': 'ix_worksheet_questions_worksheet_updated',
+            'evidence': 'ix_evidence_teacher_updated',
+            'student_progress': 'ix_student_progress_le_updated',
+            'tombstones': 'ix_tombstones_teacher_created'
+        }
+        assert len(statements) == len(expected)
+        for (statement, parameters), (table, index_name) in zip(statements, expected.items()):
+            plan = _plan(statement, parameters)
+            assert any(index_name in step for step in plan), f'{index_name} unused: {plan}'
+            assert not _full_scan(plan, table), f'full scan of {table}: {plan}'
+        
+        print("✅ Delta sync seeks within the teacher's rows: PASS")
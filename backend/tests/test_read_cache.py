@@ -0,0 +1,125 @@
+"""Tests for the read-through GET cache"""
+import pytest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from backend.main import create_app
+from backend.core.database import db
+from backend.core.read_cache import read_cache, ReadCache, LocalBackend
+from backend.models.change_version import ChangeVersion
+from backend.models.teacher import Teacher
+from backend.services.learning_experience_service import LearningExperienceService
+from backend.services.lesson_service import LessonService
+
+@pytest.fixture
+def app():
+    """Create test app with the in-process cache backend"""
+    app = create_app('development')
+    app.config['REDIS_URL'] = None
+    read_cache.init_app(app)
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _setup(email):
+    """Create a teacher with one LE, returning (teacher_id, le_id, auth headers)"""
+    teacher = Teacher(
+        email=email,
+        first_name='Test',
+        last_name='Teacher',
+        password_hash='hash123'
+    )
+    db.session.add(teacher)
+    db.session.commit()
+    
+    le = LearningExperienceService.create_le(
+        teacher_id=teacher.id,
+        unit_number=22,
+        experience_number=1,
+        core_concept='Fractions',
+        learning_intention='Understand fractions',
+        success_criteria=['I can identify fractions'],
+        subject='Maths'
+    )
+    headers = {'Authorization': f'Bearer {create_access_token(identity=teacher.id)}'}
+    return teacher.id, le.id, headers
+
+def test_local_backend_evicts_and_expires():
+    """Test that the fallback LRU is size-bounded and honours TTLs"""
+    backend = LocalBackend(max_entries=2)
+    
+    backend.set('a', 'A', ttl=60)
+    backend.set('b', 'B', ttl=60)
+    assert backend.get('a') == 'A'
+    backend.set('c', 'C', ttl=60)
+    
+    assert backend.get('b') is None
+    assert backend.get('a') == 'A'
+    
+    backend.set('d', 'D', ttl=-1)
+    assert backend.get('d') is None
+    
+    print("✅ Local backend evicts and expires: PASS")
+
+def test_service_writes_invalidate_cached_lessons(app):
+    """Test that a cached lesson list is refreshed after a lesson is created"""
+    with app.app_context():
+        teacher_id, le_id, headers = _setup('rc1@test.com')
+        client = app.test_client()
+        
+        assert client.get('/api/v1/lessons', headers=headers).get_json()['lessons'] == []
+        response = client.get('/api/v1/lessons', headers=headers)
+        assert response.headers['X-Cache'] == 'HIT'
+        
+        LessonService.create_lesson(teacher_id, le_id, week_number=1, date_scheduled=datetime.now())
+        
+        response = client.get('/api/v1/lessons', headers=headers)
+        assert 'X-Cache' not in response.headers
+        assert len(response.get_json()['lessons']) == 1
+        
+        metrics = read_cache.metrics()
+        assert metrics['hits'] == 1
+        assert metrics['misses'] == 2
+        
+        print("✅ Service writes invalidate cached lessons: PASS")
+
+def test_rolled_back_writes_keep_cache(app):
+    """Test that tags are only invalidated when the transaction commits"""
+    with app.app_context():
+        teacher_id, le_id, headers = _setup('rc2@test.com')
+        tag = ReadCache.tag('les', teacher_id)
+        before = ChangeVersion.lookup([tag])[tag].version
+        
+        read_cache.invalidate_on_commit(tag)
+        db.session.rollback()
+        assert ChangeVersion.lookup([tag])[tag].version == before
+        
+        LearningExperienceService.update_le(le_id, core_concept='Decimals')
+        assert ChangeVersion.lookup([tag])[tag].version == before + 1
+        
+        print("✅ Rolled back writes keep cache: PASS")
+
+def test_cache_key_follows_committed_change_versions(app):
+    """Test that a committed version bump misses the cache with no after-commit step"""
+    with app.app_context():
+        teacher_id, le_id, headers = _setup('rc3@test.com')
+        client = app.test_client()
+        
+        first = client.get('/api/v1/learning-experiences', headers=headers)
+        assert client.get('/api/v1/learning-experiences', headers=headers).headers['X-Cache'] == 'HIT'
+        
+        # A write from another process: only the change_versions row moves
+        db.session.execute(
+            ChangeVersion.__table__.update()
+            .where(ChangeVersion.tag == ReadCache.tag('les', teacher_id))
+            .values(version=ChangeVersion.version + 1)
+        )
+        db.session.commit()
+        
+        response = client.get('/api/v1/learning-experiences', headers=headers)
+        assert 'X-Cache' not in response.headers
+        assert response.headers['ETag'] != first.headers['ETag']
+        
+        print("✅ Cache key follows committed change versions: PASS")
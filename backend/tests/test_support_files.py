@@ -0,0 +1,213 @@
+"""Tests for SupportFilesService and the lesson bundle"""
+import pytest
+import io
+import json
+import os
+import zipfile
+from datetime import datetime
+from backend.main import create_app
+from backend.core.database import db
+from backend.core.document_cache import document_cache
+from backend.models.teacher import Teacher
+from backend.models.learning_experience import LearningExperience
+from backend.models.lesson import Lesson
+from backend.services.worksheet_service import WorksheetService
+from backend.services.support_files_service import SupportFilesService
+from backend.services.answer_sheet_generator import AnswerSheetGenerator
+from backend.services.lesson_bundle import LessonBundle
+from backend.services.unit_export_service import UnitExportService
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app(tmp_path):
+    """Create test app with an isolated cache directory"""
+    app = create_app('development')
+    app.config['DOCUMENT_CACHE_DIR'] = str(tmp_path / 'cache')
+    document_cache.init_app(app)
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _create_lesson(email):
+    """Create a teacher, LE and lesson with generated worksheets"""
+    teacher = Teacher(
+        email=email,
+        first_name='Test',
+        last_name='Teacher',
+        password_hash='hash123'
+    )
+    db.session.add(teacher)
+    db.session.commit()
+    
+    le = LearningExperience(
+        teacher_id=teacher.id,
+        unit_number=22,
+        experience_number=1,
+        core_concept='Fractions',
+        learning_intention='Understand fractions',
+        success_criteria=json.dumps(['I can identify fractions']),
+        subject='Maths',
+        year_level=6
+    )
+    db.session.add(le)
+    db.session.commit()
+    
+    lesson = Lesson(
+        teacher_id=teacher.id,
+        learning_experience_id=le.id,
+        week_number=1,
+        date_scheduled=datetime.now()
+    )
+    db.session.add(lesson)
+    db.session.commit()
+    
+    WorksheetService.generate_worksheets(lesson.id)
+    return lesson.id
+
+def _auth(lesson_id):
+    """Authorization header for the lesson's teacher"""
+    lesson = Lesson.query_by_id(lesson_id)
+    return {'Authorization': f'Bearer {create_access_token(identity=lesson.teacher_id)}'}
+
+def test_lesson_bundle_is_read_only(app):
+    """Test that the bundle snapshots rows and rejects writes"""
+    with app.app_context():
+        lesson_id = _create_lesson('sf1@test.com')
+        
+        bundle = LessonBundle.load(lesson_id)
+        
+        assert bundle.lesson.id == lesson_id
+        assert bundle.learning_experience.get_success_criteria_list() == ['I can identify fractions']
+        assert len(bundle.worksheets) == 4
+        assert sum(len(qs) for qs in bundle.questions_by_worksheet.values()) == 32
+        
+        with pytest.raises(AttributeError):
+            bundle.learning_experience.core_concept = 'Decimals'
+        
+        print("✅ Lesson bundle is read only: PASS")
+
+def test_generate_all_in_parallel(app, tmp_path):
+    """Test that all three documents are rendered on the worker pool"""
+    with app.app_context():
+        lesson_id = _create_lesson('sf2@test.com')
+        
+        results = SupportFilesService.generate_all(lesson_id, str(tmp_path), max_workers=3, executor='thread')
+        
+        assert set(results) == {'teacher_guide', 'answer_sheet', 'exemplar'}
+        assert results['answer_sheet']['total_questions'] == 32
+        
+        print("✅ Generate all in parallel: PASS")
+
+def test_process_pool_cache_lookups_are_counted(app, tmp_path):
+    """Test cache hits and misses in worker processes show up in this process's stats"""
+    with app.app_context():
+        lesson_id = _create_lesson('sf2b@test.com')
+        document_cache.hits = document_cache.misses = 0
+        
+        for _ in range(2):
+            results = SupportFilesService.generate_all(lesson_id, str(tmp_path), max_workers=3, executor='process')
+            assert set(results) == {'teacher_guide', 'answer_sheet', 'exemplar'}
+        
+        stats = document_cache.stats()
+        assert (stats['hits'], stats['misses']) == (3, 3)
+        
+        print("✅ Process pool cache lookups are counted: PASS")
+
+def test_generate_all_reports_errors_per_document(app, tmp_path, monkeypatch):
+    """Test that one failing document does not stop the others"""
+    with app.app_context():
+        lesson_id = _create_lesson('sf3@test.com')
+        
+        def fail(bundle, output_dir='/tmp'):
+            raise RuntimeError('render failed')
+        
+        monkeypatch.setattr(AnswerSheetGenerator, 'render', staticmethod(fail))
+        
+        results = SupportFilesService.generate_all(lesson_id, str(tmp_path), max_workers=3, executor='thread')
+        
+        assert results['answer_sheet_error'] == 'render failed'
+        assert 'teacher_guide' in results
+        assert 'exemplar' in results
+        
+        print("✅ Generate all reports errors per document: PASS")
+
+def test_open_document_streams_from_memory_then_cache(app):
+    """Test that a download is built in memory once and then served from cache"""
+    with app.app_context():
+        lesson_id = _create_lesson('sf4@test.com')
+        
+        first = SupportFilesService.open_document(lesson_id, 'answer_sheet')
+        second = SupportFilesService.open_document(lesson_id, 'answer_sheet')
+        
+        assert not first['cached']
+        assert isinstance(first['source'], io.BytesIO)
+        assert second['cached']
+        assert second['source'] == document_cache.path_for(first['etag'])
+        assert os.path.getsize(second['source']) == len(first['source'].getvalue())
+        
+        print("✅ Open document streams from memory then cache: PASS")
+
+def test_download_supports_etag_and_range(app):
+    """Test conditional and partial downloads"""
+    with app.app_context():
+        lesson_id = _create_lesson('sf5@test.com')
+        headers = _auth(lesson_id)
+        client = app.test_client()
+        url = f'/api/v1/support-files/teacher-guide/{lesson_id}/download'
+        
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert response.headers['Content-Length'] == str(len(response.data))
+        etag = response.headers['ETag']
+        
+        response = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        
+        response = client.get(url, headers={**headers, 'Range': 'bytes=0-99'})
+        assert response.status_code == 206
+        assert len(response.data) == 100
+        
+        print("✅ Download supports ETag and Range: PASS")
+
+def test_output_dir_is_namespaced_per_teacher(app, tmp_path):
+    """Test that generated files are kept apart per teacher"""
+    with app.app_context():
+        app.config['SUPPORT_FILES_DIR'] = str(tmp_path / 'files')
+        first = Lesson.query_by_id(_create_lesson('sf6@test.com'))
+        second = Lesson.query_by_id(_create_lesson('sf7@test.com'))
+        
+        first_dir = SupportFilesService.output_dir_for(first.teacher_id, first.id)
+        second_dir = SupportFilesService.output_dir_for(second.teacher_id, second.id)
+        
+        assert first_dir != second_dir
+        assert first_dir.startswith(os.path.join(str(tmp_path / 'files'), first.teacher_id))
+        assert os.path.isdir(first_dir)
+        
+        print("✅ Output dir is namespaced per teacher: PASS")
+
+def test_unit_export_streams_zip(app):
+    """Test that a unit export is streamed in chunks and forms a valid archive"""
+    with app.app_context():
+        lesson_id = _create_lesson('sf8@test.com')
+        teacher_id = Lesson.query_by_id(lesson_id).teacher_id
+        
+        plan = UnitExportService.plan_unit(teacher_id, 22)
+        chunks = list(UnitExportService.stream_unit(plan))
+        
+        assert len(chunks) > 1
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+        assert archive.testzip() is None
+        assert archive.namelist() == [
+            'Unit22/LE1/Lesson1_Week1/worksheets.json',
+            'Unit22/LE1/Lesson1_Week1/TeacherGuide_Unit22_LE1.docx',
+            'Unit22/LE1/Lesson1_Week1/AnswerSheet_Unit22_LE1.docx',
+            'Unit22/LE1/Lesson1_Week1/Exemplar_Unit22_LE1.docx'
+        ]
+        worksheets = json.loads(archive.read('Unit22/LE1/Lesson1_Week1/worksheets.json'))
+        assert len(worksheets['spicy']['questions']) == 15
+        assert UnitExportService.plan_unit(teacher_id, 99) == []
+        
+        print("✅ Unit export streams ZIP: PASS")
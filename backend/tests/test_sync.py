@@ -0,0 +1,123 @@
+"""Tests for delta sync"""
+import pytest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from backend.main import create_app
+from backend.core.database import db
+from backend.models.teacher import Teacher
+from backend.models.student import Student
+from backend.models.learning_experience import LearningExperience
+from backend.models.worksheet_question import WorksheetQuestion
+from backend.services.lesson_service import LessonService
+from backend.services.worksheet_service import WorksheetService
+from backend.services.evidence_service import EvidenceService
+from backend.services.sync_service import SyncService
+
+@pytest.fixture
+def app():
+    """Create test app"""
+    app = create_app('development')
+    # Tests write within milliseconds of each sync
+    app.config['SYNC_OVERLAP_SECONDS'] = 0
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _setup(email):
+    """Create a teacher, a student, an LE and a lesson"""
+    teacher = Teacher(email=email, first_name='Test', last_name='Teacher', password_hash='hash123')
+    student = Student(first_name='Sam', last_name='Student', year_level=6)
+    db.session.add_all([teacher, student])
+    db.session.commit()
+    
+    le = LearningExperience(
+        teacher_id=teacher.id, unit_number=22, experience_number=1, core_concept='Concept',
+        learning_intention='Learn', success_criteria=['I can one'], subject='Maths'
+    )
+    db.session.add(le)
+    db.session.commit()
+    lesson = LessonService.create_lesson(teacher.id, le.id, 4, datetime(2024, 2, 5, 9))
+    return teacher.id, student.id, le.id, lesson.id
+
+def _ids(rows):
+    return {row['id'] for row in rows}
+
+def test_sync_returns_only_changes_since_token(app):
+    """Test a full sync followed by a delta holding just the rows written since"""
+    with app.app_context():
+        teacher_id, student_id, le_id, lesson_id = _setup('sy1@test.com')
+        WorksheetService.generate_worksheets(lesson_id)
+        # Another teacher's rows are never synced
+        _setup('sy1-other@test.com')
+        
+        full = SyncService.get_changes(teacher_id)
+        assert full['full'] is True and full['deleted'] == {}
+        assert _ids(full['changes']['learning_experiences']) == {le_id}
+        assert _ids(full['changes']['lessons']) == {lesson_id}
+        assert len(full['changes']['worksheets']) == 4
+        assert len(full['changes']['worksheet_questions']) == WorksheetQuestion.query.count()
+        
+        evidence = EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observed', 3)
+        LessonService.publish_lesson(lesson_id)
+        
+        delta = SyncService.get_changes(teacher_id, full['next_token'])
+        assert delta['full'] is False
+        assert _ids(delta['changes']['evidence']) == {evidence.id}
+        assert _ids(delta['changes']['lessons']) == {lesson_id}
+        assert delta['changes']['lessons'][0]['status'] == 'published'
+        assert len(delta['changes']['progress']) == 1
+        assert delta['changes']['learning_experiences'] == []
+        assert delta['changes']['worksheets'] == [] and delta['changes']['worksheet_questions'] == []
+        
+        assert SyncService.get_changes(teacher_id, delta['next_token'])['changes']['evidence'] == []
+        
+        print("✅ Sync returns only changes since token: PASS")
+
+def test_sync_reports_hard_deletes(app):
+    """Test that deleted evidence, lessons and regenerated worksheets come back as tombstones"""
+    with app.app_context():
+        teacher_id, student_id, le_id, lesson_id = _setup('sy2@test.com')
+        WorksheetService.generate_worksheets(lesson_id)
+        evidence = EvidenceService.log_evidence(teacher_id, student_id, le_id, 'Observed', 3)
+        other = LessonService.create_lesson(teacher_id, le_id, 5, datetime(2024, 2, 12, 9))
+        
+        before = SyncService.get_changes(teacher_id)
+        old_worksheets = _ids(before['changes']['worksheets'])
+        old_questions = _ids(before['changes']['worksheet_questions'])
+        
+        EvidenceService.delete_evidence(evidence.id)
+        LessonService.delete_lesson(other.id)
+        WorksheetService.generate_worksheets(lesson_id)
+        
+        delta = SyncService.get_changes(teacher_id, before['next_token'])
+        assert delta['deleted']['evidence'] == [evidence.id]
+        assert delta['deleted']['lessons'] == [other.id]
+        assert set(delta['deleted']['worksheets']) == old_worksheets
+        assert set(delta['deleted']['worksheet_questions']) == old_questions
+        assert len(delta['changes']['worksheets']) == 4
+        assert not _ids(delta['changes']['worksheets']) & old_worksheets
+        
+        print("✅ Sync reports hard deletes: PASS")
+
+def test_sync_endpoint(app):
+    """Test the sync endpoint round trip and token validation"""
+    with app.app_context():
+        teacher_id, student_id, le_id, lesson_id = _setup('sy3@test.com')
+        headers = {'Authorization': f'Bearer {create_access_token(identity=teacher_id)}'}
+        client = app.test_client()
+        
+        response = client.get('/api/v1/sync', headers=headers)
+        assert response.status_code == 200
+        token = response.get_json()['next_token']
+        
+        response = client.get('/api/v1/sync', query_string={'since': token}, headers=headers)
+        assert response.status_code == 200
+        assert response.get_json()['changes']['lessons'] == []
+        
+        response = client.get('/api/v1/sync?since=not-a-token', headers=headers)
+        assert response.status_code == 400
+        
+        print("✅ Sync endpoint: PASS")
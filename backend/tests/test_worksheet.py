@@ -592,3 +592,51 @@ def test_regenerate_worksheets_clears_old(app):
         assert len(second_ws) == 4
         
         print("✅ Regenerate worksheets clears old: PASS")
+
+def test_regenerate_worksheets_clears_old_questions(app):
+    """Test that regenerating worksheets removes the old questions"""
+    with app.app_context():
+        teacher = Teacher(
+            email='teacher12@test.com',
+            first_name='Test',
+            last_name='Teacher',
+            password_hash='hash123'
+        )
+        db.session.add(teacher)
+        db.session.commit()
+        teacher_id = teacher.id
+        
+        le = LearningExperience(
+            teacher_id=teacher_id,
+            unit_number=22,
+            experience_number=1,
+            core_concept='Fractions',
+            learning_intention='Understand fractions',
+            success_criteria=json.dumps(['I can identify fractions']),
+            subject='Maths',
+            year_level=6
+        )
+        db.session.add(le)
+        db.session.commit()
+        le_id = le.id
+        
+        lesson = Lesson(
+            teacher_id=teacher_id,
+            learning_experience_id=le_id,
+            week_number=1,
+            date_scheduled=datetime.now()
+        )
+        db.session.add(lesson)
+        db.session.commit()
+        lesson_id = lesson.id
+        
+        WorksheetService.generate_worksheets(lesson_id)
+        worksheets = WorksheetService.generate_worksheets(lesson_id)
+        
+        assert WorksheetQuestion.query.count() == 32
+        
+        spicy_questions = WorksheetService.get_questions(worksheets['spicy'].id)
+        assert [q.question_number for q in spicy_questions] == list(range(1, 16))
+        assert all(q.tier == 'spicy' for q in spicy_questions)
+        
+        print("✅ Regenerate worksheets clears old questions: PASS")
@@ -1,13 +1,127 @@
 """Helper utilities"""
+from flask import current_app
+from sqlalchemy import bindparam, tuple_
+from datetime import datetime, timedelta
+import base64
+import json
 
-def get_page_and_limit(request, default_limit=10, max_limit=100):
-    """Extract pagination parameters from request"""
-    page = request.args.get('page', 1, type=int)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def get_cursor_and_limit(request):
+    """
+    Extract cursor pagination parameters (?cursor=...&limit=...) from request
+    
+    The limit defaults to PAGE_SIZE_DEFAULT and is capped at PAGE_SIZE_MAX.
+    """
+    default_limit = current_app.config.get('PAGE_SIZE_DEFAULT', DEFAULT_PAGE_SIZE)
+    max_limit = current_app.config.get('PAGE_SIZE_MAX', MAX_PAGE_SIZE)
     limit = request.args.get('limit', default_limit, type=int)
-    limit = min(limit, max_limit)
-    return page, limit
+    return request.args.get('cursor') or None, max(1, min(limit, max_limit))
+
+def encode_cursor(values):
+    """Encode the sort key of the last row on a page as an opaque token"""
+    encoded = [
+        {'dt': value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(encoded, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def _decode_cursor_value(value):
+    """A scalar sort key value, or a datetime from {'dt': iso}"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict) and list(value) == ['dt'] and isinstance(value['dt'], str):
+        return datetime.fromisoformat(value['dt'])
+    raise ValueError
+
+def decode_cursor(cursor, size):
+    """
+    Decode a cursor token back into sort key values
+    
+    Raises:
+        ValueError: If the token is malformed, has the wrong number of values
+            or holds anything but scalars and encoded datetimes
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError
+        return [_decode_cursor_value(value) for value in values]
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def keyset_paginate(query, order_by, cursor, limit, descending=False):
+    """
+    Order a query on a unique key and seek past the cursor
+    
+    Works with ORM queries and Core selects. Page N costs the same as page 1
+    because the database seeks straight to the key instead of skipping rows.
+    One extra row is fetched so page_results can tell whether more remain.
+    
+    Args:
+        query: Query or Select to paginate
+        order_by: Columns forming a unique sort key (end with the primary key)
+        cursor: Token from the previous page, or None for the first page
+        limit: Page size
+        descending: Sort newest/largest first
+    
+    Returns:
+        The query with ordering, seek condition and limit applied
+    
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    if cursor:
+        key = tuple_(*order_by)
+        # Bind with each column's type so e.g. datetimes are stored-format on SQLite
+        values = tuple_(*[
+            bindparam(None, value, type_=column.type)
+            for column, value in zip(order_by, decode_cursor(cursor, len(order_by)))
+        ])
+        query = query.where(key < values if descending else key > values)
+    
+    ordering = [column.desc() if descending else column.asc() for column in order_by]
+    return query.order_by(*ordering).limit(limit + 1)
+
+def page_results(rows, order_by, limit):
+    """
+    Trim the lookahead row from a keyset page
+    
+    Args:
+        rows: Rows returned by a keyset_paginate query (ORM objects or Core rows)
+        order_by: The same columns passed to keyset_paginate
+        limit: Page size
+    
+    Returns:
+        Tuple of (rows, next_cursor), next_cursor is None on the last page
+    """
+    if len(rows) <= limit:
+        return rows, None
+    
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in order_by])
+
+def is_truthy(value):
+    """Interpret a query string flag such as ?wait=true"""
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
 
-def paginate_query(query, page, limit):
-    """Paginate a SQLAlchemy query"""
-    offset = (page - 1) * limit
-    return query.offset(offset).limit(limit).all()
+def parse_date_param(value, end=False):
+    """
+    Parse a date range query parameter (YYYY-MM-DD or ISO 8601 datetime)
+    
+    A bare date used as an end bound covers that whole day, so callers can
+    filter with observation_date < the returned value.
+    
+    Raises:
+        ValueError: If the value is not an ISO date
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
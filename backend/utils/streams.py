@@ -0,0 +1,36 @@
+"""Streaming response utilities"""
+
+class ChunkSink:
+    """
+    Write-only file object that hands its output back to a response generator
+    
+    Writers that expect a file (zipfile, csv, pyarrow) write into the sink,
+    and the generator yields drain() after each step, so the response is
+    streamed without buffering the whole body.
+    """
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self):
+        """Return and clear everything written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
@@ -0,0 +1,27 @@
+import axios from 'axios';
+
+const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000/api/v1';
+
+const authHeaders = () => ({ Authorization: `Bearer ${localStorage.getItem('token')}` });
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+export const jobApi = {
+  get: (jobId) => axios.get(`${API_URL}/jobs/${jobId}`, { headers: authHeaders() }),
+
+  // Generation endpoints answer 202 with a job id; resolve once that job
+  // has finished (responses that were not queued resolve straight away)
+  waitFor: async (response, { interval = 1000, timeout = 120000 } = {}) => {
+    if (response.status !== 202) return null;
+
+    const deadline = Date.now() + timeout;
+    while (Date.now() < deadline) {
+      const res = await jobApi.get(response.data.job_id);
+      const { job } = res.data;
+      if (job.status === 'succeeded') return job;
+      if (job.status === 'failed') throw new Error(job.error || 'Generation failed');
+      await sleep(interval);
+    }
+    throw new Error('Timed out waiting for generation to finish');
+  }
+};
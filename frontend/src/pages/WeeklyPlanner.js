@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { lessonApi } from '../api/lessonApi';
 import { learningExperienceApi } from '../api/learningExperienceApi';
 import { supportFilesApi } from '../api/supportFilesApi';
+import { jobApi } from '../api/jobApi';
 import Navigation from '../components/Navigation';
 import '../styles/WeeklyPlanner.css';
 
@@ -74,7 +75,8 @@ function WeeklyPlanner() {
 
   const handleGenerateFiles = async (lessonId) => {
     try {
-      await supportFilesApi.generateAll(lessonId);
+      const res = await supportFilesApi.generateAll(lessonId);
+      await jobApi.waitFor(res);
       alert('Support files generated successfully!');
     } catch (error) {
       console.error('Failed to generate files:', error);
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useParams } from 'react-router-dom';
 import { worksheetApi } from '../api/worksheetApi';
+import { jobApi } from '../api/jobApi';
 import Navigation from '../components/Navigation';
 import '../styles/WorksheetGenerator.css';
 
@@ -31,8 +32,9 @@ function WorksheetGenerator() {
   const handleGenerate = async () => {
     setGenerating(true);
     try {
-      await worksheetApi.generate(lessonId);
-      loadWorksheets();
+      const res = await worksheetApi.generate(lessonId);
+      await jobApi.waitFor(res);
+      await loadWorksheets();
     } catch (error) {
       console.error('Failed to generate worksheets:', error);
     } finally {